@@ -0,0 +1,166 @@
+"""
+On-disk cache of parsed ASTs for UTTR modules.
+Each module gets a .uttrc file in the user's cache directory holding its
+pickled AST behind a plain-text header: the source mtime, size and hash and
+the interpreter version that produced it, and an HMAC of the entry made with
+a secret key only the user can read. An entry is only unpickled when the
+header matches and the HMAC is valid, so a file someone else wrote into the
+cache directory is never loaded; stale, unreadable, corrupt or unsigned
+entries are ignored and rewritten after a normal parse.
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import pickle
+import sys
+
+import options
+
+# Bump when the meaning of the cached trees changes in a way the front-end
+# fingerprint below cannot see
+CACHE_FORMAT = 2
+CACHE_EXTENSION = '.uttrc'
+CACHE_MAGIC = b'UTTRC2\n'
+KEY_FILE_NAME = 'secret.key'
+
+# Modules whose classes end up inside a pickled AST
+FRONT_END_FILES = ['tokens.py', 'position.py', 'parser.py', 'pratt_parser.py', 'lexer.py', 'table_lexer.py', 'optimizer.py']
+
+_interpreter_version = None
+_secret_key = None
+
+
+def interpreter_version():
+    """Identify the interpreter that produced a cache entry"""
+    global _interpreter_version
+    if _interpreter_version is None:
+        root = os.path.dirname(os.path.abspath(__file__))
+        paths = [os.path.join(root, name) for name in FRONT_END_FILES]
+        nodes_dir = os.path.join(root, 'nodes')
+        paths += sorted(os.path.join(nodes_dir, name) for name in os.listdir(nodes_dir) if name.endswith('.py'))
+
+        fingerprint = hashlib.sha256()
+        for path in paths:
+            stat = os.stat(path)
+            fingerprint.update(f'{os.path.basename(path)}:{stat.st_mtime_ns}:{stat.st_size};'.encode())
+        _interpreter_version = f'{CACHE_FORMAT}-py{sys.version_info[0]}.{sys.version_info[1]}-{fingerprint.hexdigest()[:16]}'
+    return _interpreter_version
+
+
+def user_cache_dir():
+    """Per-user directory for cache entries and the signing key"""
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'uttr')
+
+
+def secret_key():
+    """Key entries are signed with, created on first use; None if it cannot be read or made"""
+    global _secret_key
+    if _secret_key is not None: return _secret_key
+
+    directory = user_cache_dir()
+    path = os.path.join(directory, KEY_FILE_NAME)
+    try:
+        with open(path, 'rb') as f:
+            key = f.read()
+        if len(key) >= 32:
+            _secret_key = key
+            return key
+    except OSError:
+        pass
+
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        # Readable by the user only, so no one else can sign an entry
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        key = os.urandom(32)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(key)
+        _secret_key = key
+        return key
+    except OSError:
+        return None
+
+
+def cache_path(fn):
+    """Location of the cache entry for the source file fn"""
+    path = os.path.abspath(fn)
+    name = os.path.splitext(os.path.basename(path))[0]
+    # One flat directory for every module; the path hash keeps names unique
+    path_hash = hashlib.sha256(path.encode()).hexdigest()[:16]
+    return os.path.join(options.AST_CACHE_DIR or user_cache_dir(), f'{name}-{path_hash}{CACHE_EXTENSION}')
+
+
+def source_key(fn, text):
+    """Values an entry must match to be valid for this source, or None if fn cannot be stat'ed"""
+    try:
+        stat = os.stat(fn)
+    except OSError:
+        return None
+    return {
+        'version': interpreter_version(),
+        'optimize': options.OPTIMIZE,
+        'fn': fn,
+        'mtime': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'hash': hashlib.sha256(text.encode('utf-8')).hexdigest(),
+    }
+
+
+def load_ast(fn, text):
+    """Return the cached AST for fn if it matches text, otherwise None"""
+    if options.AST_CACHE != 'on': return None
+
+    key = source_key(fn, text)
+    if key is None: return None
+
+    try:
+        with open(cache_path(fn), 'rb') as f:
+            if f.readline() != CACHE_MAGIC: return None
+            header = f.readline()
+            # The header is plain JSON, so a stale entry is rejected without unpickling anything
+            if json.loads(header.decode('utf-8')) != key: return None
+            signature = f.readline().strip()
+            payload = f.read()
+
+        secret = secret_key()
+        if secret is None: return None
+        expected = hmac.new(secret, header + payload, hashlib.sha256).hexdigest().encode()
+        if not hmac.compare_digest(signature, expected): return None
+        return pickle.loads(payload)
+    except Exception:
+        # Missing, unreadable or corrupt entries behave like a cache miss
+        return None
+
+
+def store_ast(fn, text, ast):
+    """Write ast to the cache entry for fn; failures are ignored"""
+    if options.AST_CACHE != 'on': return
+
+    key = source_key(fn, text)
+    if key is None: return
+    secret = secret_key()
+    if secret is None: return
+
+    path = cache_path(fn)
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        header = json.dumps(key, sort_keys=True).encode('utf-8') + b'\n'
+        payload = pickle.dumps(ast, protocol=pickle.HIGHEST_PROTOCOL)
+        signature = hmac.new(secret, header + payload, hashlib.sha256).hexdigest().encode()
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        with open(temp_path, 'wb') as f:
+            f.write(CACHE_MAGIC + header + signature + b'\n' + payload)
+        # Readers never see a partially written entry
+        os.replace(temp_path, path)
+    except Exception:
+        # Read-only directories or trees too deep to pickle are simply not cached
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Builtin call benchmark.
+Runs a loop calling len, upper and append with the positional builtin
+calling convention and with the previous one (a Context and SymbolTable per
+call, arguments stored by name and read back, the execute_* method looked
+up by name every time), and reports the builtin calls per second of each.
+
+Usage: python benchmarks/bench_builtins.py [iterations]
+"""
+
+import sys
+
+from common import best_time
+from bench_dispatch import parse, run_with
+from entry import global_symbol_table
+from functions.builtin_function import BuiltInFunction
+from interpreter import make_interpreter
+from run_time_result import RTResult
+
+BENCH_BUILTINS = ['len', 'upper', 'append']
+
+
+class FramedBuiltInFunction(BuiltInFunction):
+    """BuiltInFunction.execute as it was before positional builtins"""
+
+    def execute(self, args):
+        res = RTResult()
+        exec_ctx = self.generate_new_context()
+
+        method = getattr(self, f'execute_{self.name}')
+
+        res.register(self.check_and_populate_args(self.arg_names, args, exec_ctx))
+        if res.should_return(): return res
+
+        values = [exec_ctx.symbol_table.get(name) for name in self.arg_names]
+        return_value = res.register(method(*values))
+        if res.should_return(): return res
+        return res.success(return_value)
+
+    def copy(self):
+        copy = FramedBuiltInFunction(self.name, self.method, self.arg_names)
+        copy.set_context(self.context)
+        copy.set_pos(self.pos_start, self.pos_end)
+        return copy
+
+
+def build_program(iterations):
+    return '\n'.join([
+        'put [1, 2, 3] in items;',
+        'put [] in sizes;',
+        f'cycle i from 0 to {iterations}:',
+        '    append(sizes, len(items) + len(upper("abc")));',
+        'end;',
+    ])
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    # append, two len and one upper per iteration
+    calls = iterations * 4
+    node = parse(build_program(iterations))
+
+    positional = {name: global_symbol_table.get(name) for name in BENCH_BUILTINS}
+    framed = {name: FramedBuiltInFunction(name, builtin.method) for name, builtin in positional.items()}
+
+    print(f"Iterations: {iterations}, builtin calls: {calls:,}")
+    print(f"{'Convention':<14}{'seconds':>10}{'calls/sec':>12}{'speedup':>10}")
+    baseline = None
+    try:
+        for name, builtins in [('framed', framed), ('positional', positional)]:
+            for builtin_name, builtin in builtins.items():
+                global_symbol_table.set(builtin_name, builtin)
+            seconds, _ = best_time(lambda: run_with(make_interpreter(), node))
+            baseline = baseline or seconds
+            print(f"{name:<14}{seconds:>10.4f}{calls / seconds:>12,.0f}{baseline / seconds:>9.2f}x")
+    finally:
+        for builtin_name, builtin in positional.items():
+            global_symbol_table.set(builtin_name, builtin)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Function call benchmark.
+Runs a recursive fib(n) on the tree engine with the previous call protocol
+(copy the callee, build a fresh Interpreter per call, store arguments by
+name and set their context through populate_args) and with the in-place
+call path of Interpreter.visit_CallNode, and reports calls per second.
+
+Usage: python benchmarks/bench_calls.py [n]
+"""
+
+import sys
+
+from common import best_time, run_quietly
+import options
+from bench_engines import parse
+from context import Context
+from entry import global_symbol_table
+from functions.function import Function
+from interpreter import Interpreter, make_interpreter
+from resolver import resolve
+from run_time_result import RTResult
+from values.number_value import Number
+
+
+class CopyingCallInterpreter(Interpreter):
+    """Interpreter calling functions the way it did before the in-place call path"""
+
+    def visit_CallNode(self, node, context):
+        res = RTResult()
+        args = []
+
+        value_to_call = res.register(self.visit(node.node_to_call, context))
+        if res.should_return(): return res
+        value_to_call = value_to_call.copy().set_pos(node.pos_start, node.pos_end)
+
+        for arg_node in node.arg_nodes:
+            args.append(res.register(self.visit(arg_node, context)))
+            if res.should_return(): return res
+
+        if isinstance(value_to_call, Function):
+            return_value = res.register(copying_execute(value_to_call, args))
+        else:
+            return_value = res.register(value_to_call.execute(args))
+        if res.should_return(): return res
+        return_value = return_value.copy().set_pos(node.pos_start, node.pos_end).set_context(context)
+        return res.success(return_value)
+
+
+def copying_execute(func, args):
+    """Function.execute before the in-place call path"""
+    res = RTResult()
+    from interpreter import make_interpreter
+    interpreter = CopyingCallInterpreter()
+    exec_ctx = func.generate_new_context()
+
+    res.register(func.check_and_populate_args(func.arg_names, args, exec_ctx))
+    if res.should_return(): return res
+
+    value = res.register(interpreter.visit(func.body_node, exec_ctx))
+    if res.should_return() and res.func_return_value is None: return res
+
+    return res.success(res.func_return_value or value or Number.null)
+
+
+def fib_program(n):
+    return '\n'.join([
+        'make function fib(n):',
+        '    when n < 2:',
+        '        give n;',
+        '    end',
+        '    give fib(n - 1) + fib(n - 2);',
+        'end;',
+        f'show fib({n});',
+    ])
+
+
+def call_count(n):
+    """Number of fib calls made by fib(n)"""
+    a, b = 1, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return 2 * a - 1
+
+
+def run_with(interpreter, node):
+    context = Context('<program>')
+    context.symbol_table = global_symbol_table
+    result = interpreter.visit(node, context)
+    if result.error: raise SystemExit(result.error.as_string())
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 25
+    calls = call_count(n)
+
+    saved = options.CONTROL_FLOW
+    variants = [
+        ('copying calls', lambda: CopyingCallInterpreter(), 'result'),
+        ('in-place calls', make_interpreter, 'result'),
+        ('in-place, signals', make_interpreter, 'exceptions'),
+    ]
+    print(f'fib({n}): {calls:,} calls')
+    print(f"{'Call path':<20}{'seconds':>10}{'calls/sec':>12}{'speedup':>10}")
+    try:
+        baseline = None
+        for name, factory, control_flow in variants:
+            options.CONTROL_FLOW = control_flow
+            node = resolve(parse(fib_program(n)))
+            seconds, _ = best_time(lambda: run_quietly(lambda: run_with(factory(), node)), repeat=3)
+            baseline = baseline or seconds
+            print(f'{name:<20}{seconds:>10.3f}{calls / seconds:>12,.0f}{baseline / seconds:>9.2f}x')
+    finally:
+        options.CONTROL_FLOW = saved
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Control-flow mode benchmark.
+Runs the bench_engines programs on the tree interpreter with RTResult flag
+polling and with exception-based control flow, and reports the run time and
+the number of RTResult objects created in each mode.
+
+Usage: python benchmarks/bench_control_flow.py [scale]
+"""
+
+import sys
+
+from common import best_time, run_quietly
+import options
+from bench_engines import parse, programs, run_program
+from run_time_result import RTResult
+
+MODES = ['result', 'exceptions']
+
+
+def count_results(func):
+    """Run func and return how many RTResult objects it created"""
+    created = 0
+    original_init = RTResult.__init__
+
+    def counting_init(self):
+        nonlocal created
+        created += 1
+        original_init(self)
+
+    RTResult.__init__ = counting_init
+    try:
+        func()
+    finally:
+        RTResult.__init__ = original_init
+    return created
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+
+    saved = options.ENGINE, options.CONTROL_FLOW
+    options.ENGINE = 'tree'
+    print(f"{'Program':<18}" + ''.join(f'{mode:>12}{"RTResults":>12}' for mode in MODES) + f"{'speedup':>10}")
+    try:
+        for name, source in programs(scale).items():
+            node = parse(source)
+            row = []
+            times = []
+            for mode in MODES:
+                options.CONTROL_FLOW = mode
+                seconds, _ = best_time(lambda: run_quietly(lambda: run_program(node)), repeat=3)
+                results = count_results(lambda: run_quietly(lambda: run_program(node)))
+                times.append(seconds)
+                row.append(f'{seconds:>12.4f}{results:>12,}')
+            print(f"{name:<18}" + ''.join(row) + f"{times[0] / times[-1]:>9.2f}x")
+    finally:
+        options.ENGINE, options.CONTROL_FLOW = saved
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Dictionary building benchmark.
+Builds dictionaries of increasing size with 'put d + [key, value] in d' on
+the tree engine, with dictionaries that copy every entry on each '+' (as
+Dict did before it was backed by a Hamt) and with the current Dict, and
+reports the total time and the time per insert, whose growth shows the
+O(n) copy against the O(log n) persistent update.
+
+Usage: python benchmarks/bench_dict_building.py [max_size]
+"""
+
+import sys
+
+from common import best_time
+from bench_calls import run_with
+from bench_engines import parse
+from interpreter import Interpreter
+from resolver import resolve
+from run_time_result import RTResult
+from values.dict_value import Dict
+
+
+class CopyingDict(Dict):
+    """Dict whose '+' copies every entry, as before dictionaries used a Hamt"""
+
+    def added_to(self, other):
+        new_dict = CopyingDict(self.elements.copy())
+        new_dict.set_pos(self.pos_start, self.pos_end)
+        new_dict.set_context(self.context)
+        new_dict.elements[self._get_hashable_key(other.elements[0])] = other.elements[1]
+        return new_dict, None
+
+
+class CopyingDictInterpreter(Interpreter):
+    """Interpreter whose (empty) dictionary literals make CopyingDicts"""
+
+    def visit_DictNode(self, node, context):
+        return RTResult().success(CopyingDict({}).set_context(context).set_pos(node.pos_start, node.pos_end))
+
+
+def build_program(size):
+    return '\n'.join([
+        'put {} in d;',
+        f'cycle i from 0 to {size}:',
+        '    put d + ["key" + i, i] in d;',
+        'end;',
+    ])
+
+
+def main():
+    max_size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    sizes = [size for size in (1000, 10000, 100000) if size <= max_size]
+
+    print(f"{'Size':>8}{'copying':>11}{'us/insert':>11}{'hamt':>11}{'us/insert':>11}{'speedup':>10}")
+    for size in sizes:
+        node = resolve(parse(build_program(size)))
+        copying, _ = best_time(lambda: run_with(CopyingDictInterpreter(), node), repeat=1)
+        hamt, _ = best_time(lambda: run_with(Interpreter(), node), repeat=3)
+        print(f'{size:>8}{copying:>10.3f}s{copying / size * 1e6:>11.1f}'
+              f'{hamt:>10.3f}s{hamt / size * 1e6:>11.1f}{copying / hamt:>9.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
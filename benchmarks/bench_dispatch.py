@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Visitor dispatch benchmark.
+Runs a tight 'as long as' loop with the interpreter's cached per-class
+dispatch and with the previous name-building getattr dispatch, and reports
+the time per visited node of each.
+
+Usage: python benchmarks/bench_dispatch.py [iterations]
+"""
+
+import sys
+
+from common import best_time
+from context import Context
+from entry import global_symbol_table
+from interpreter import Interpreter
+from lexer import make_lexer
+from parser import make_parser
+from symbol_table import SymbolTable
+
+
+class GetattrInterpreter(Interpreter):
+    """Interpreter.visit as it was before the dispatch table"""
+
+    def visit(self, node, context):
+        method_name = f'visit_{type(node).__name__}'
+        method = getattr(self, method_name, self.no_visit_method)
+        return method(node, context)
+
+
+class CountingInterpreter(Interpreter):
+    def __init__(self):
+        self.visits = 0
+
+    def visit(self, node, context):
+        self.visits += 1
+        return super().visit(node, context)
+
+
+def build_program(iterations):
+    return '\n'.join([
+        'put 0 in i;',
+        'put 0 in total;',
+        f'as long as i < {iterations}:',
+        '    put total + i % 7 in total;',
+        '    put i + 1 in i;',
+        'end;',
+    ])
+
+
+def parse(source):
+    tokens, error = make_lexer('<bench>', source).make_tokens()
+    if error: raise SystemExit(error.as_string())
+    ast = make_parser(tokens).parse()
+    if ast.error: raise SystemExit(ast.error.as_string())
+    return ast.node
+
+
+def run_with(interpreter, node):
+    context = Context('<program>')
+    context.symbol_table = SymbolTable(global_symbol_table)
+    result = interpreter.visit(node, context)
+    if result.error: raise SystemExit(result.error.as_string())
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    node = parse(build_program(iterations))
+
+    counter = CountingInterpreter()
+    run_with(counter, node)
+    visits = counter.visits
+
+    getattr_time, _ = best_time(lambda: run_with(GetattrInterpreter(), node))
+    table_time, _ = best_time(lambda: run_with(Interpreter(), node))
+
+    print(f"Iterations: {iterations}, node visits: {visits:,}")
+    print(f"{'Dispatch':<12}{'seconds':>10}{'ns/node':>10}")
+    print(f"{'getattr':<12}{getattr_time:>10.4f}{getattr_time / visits * 1e9:>10.1f}")
+    print(f"{'table':<12}{table_time:>10.4f}{table_time / visits * 1e9:>10.1f}")
+    print(f"Saved per node: {(getattr_time - table_time) / visits * 1e9:.1f} ns")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
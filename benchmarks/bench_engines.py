@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Execution engine benchmark.
+Runs loop- and call-heavy programs on the tree-walking interpreter, the
+closure-compiling engine and the bytecode VM and reports the run time of
+each and its speedup over the tree walker.
+
+Usage: python benchmarks/bench_engines.py [scale]
+"""
+
+import sys
+
+from common import best_time, run_quietly
+import options
+from entry import run_ast
+from lexer import make_lexer
+from parser import make_parser
+
+ENGINES = ['tree', 'closure', 'vm']
+
+
+def programs(scale):
+    return {
+        'while loop': '\n'.join([
+            'put 0 in i;',
+            'put 0 in total;',
+            f'as long as i < {20000 * scale}:',
+            '    put total + i % 7 * 2 in total;',
+            '    put i + 1 in i;',
+            'end;',
+        ]),
+        'nested cycle': '\n'.join([
+            'put 0 in total;',
+            f'cycle i from 0 to {100 * scale}:',
+            '    cycle j from 0 to 200:',
+            '        when (i + j) % 3 == 0:',
+            '            put total + 1 in total;',
+            '        end',
+            '    end;',
+            'end;',
+        ]),
+        'recursive calls': '\n'.join([
+            'make function fib(n):',
+            '    when n < 2:',
+            '        give n;',
+            '    end',
+            '    give fib(n - 1) + fib(n - 2);',
+            'end;',
+            f'show fib({17 + scale});',
+        ]),
+        'lambda calls': '\n'.join([
+            'put lambda a, b => a + b in add;',
+            'put 0 in total;',
+            f'cycle i from 0 to {10000 * scale}:',
+            '    put add(total, i) in total;',
+            'end;',
+        ]),
+    }
+
+
+def parse(source):
+    tokens, error = make_lexer('<bench>', source).make_tokens()
+    if error: raise SystemExit(error.as_string())
+    ast = make_parser(tokens).parse()
+    if ast.error: raise SystemExit(ast.error.as_string())
+    return ast.node
+
+
+def run_program(node):
+    _, error = run_ast('<bench>', node)
+    if error: raise SystemExit(error.as_string())
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+
+    saved = options.ENGINE
+    print(f"{'Program':<18}" + ''.join(f'{engine:>10}' for engine in ENGINES)
+          + ''.join(f"{engine + ' x':>10}" for engine in ENGINES[1:]))
+    try:
+        for name, source in programs(scale).items():
+            node = parse(source)
+            times = []
+            for engine in ENGINES:
+                options.ENGINE = engine
+                seconds, _ = best_time(lambda: run_quietly(lambda: run_program(node)), repeat=3)
+                times.append(seconds)
+            print(f"{name:<18}" + ''.join(f'{seconds:>10.4f}' for seconds in times)
+                  + ''.join(f'{times[0] / seconds:>9.2f}x' for seconds in times[1:]))
+    finally:
+        options.ENGINE = saved
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Expression parser benchmark.
+Parses an expression-heavy source with the recursive-descent Parser and
+with PrattParser, checks that both build the same tree, and reports parse
+time and the peak Python stack depth reached while parsing.
+
+Usage: python benchmarks/bench_expressions.py [file.uttr]
+"""
+
+import sys
+
+from common import ROOT, best_time
+from lexer import make_lexer
+from parser import Parser
+from pratt_parser import PrattParser
+from tokens import Token
+
+
+def peak_stack_depth(func):
+    """Run func once and return the deepest Python call nesting it reached."""
+    depth = 0
+    peak = 0
+
+    def profile(frame, event, arg):
+        nonlocal depth, peak
+        if event == 'call':
+            depth += 1
+            if depth > peak:
+                peak = depth
+        elif event == 'return':
+            depth -= 1
+
+    sys.setprofile(profile)
+    try:
+        func()
+    finally:
+        sys.setprofile(None)
+    return peak
+
+
+def tree_shape(node):
+    """Class names and token values of a tree, for comparing parser output."""
+    if isinstance(node, (list, tuple)):
+        return [tree_shape(item) for item in node]
+    if isinstance(node, Token):
+        return (node.type, node.value, node.idx_start)
+    if not hasattr(node, '__dict__'):
+        return node
+    fields = {
+        name: tree_shape(value)
+        for name, value in vars(node).items()
+        if name not in ('pos_start', 'pos_end')
+    }
+    return (type(node).__name__, fields)
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else str(ROOT / 'examples' / 'calculator_app.uttr')
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+
+    tokens, error = make_lexer(path, source).make_tokens()
+    if error:
+        raise SystemExit(error.as_string())
+    print(f"Source: {path} ({len(tokens)} tokens)")
+
+    results = {}
+    for name, parser_class in (('descent', Parser), ('pratt', PrattParser)):
+        parse = lambda: parser_class(tokens).parse()
+        seconds, result = best_time(parse, repeat=20)
+        if result.error:
+            raise SystemExit(result.error.as_string())
+        results[name] = (seconds, peak_stack_depth(parse), tree_shape(result.node))
+
+    if results['descent'][2] != results['pratt'][2]:
+        print("MISMATCH: parse trees differ")
+        return 1
+
+    print(f"{'Parser':<12}{'seconds':>10}{'tokens/sec':>14}{'peak frames':>14}")
+    for name, (seconds, depth, _) in results.items():
+        print(f"{name:<12}{seconds:>10.5f}{len(tokens) / seconds:>14,.0f}{depth:>14}")
+    print(f"Speedup: {results['descent'][0] / results['pratt'][0]:.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Counted loop benchmark.
+Runs 'cycle i from 0 to n' loops with a near-empty body on the tree engine,
+at top level (variable bound by name) and inside a function (variable bound
+into its resolved slot), with the previous visit_ForNode, which stepped a
+'while i < end' loop for every kind of bound, and with the range fast path
+integer bounds now take, and reports the overhead per iteration.
+
+Usage: python benchmarks/bench_for_range.py [iterations]
+"""
+
+import sys
+
+from common import best_time
+from bench_calls import run_with
+from bench_engines import parse
+from interpreter import Interpreter
+from resolver import resolve
+from run_time_result import RTResult
+from values.number_value import Number
+
+
+class GeneralLoopInterpreter(Interpreter):
+    """Interpreter.visit_ForNode as it was before the range fast path"""
+
+    def visit_ForNode(self, node, context):
+        res = RTResult()
+
+        start_value = res.register(self.visit(node.start_value_node, context))
+        if res.should_return(): return res
+
+        end_value = res.register(self.visit(node.end_value_node, context))
+        if res.should_return(): return res
+
+        if node.step_value_node:
+            step_value = res.register(self.visit(node.step_value_node, context))
+            if res.should_return(): return res
+            step = step_value.value
+        else:
+            step = 1
+
+        i = start_value.value
+
+        while i < end_value.value:
+            context.symbol_table.set_slot(node.slot, node.var_name_tok.value, Number(i))
+            i += step
+
+            res.register(self.visit(node.body_node, context))
+            if res.error: return res
+            if res.loop_should_cut: break
+            if res.loop_should_skip: continue
+            if res.func_return_value: return res
+
+        return res.success(Number.null)
+
+
+def top_level_program(iterations):
+    return '\n'.join([
+        f'cycle i from 0 to {iterations}:',
+        '    0;',
+        'end;',
+    ])
+
+
+def function_program(iterations):
+    return '\n'.join([
+        'make function count(n):',
+        '    cycle i from 0 to n:',
+        '        0;',
+        '    end;',
+        'end;',
+        f'count({iterations});',
+    ])
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    print(f'{iterations:,} iterations, body: 0;')
+    print(f"{'Loop':<12}{'while ns/iter':>15}{'range ns/iter':>15}{'speedup':>10}")
+    for name, build_program in [('top level', top_level_program), ('function', function_program)]:
+        node = resolve(parse(build_program(iterations)))
+        before, _ = best_time(lambda: run_with(GeneralLoopInterpreter(), node), repeat=3)
+        after, _ = best_time(lambda: run_with(Interpreter(), node), repeat=3)
+        print(f'{name:<12}{before / iterations * 1e9:>15.0f}{after / iterations * 1e9:>15.0f}{before / after:>9.2f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
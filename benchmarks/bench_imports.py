@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Module import benchmark.
+Compiles every module under stdlib/ and examples/modules/ the way 'bring'
+does, first without the AST cache, then into an empty cache directory
+(cold) and finally from the populated cache (warm), and reports the time
+of each.
+
+Usage: python benchmarks/bench_imports.py [rounds]
+"""
+
+import sys
+import tempfile
+
+from common import ROOT, best_time
+import options
+from module_loader import ModuleLoader
+
+
+def module_sources():
+    sources = []
+    for directory in ('stdlib', 'examples/modules'):
+        for path in sorted((ROOT / directory).glob('*.uttr')):
+            with open(path, 'r', encoding='utf-8') as f:
+                sources.append((str(path), f.read()))
+    return sources
+
+
+def compile_all(sources):
+    loader = ModuleLoader()
+    for path, source in sources:
+        _, error = loader.compile_module(path, source)
+        if error:
+            raise SystemExit(error.as_string())
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    sources = module_sources()
+    print(f"Modules: {len(sources)}")
+
+    saved = options.AST_CACHE, options.AST_CACHE_DIR
+    try:
+        options.AST_CACHE = 'off'
+        uncached, _ = best_time(lambda: compile_all(sources), repeat=rounds)
+
+        options.AST_CACHE = 'on'
+        cold = None
+        for _ in range(rounds):
+            with tempfile.TemporaryDirectory() as cache_dir:
+                options.AST_CACHE_DIR = cache_dir
+                seconds, _ = best_time(lambda: compile_all(sources), repeat=1)
+                cold = seconds if cold is None else min(cold, seconds)
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            options.AST_CACHE_DIR = cache_dir
+            compile_all(sources)
+            warm, _ = best_time(lambda: compile_all(sources), repeat=rounds)
+    finally:
+        options.AST_CACHE, options.AST_CACHE_DIR = saved
+
+    print(f"{'Mode':<16}{'seconds':>10}")
+    print(f"{'no cache':<16}{uncached:>10.4f}")
+    print(f"{'cold cache':<16}{cold:>10.4f}")
+    print(f"{'warm cache':<16}{warm:>10.4f}")
+    print(f"Warm speedup: {uncached / warm:.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Lexer benchmark.
+Compares the character-level Lexer with the table-driven TableLexer on a
+large source built from the examples/, tests/ and stdlib/ corpus, checks
+that both produce identical token streams and reports tokens/sec.
+
+Usage: python benchmarks/bench_lexer.py [target_lines]
+"""
+
+import sys
+
+from common import best_time, load_corpus
+from lexer import Lexer
+from table_lexer import TableLexer
+
+
+def build_source(target_lines):
+    """Concatenate corpus files until the source has at least target_lines lines."""
+    corpus = load_corpus()
+    parts = []
+    lines = 0
+    while lines < target_lines:
+        for _, source in corpus:
+            parts.append(source)
+            lines += source.count('\n') + 1
+            if lines >= target_lines:
+                break
+    return '\n'.join(parts)
+
+
+def token_signature(tokens):
+    return [
+        (tok.type, tok.value, tok.pos_start.idx, tok.pos_start.ln, tok.pos_start.col,
+         tok.pos_end.idx, tok.pos_end.ln, tok.pos_end.col)
+        for tok in tokens
+    ]
+
+
+def lex(lexer_class, source):
+    tokens, error = lexer_class('<bench>', source).make_tokens()
+    if error:
+        raise SystemExit(f'{lexer_class.__name__} failed: {error.as_string()}')
+    return tokens
+
+
+def main():
+    target_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    source = build_source(target_lines)
+    print(f"Source: {source.count(chr(10)) + 1} lines, {len(source)} characters")
+
+    char_time, char_tokens = best_time(lambda: lex(Lexer, source))
+    table_time, table_tokens = best_time(lambda: lex(TableLexer, source))
+
+    if token_signature(char_tokens) != token_signature(table_tokens):
+        print("MISMATCH: token streams differ")
+        return 1
+
+    count = len(char_tokens)
+    print(f"Tokens: {count} (streams identical)")
+    print(f"{'Lexer':<12}{'seconds':>10}{'tokens/sec':>14}")
+    print(f"{'char':<12}{char_time:>10.4f}{count / char_time:>14,.0f}")
+    print(f"{'table':<12}{table_time:>10.4f}{count / table_time:>14,.0f}")
+    print(f"Speedup: {char_time / table_time:.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+List building benchmark.
+Builds lists of increasing length with 'put result + i in result' on the
+tree engine, with lists that copy all their elements on every '+' (as List
+did before it shared buffers) and with the current List, and reports the
+time of each next to building the same list with the append builtin.
+
+Usage: python benchmarks/bench_list_building.py [max_length]
+"""
+
+import sys
+
+from common import best_time
+from bench_calls import run_with
+from bench_engines import parse
+from interpreter import Interpreter
+from resolver import resolve
+from run_time_result import RTResult
+from values.list_value import List
+
+
+class CopyingList(List):
+    """List whose '+' copies every element, as before lists shared buffers"""
+
+    def added_to(self, other):
+        new_list = self.copy()
+        new_list.elements.append(other)
+        return new_list, None
+
+    def copy(self):
+        copy = CopyingList(self.elements[:])
+        copy.set_pos(self.pos_start, self.pos_end)
+        copy.set_context(self.context)
+        return copy
+
+
+class CopyingListInterpreter(Interpreter):
+    """Interpreter whose list literals make CopyingLists"""
+
+    def visit_ListNode(self, node, context):
+        res = RTResult()
+        elements = []
+
+        for element_node in node.element_nodes:
+            elements.append(res.register(self.visit(element_node, context)))
+            if res.should_return(): return res
+
+        return res.success(
+            CopyingList(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
+        )
+
+
+def build_program(length, statement):
+    return '\n'.join([
+        'put [] in result;',
+        f'cycle i from 0 to {length}:',
+        f'    {statement}',
+        'end;',
+    ])
+
+
+def main():
+    max_length = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    lengths = [length for length in (1000, 10000, 100000) if length <= max_length]
+
+    print(f"{'Length':>8}{'copying +':>12}{'shared +':>12}{'append':>12}{'speedup':>10}")
+    for length in lengths:
+        plus = resolve(parse(build_program(length, 'put result + i in result;')))
+        append = resolve(parse(build_program(length, 'append(result, i);')))
+        copying, _ = best_time(lambda: run_with(CopyingListInterpreter(), plus), repeat=1)
+        shared, _ = best_time(lambda: run_with(Interpreter(), plus), repeat=3)
+        appended, _ = best_time(lambda: run_with(Interpreter(), append), repeat=3)
+        print(f'{length:>8}{copying:>11.3f}s{shared:>11.3f}s{appended:>11.3f}s{copying / shared:>9.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Loop memory benchmark.
+Runs 'as long as' loops of increasing length with the interpreter's loop
+visitors and with the previous ones, which kept every iteration's value in
+a list until the loop ended, and reports the tracemalloc peak of each.
+
+Usage: python benchmarks/bench_loop_memory.py [max_iterations]
+"""
+
+import sys
+import tracemalloc
+
+from bench_dispatch import parse, run_with
+from interpreter import Interpreter
+from run_time_result import RTResult
+from values.number_value import Number
+
+
+class AccumulatingInterpreter(Interpreter):
+    """Interpreter.visit_WhileNode as it was before loops stopped keeping their values"""
+
+    def visit_WhileNode(self, node, context):
+        res = RTResult()
+        elements = []
+
+        while True:
+            condition = res.register(self.visit(node.condition_node, context))
+            if res.should_return(): return res
+
+            if not condition.is_true():
+                break
+
+            value = res.register(self.visit(node.body_node, context))
+            if res.error: return res
+            if res.loop_should_cut: break
+            if res.loop_should_skip: continue
+            if res.func_return_value: return res
+
+            elements.append(value)
+
+        return res.success(Number.null)
+
+
+def build_program(iterations):
+    return '\n'.join([
+        'put 0 in i;',
+        'put 0 in total;',
+        f'as long as i < {iterations}:',
+        '    put total + i % 7 in total;',
+        '    put i + 1 in i;',
+        'end;',
+    ])
+
+
+def peak_kib(interpreter, node):
+    tracemalloc.start()
+    try:
+        run_with(interpreter, node)
+        return tracemalloc.get_traced_memory()[1] // 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    max_iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    counts = [count for count in (1000, 10000, 100000, 1000000) if count <= max_iterations]
+
+    print(f"{'Iterations':>10}{'accumulating KiB':>18}{'current KiB':>13}")
+    for iterations in counts:
+        node = parse(build_program(iterations))
+        before = peak_kib(AccumulatingInterpreter(), node)
+        after = peak_kib(Interpreter(), node)
+        print(f"{iterations:>10}{before:>18}{after:>13}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
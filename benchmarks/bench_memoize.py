@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Memoization benchmark.
+Runs a recursive fib(n) plain and wrapped with the memoize builtin (with a
+cache large enough for every argument and with one that keeps evicting)
+and reports the run time of each and the cache counters.
+
+Usage: python benchmarks/bench_memoize.py [n]
+"""
+
+import sys
+
+from common import best_time, run_quietly
+from bench_engines import parse, run_program
+from entry import global_symbol_table
+
+
+def fib_program(n, max_entries):
+    lines = [
+        'make function fib(n):',
+        '    when n < 2:',
+        '        give n;',
+        '    end',
+        '    give fib(n - 1) + fib(n - 2);',
+        'end;',
+    ]
+    if max_entries:
+        lines.append(f'put memoize(fib, {max_entries}) in fib;')
+    lines.append(f'show fib({n});')
+    return '\n'.join(lines)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    print(f"fib({n})")
+    print(f"{'Cache':<14}{'seconds':>10}{'hits':>8}{'misses':>8}{'evictions':>11}")
+    for name, max_entries in [('none', 0), (f'{n + 1} entries', n + 1), ('2 entries', 2)]:
+        node = parse(fib_program(n, max_entries))
+        seconds, _ = best_time(lambda: run_quietly(lambda: run_program(node)), repeat=3)
+        if max_entries:
+            stats = global_symbol_table.get('fib').cache.stats()
+            counters = f"{stats['hits']:>8}{stats['misses']:>8}{stats['evictions']:>11}"
+        else:
+            counters = f"{'-':>8}{'-':>8}{'-':>11}"
+        print(f"{name:<14}{seconds:>10.4f}{counters}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Front-end memory benchmark.
+Lexes and parses the corpus files (repeated up to a target line count)
+and reports, using tracemalloc, the number of live blocks and the memory
+retained by the token lists and by the ASTs.
+
+Usage: python benchmarks/bench_memory.py [target_lines]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from common import parsable_sources
+from lexer import make_lexer
+from parser import make_parser
+
+
+def measure(func):
+    """Run func under tracemalloc and return (result, allocation count, retained bytes)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = func()
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, 'filename')
+    allocations = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+    retained = sum(stat.size_diff for stat in stats)
+    return result, allocations, retained
+
+
+def main():
+    target_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    sources, lines = parsable_sources(target_lines)
+    print(f"Source: {len(sources)} files, {lines} lines")
+
+    token_lists, token_blocks, token_bytes = measure(
+        lambda: [make_lexer(path, source).make_tokens()[0] for path, source in sources])
+    _, ast_blocks, ast_bytes = measure(
+        lambda: [make_parser(tokens).parse().node for tokens in token_lists])
+
+    count = sum(len(tokens) for tokens in token_lists)
+    print(f"Tokens: {count}")
+    print(f"{'Stage':<12}{'live blocks':>14}{'retained KiB':>14}{'bytes/token':>14}")
+    print(f"{'lexer':<12}{token_blocks:>14,}{token_bytes / 1024:>14,.1f}{token_bytes / count:>14.1f}")
+    print(f"{'parser':<12}{ast_blocks:>14,}{ast_bytes / 1024:>14,.1f}{ast_bytes / count:>14.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Nested block parsing benchmark.
+Generates programs of alternately nested 'when' and 'cycle' blocks and
+reports parse time and tokens/sec for increasing nesting depths.
+
+Usage: python benchmarks/bench_nesting.py [max_depth]
+"""
+
+import sys
+
+from common import best_time
+from lexer import make_lexer
+from parser import make_parser
+
+
+def build_program(depth, statements_per_block=3):
+    """Return source with depth nested blocks, each holding a few simple statements."""
+    lines = []
+    for level in range(depth):
+        indent = '    ' * level
+        for i in range(statements_per_block):
+            lines.append(f'{indent}put x + {i} in x;')
+        if level % 2 == 0:
+            lines.append(f'{indent}when x > {level}:')
+        else:
+            lines.append(f'{indent}cycle i{level} from 0 to 2:')
+
+    indent = '    ' * depth
+    lines.append(f'{indent}show x;')
+
+    for level in reversed(range(depth)):
+        indent = '    ' * level
+        if level % 2 == 0:
+            lines.append(f'{indent}otherwise:')
+            lines.append(f'{indent}    put 0 in x;')
+        lines.append(f'{indent}end;')
+    return '\n'.join(lines)
+
+
+def main():
+    max_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    print(f"{'depth':>6}{'tokens':>10}{'seconds':>12}{'tokens/sec':>14}")
+
+    depth = 4
+    while depth <= max_depth:
+        tokens, error = make_lexer('<bench>', build_program(depth)).make_tokens()
+        if error:
+            raise SystemExit(error.as_string())
+
+        def parse():
+            result = make_parser(tokens).parse()
+            if result.error:
+                raise SystemExit(result.error.as_string())
+            return result
+
+        seconds, _ = best_time(parse, repeat=10)
+        print(f"{depth:>6}{len(tokens):>10}{seconds:>12.5f}{len(tokens) / seconds:>14,.0f}")
+        depth *= 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
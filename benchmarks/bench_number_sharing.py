@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Number sharing benchmark.
+Runs a comparison-heavy 'as long as' loop on the tree engine with numbers
+that make a new Number for every comparison, 'and' and arithmetic result
+(as Number did before results were shared) and with the current Number,
+whose comparisons give Number.true/Number.false and whose small int results,
+literals and variable reads use a cached Number, and reports the Numbers
+created per iteration and the run time of each. The closure engine and VM
+are reported with the current Number only.
+
+Usage: python benchmarks/bench_number_sharing.py [iterations]
+"""
+
+import sys
+
+from common import best_time, run_quietly
+import options
+from bench_calls import run_with
+from bench_engines import parse, run_program
+from interpreter import Interpreter
+from run_time_result import RTResult
+from values.number_value import Number
+
+
+class FreshNumber(Number):
+    """Number making a new result every time, for the operations the loop uses"""
+
+    def added_to(self, other):
+        return FreshNumber(self.value + other.value).set_context(self.context), None
+
+    def modded_by(self, other):
+        return FreshNumber(self.value % other.value).set_context(self.context), None
+
+    def get_comparison_eq(self, other):
+        return FreshNumber(int(self.value == other.value)).set_context(self.context), None
+
+    def get_comparison_ne(self, other):
+        return FreshNumber(int(self.value != other.value)).set_context(self.context), None
+
+    def get_comparison_lt(self, other):
+        return FreshNumber(int(self.value < other.value)).set_context(self.context), None
+
+    def anded_by(self, other):
+        return FreshNumber(int(self.value and other.value)).set_context(self.context), None
+
+    def copy(self):
+        copy = FreshNumber(self.value)
+        copy.set_pos(self.pos_start, self.pos_end)
+        copy.set_context(self.context)
+        return copy
+
+
+class FreshNumberInterpreter(Interpreter):
+    """Interpreter whose number literals make FreshNumbers"""
+
+    def visit_NumberNode(self, node, context):
+        return RTResult().success(
+            FreshNumber(node.tok.value).set_context(context).set_pos(node.pos_start, node.pos_end)
+        )
+
+
+def build_program(iterations):
+    return '\n'.join([
+        'put 0 in i;',
+        'put 0 in hits;',
+        f'as long as i < {iterations}:',
+        '    when i % 3 == 0 and i % 5 != 0:',
+        '        put hits + 1 in hits;',
+        '    end;',
+        '    put i + 1 in i;',
+        'end;',
+    ])
+
+
+def numbers_created(run):
+    """Numbers (of any subclass) constructed while run() runs"""
+    created = 0
+    init = Number.__init__
+
+    def counting_init(self, value):
+        nonlocal created
+        created += 1
+        init(self, value)
+
+    Number.__init__ = counting_init
+    try:
+        run()
+    finally:
+        Number.__init__ = init
+    return created
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    node = parse(build_program(iterations))
+
+    def on_engine(engine):
+        def run():
+            saved = options.ENGINE
+            options.ENGINE = engine
+            try:
+                run_quietly(lambda: run_program(node))
+            finally:
+                options.ENGINE = saved
+        return run
+
+    runs = [
+        ('tree, fresh', lambda: run_with(FreshNumberInterpreter(), node)),
+        ('tree, shared', lambda: run_with(Interpreter(), node)),
+        ('closure, shared', on_engine('closure')),
+        ('vm, shared', on_engine('vm')),
+    ]
+
+    print(f"{iterations:,} iterations of 3 comparisons, an 'and' and 3 or 4 arithmetic operations")
+    print(f"{'Run':<18}{'Numbers':>12}{'per iter':>10}{'time':>10}")
+    for name, run in runs:
+        created = numbers_created(run)
+        seconds, _ = best_time(run, repeat=3)
+        print(f'{name:<18}{created:>12,}{created / iterations:>10.2f}{seconds:>9.3f}s')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
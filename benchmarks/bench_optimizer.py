@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Optimizer benchmark.
+Runs a loop full of 'keep' constants and constant subexpressions with and
+without the AST optimization pass and reports the run time of each.
+
+Usage: python benchmarks/bench_optimizer.py [iterations]
+"""
+
+import sys
+
+from common import best_time, run_quietly
+from entry import run_ast
+from lexer import make_lexer
+from optimizer import optimize
+from parser import make_parser
+
+
+def build_program(iterations):
+    return '\n'.join([
+        'keep 60 * 60 * 24 as SECONDS_PER_DAY;',
+        'keep 3.14159265359 as PI;',
+        'keep "item-" + "id" as PREFIX;',
+        'put 0 in total;',
+        f'cycle i from 0 to {iterations}:',
+        '    put total + i * SECONDS_PER_DAY / (24 * 60) + PI * 2 * 2 in total;',
+        '    put PREFIX + "-" + "x" in label;',
+        'end;',
+        'show total;',
+    ])
+
+
+def parse(source):
+    tokens, error = make_lexer('<bench>', source).make_tokens()
+    if error: raise SystemExit(error.as_string())
+    ast = make_parser(tokens).parse()
+    if ast.error: raise SystemExit(ast.error.as_string())
+    return ast.node
+
+
+def run_program(node):
+    _, error = run_ast('<bench>', node)
+    if error: raise SystemExit(error.as_string())
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    source = build_program(iterations)
+
+    plain = parse(source)
+    optimized = optimize(parse(source))
+
+    plain_time, _ = best_time(lambda: run_quietly(lambda: run_program(plain)), repeat=3)
+    optimized_time, _ = best_time(lambda: run_quietly(lambda: run_program(optimized)), repeat=3)
+
+    print(f"Iterations: {iterations}")
+    print(f"{'Mode':<12}{'seconds':>10}")
+    print(f"{'plain':<12}{plain_time:>10.4f}")
+    print(f"{'optimized':<12}{optimized_time:>10.4f}")
+    print(f"Speedup: {plain_time / optimized_time:.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Parser benchmark.
+Lexes the corpus files (repeated up to a target line count) once, then
+times parsing the token streams and reports tokens/sec.
+
+Usage: python benchmarks/bench_parser.py [target_lines]
+"""
+
+import sys
+
+from common import best_time, parsable_sources
+from lexer import make_lexer
+from parser import make_parser
+
+
+def parse_all(token_lists):
+    return [make_parser(tokens).parse() for tokens in token_lists]
+
+
+def main():
+    target_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    sources, lines = parsable_sources(target_lines)
+    token_lists = [make_lexer(path, source).make_tokens()[0] for path, source in sources]
+    count = sum(len(tokens) for tokens in token_lists)
+    print(f"Source: {len(sources)} files, {lines} lines, {count} tokens")
+
+    parse_time, _ = best_time(lambda: parse_all(token_lists))
+    print(f"{'Stage':<12}{'seconds':>10}{'tokens/sec':>14}")
+    print(f"{'parser':<12}{parse_time:>10.4f}{count / parse_time:>14,.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
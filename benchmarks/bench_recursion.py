@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Recursion depth benchmark.
+Runs a non-tail recursive function at increasing depths on the tree
+interpreter (both control flow modes) and on the bytecode VM, whose call
+frames live on the heap, and reports the run time of each depth or how the
+run failed, with the peak call depth the VM reached.
+
+Usage: python benchmarks/bench_recursion.py [max_depth]
+"""
+
+import sys
+import time
+
+from common import run_quietly
+import options
+import vm
+from bench_engines import parse
+from entry import run_ast
+
+MODES = [('tree', 'result'), ('tree', 'exceptions'), ('vm', 'result')]
+
+
+def depth_program(depth):
+    return '\n'.join([
+        'make function down(n):',
+        '    when n == 0:',
+        '        give 0;',
+        '    end',
+        '    give 1 + down(n - 1);',
+        'end;',
+        f'show down({depth});',
+    ])
+
+
+def run_once(node):
+    """Seconds the run took, or a short description of how it failed"""
+    start = time.perf_counter()
+    try:
+        _, error = run_quietly(lambda: run_ast('<bench>', node))
+    except RecursionError:
+        return 'RecursionError'
+    if error: return error.details
+    return f'{time.perf_counter() - start:.3f}s'
+
+
+def main():
+    max_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    depths = [depth for depth in (100, 500, 1000, 5000, 10000, 50000) if depth <= max_depth]
+
+    saved = options.ENGINE, options.CONTROL_FLOW, options.MAX_CALL_DEPTH
+    # The program's own frame and down(0) come on top of the depth
+    options.MAX_CALL_DEPTH = max_depth + 2
+    print(f"Python recursion limit: {sys.getrecursionlimit()}, VM call depth limit: {options.MAX_CALL_DEPTH}")
+    print(f"{'Depth':>8}" + ''.join(f'{engine + "/" + control_flow:>20}' for engine, control_flow in MODES) + f"{'VM peak':>10}")
+    try:
+        for depth in depths:
+            row = f'{depth:>8}'
+            for engine, control_flow in MODES:
+                options.ENGINE, options.CONTROL_FLOW = engine, control_flow
+                vm.reset_peak_call_depth()
+                row += f'{run_once(parse(depth_program(depth))):>20}'
+            print(row + f'{vm.peak_call_depth:>10}')
+    finally:
+        options.ENGINE, options.CONTROL_FLOW, options.MAX_CALL_DEPTH = saved
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
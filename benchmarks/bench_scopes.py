@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Variable lookup benchmark.
+Times single lookups of a local, of a variable of the outermost enclosing
+function and of a global builtin from frames nested 1 to 8 functions deep,
+by name through chained symbol tables (UTTR_RESOLVE=off) and by resolved
+(depth, slot) address into list-backed frames, then runs programs built
+around such reads on the tree engine in both modes.
+
+Usage: python benchmarks/bench_scopes.py [scale]
+"""
+
+import sys
+import timeit
+
+from common import best_time, run_quietly
+import options
+from bench_engines import parse, run_program
+from entry import global_symbol_table
+from resolver import Scope
+from symbol_table import SlotTable, SymbolTable
+from values.number_value import Number
+
+MODES = ['off', 'on']
+DEPTHS = [1, 2, 4, 8]
+LOOKUPS = 200000
+
+
+def nested_tables(depth):
+    """Innermost of depth nested function frames, by name and with slots"""
+    named = global_symbol_table
+    slotted = global_symbol_table
+    scope = None
+    for level in range(depth):
+        scope = Scope(scope)
+        named = SymbolTable(named)
+        slotted = SlotTable(scope, slotted)
+        for name in (f'arg{level}', 'total', 'i'):
+            scope.declare(name)
+            slotted.slots.append(None)
+            named.set(name, Number(level))
+            slotted.set(name, Number(level))
+    return named, slotted, scope
+
+
+def time_lookups(table, name, address):
+    if address is None:
+        seconds = timeit.timeit(lambda: table.get(name), number=LOOKUPS)
+    else:
+        seconds = timeit.timeit(lambda: table.lookup(name, address), number=LOOKUPS)
+    return seconds / LOOKUPS * 1e9
+
+
+def print_lookups():
+    print(f"{'Lookup (ns)':<18}" + ''.join(f"{f'depth {depth}':>16}" for depth in DEPTHS))
+    for label, name in (('local', 'total'), ('outermost arg', 'arg0'), ('global builtin', 'len')):
+        row = []
+        for depth in DEPTHS:
+            named, slotted, scope = nested_tables(depth)
+            address = scope.address(name)
+            row.append(f'{time_lookups(named, name, None):>7.0f} /{time_lookups(slotted, name, address):>6.0f}')
+        print(f"{label:<18}" + ''.join(f'{cell:>16}' for cell in row))
+    print('(by name / by address)')
+    print()
+
+
+def programs(scale):
+    return {
+        'deep closure': '\n'.join([
+            'make function level1(a):',
+            '    make function level2(b):',
+            '        make function level3(c):',
+            '            make function level4(d):',
+            '                make function level5(e):',
+            '                    put 0 in total;',
+            f'                    cycle i from 0 to {2000 * scale}:',
+            '                        put total + a * b + b * c + c * d + d * e + a * e in total;',
+            '                    end;',
+            '                    give total;',
+            '                end;',
+            '                give level5(5);',
+            '            end;',
+            '            give level4(4);',
+            '        end;',
+            '        give level3(3);',
+            '    end;',
+            '    give level2(2);',
+            'end;',
+            'show level1(1);',
+        ]),
+        'global builtins': '\n'.join([
+            'put [1, 2, 3] in items;',
+            'make function outer():',
+            '    make function middle():',
+            '        make function inner():',
+            '            put 0 in total;',
+            f'            cycle i from 0 to {2000 * scale}:',
+            '                put total + len(items) + len(keys({})) + len(values({})) in total;',
+            '                put total + len(split("a b", " ")) in total;',
+            '            end;',
+            '            give total;',
+            '        end;',
+            '        give inner();',
+            '    end;',
+            '    give middle();',
+            'end;',
+            'show outer();',
+        ]),
+        'local variables': '\n'.join([
+            'make function work(n):',
+            '    put 0 in a;',
+            '    put 1 in b;',
+            '    cycle i from 0 to n:',
+            '        put a + b in c;',
+            '        put b in a;',
+            '        put c % 1000 in b;',
+            '    end;',
+            '    give b;',
+            'end;',
+            f'show work({10000 * scale});',
+        ]),
+    }
+
+
+def main():
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+
+    print_lookups()
+
+    saved = options.ENGINE, options.RESOLVE
+    options.ENGINE = 'tree'
+    print(f"{'Program':<18}{'by name':>10}{'slots':>10}{'speedup':>10}")
+    try:
+        for name, source in programs(scale).items():
+            times = []
+            for mode in MODES:
+                options.RESOLVE = mode
+                # Parse again so the unresolved run sees no slot annotations
+                node = parse(source)
+                seconds, _ = best_time(lambda: run_quietly(lambda: run_program(node)), repeat=5)
+                times.append(seconds)
+            print(f"{name:<18}{times[0]:>10.4f}{times[1]:>10.4f}{times[0] / times[1]:>9.2f}x")
+    finally:
+        options.ENGINE, options.RESOLVE = saved
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
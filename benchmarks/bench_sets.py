@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Set storage benchmark.
+Inserts numbers, strings and tuples into a Set, tests membership of each,
+and reads every element back, once with the previous storage (each element
+wrapped in a ('number', v)-style tuple on insert and rebuilt as a new value
+on every read) and once with values stored as they are, hashing and
+comparing structurally.
+
+Usage: python benchmarks/bench_sets.py [elements]
+"""
+
+import sys
+
+from common import best_time
+from values.number_value import Number
+from values.set_value import Set
+from values.string_value import String
+from values.tuple_value import Tuple
+
+
+def make_hashable(elem):
+    """Set._make_hashable before values hashed themselves"""
+    if isinstance(elem, Number):
+        return ('number', elem.value)
+    elif isinstance(elem, String):
+        return ('string', elem.value)
+    return ('other', str(elem))
+
+
+def from_hashable(hashable):
+    """Set._from_hashable before values hashed themselves"""
+    type_tag, value = hashable
+    return Number(value) if type_tag == 'number' else String(value)
+
+
+def tagged(values):
+    elements = {make_hashable(value) for value in values}
+    found = sum(make_hashable(value) in elements for value in values)
+    read = [from_hashable(elem) for elem in elements]
+    return found, len(read)
+
+
+def native(values):
+    elements = Set(values).elements
+    found = sum(value in elements for value in values)
+    read = list(elements)
+    return found, len(read)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    workloads = [
+        ('numbers', [Number(i) for i in range(count)]),
+        ('strings', [String(f'item{i}') for i in range(count)]),
+        ('tuples', [Tuple([Number(i), String('x')]) for i in range(count)]),
+    ]
+
+    print(f'{count:,} elements: insert, membership of each, read back')
+    print(f"{'Elements':<10}{'tagged':>10}{'native':>10}{'speedup':>10}")
+    for name, values in workloads:
+        before, _ = best_time(lambda: tagged(values), repeat=3)
+        after, _ = best_time(lambda: native(values), repeat=3)
+        print(f'{name:<10}{before:>9.3f}s{after:>9.3f}s{before / after:>9.2f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Program streaming benchmark.
+Runs a long generated script (as shell.py runs files) parsed whole into one
+ListNode and then run, and parsed and run one top-level statement at a
+time, and reports the time until its first statement has run, the total
+run time and the tracemalloc peak of each.
+
+Usage: python benchmarks/bench_streaming.py [statements]
+"""
+
+import io
+import sys
+import time
+import tracemalloc
+
+import common  # puts the interpreter modules on sys.path
+import entry
+
+
+class FirstWriteClock(io.StringIO):
+    """stdout that remembers when the program first wrote to it"""
+
+    def __init__(self):
+        super().__init__()
+        self.first_write = None
+
+    def write(self, text):
+        if self.first_write is None:
+            self.first_write = time.perf_counter()
+        return super().write(text)
+
+
+def build_script(statements):
+    lines = ['show "started";']
+    for i in range(statements):
+        lines.append(f'put [{i}, {i} * 2, "item {i}"] in row{i % 50};')
+    lines.append('show "done";')
+    return '\n'.join(lines)
+
+
+def run_script(run, script):
+    """(seconds to the first output, total seconds) of one run"""
+    saved = sys.stdout
+    sys.stdout = clock = FirstWriteClock()
+    start = time.perf_counter()
+    try:
+        _, error = run('<bench>', script)
+    finally:
+        sys.stdout = saved
+    if error: raise SystemExit(error.as_string())
+    return clock.first_write - start, time.perf_counter() - start
+
+
+def peak_kib(run, script):
+    tracemalloc.start()
+    try:
+        run_script(run, script)
+        return tracemalloc.get_traced_memory()[1] // 1024
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    script = build_script(statements)
+
+    print(f"Statements: {statements:,}")
+    print(f"{'Mode':<8}{'first output':>14}{'total':>10}{'peak KiB':>10}")
+    for name, run in [('batch', entry.run), ('stream', entry.run_stream)]:
+        runs = [run_script(run, script) for _ in range(3)]
+        first = min(first for first, _ in runs)
+        total = min(total for _, total in runs)
+        print(f"{name:<8}{first:>13.4f}s{total:>9.3f}s{peak_kib(run, script):>10}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
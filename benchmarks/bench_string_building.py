@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+String building benchmark.
+Builds a string from 10-character pieces with 'put out + piece in out' on
+the tree engine, up to 1M pieces (10 MB), with strings that make a new str
+on every '+' (as String did before long concatenations became ropes) and
+with the current String, and reports the build time and the time of the
+first read of the result's value, which joins the rope. The copying build
+is quadratic, so it is skipped past max_copying_pieces.
+
+Usage: python benchmarks/bench_string_building.py [max_pieces] [max_copying_pieces]
+"""
+
+import sys
+import time
+
+from common import best_time
+from bench_engines import parse
+from context import Context
+from entry import global_symbol_table
+from interpreter import Interpreter
+from resolver import resolve
+from run_time_result import RTResult
+from symbol_table import SymbolTable
+from values.string_value import String
+
+PIECE = '0123456789'
+
+
+class CopyingString(String):
+    """String whose '+' always makes a new str, as before ropes"""
+
+    def added_to(self, other):
+        return CopyingString(self.value + other.value).set_context(self.context), None
+
+    def copy(self):
+        copy = CopyingString(self.value)
+        copy.set_pos(self.pos_start, self.pos_end)
+        copy.set_context(self.context)
+        return copy
+
+
+class CopyingStringInterpreter(Interpreter):
+    """Interpreter whose string literals make CopyingStrings"""
+
+    def visit_StringNode(self, node, context):
+        return RTResult().success(
+            CopyingString(node.tok.value).set_context(context).set_pos(node.pos_start, node.pos_end)
+        )
+
+
+def build_program(pieces):
+    return '\n'.join([
+        'put "" in out;',
+        f'cycle i from 0 to {pieces}:',
+        f'    put out + "{PIECE}" in out;',
+        'end;',
+    ])
+
+
+def build(interpreter, node):
+    """Run the program and return the String it built"""
+    context = Context('<program>')
+    context.symbol_table = SymbolTable(global_symbol_table)
+    result = interpreter.visit(node, context)
+    if result.error: raise SystemExit(result.error.as_string())
+    return context.symbol_table.get('out')
+
+
+def main():
+    max_pieces = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    max_copying_pieces = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    counts = [count for count in (10000, 100000, 1000000) if count <= max_pieces]
+
+    print(f"{'Pieces':>8}{'MB':>7}{'copying +':>12}{'rope +':>10}{'first read':>12}")
+    for pieces in counts:
+        node = resolve(parse(build_program(pieces)))
+        if pieces <= max_copying_pieces:
+            copying, _ = best_time(lambda: build(CopyingStringInterpreter(), node), repeat=1)
+            copying = f'{copying:.3f}s'
+        else:
+            copying = 'skipped'
+
+        rope, out = best_time(lambda: build(Interpreter(), node), repeat=1)
+        start = time.perf_counter()
+        length = len(out.value)
+        read = time.perf_counter() - start
+        print(f'{pieces:>8}{length / 1e6:>7.1f}{copying:>12}{rope:>9.3f}s{read:>11.4f}s')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
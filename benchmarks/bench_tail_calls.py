@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tail call benchmark.
+Runs an accumulator-style tail-recursive loop at increasing depths on the
+tree interpreter with and without the tail call pass, in both control flow
+modes, and reports the run time and peak traced memory of each depth, or
+how the run failed.
+
+Usage: python benchmarks/bench_tail_calls.py [max_depth]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from common import run_quietly
+import options
+from bench_engines import parse
+from entry import run_ast
+
+MODES = [('off', 'result'), ('on', 'result'), ('off', 'exceptions'), ('on', 'exceptions')]
+
+
+def tail_program(depth):
+    return '\n'.join([
+        'make function count(n, acc):',
+        '    when n == 0:',
+        '        give acc;',
+        '    end',
+        '    give count(n - 1, acc + n % 3);',
+        'end;',
+        f'show count({depth}, 0);',
+    ])
+
+
+def run_once(node):
+    """'seconds / peak KiB' of the run, or a short description of how it failed"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        _, error = run_quietly(lambda: run_ast('<bench>', node))
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    except RecursionError:
+        return 'RecursionError'
+    finally:
+        tracemalloc.stop()
+    if error: return error.details
+    return f'{seconds:.3f}s / {peak // 1024} KiB'
+
+
+def main():
+    max_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    depths = [depth for depth in (100, 1000, 10000, 100000) if depth <= max_depth]
+
+    saved = options.ENGINE, options.TAIL_CALLS, options.CONTROL_FLOW
+    options.ENGINE = 'tree'
+    print(f"{'Depth':>8}" + ''.join(f"{'tail ' + tail_calls + '/' + control_flow:>24}" for tail_calls, control_flow in MODES))
+    try:
+        for depth in depths:
+            row = f'{depth:>8}'
+            for tail_calls, control_flow in MODES:
+                options.TAIL_CALLS, options.CONTROL_FLOW = tail_calls, control_flow
+                # Parsed per mode: the tail call pass marks the tree in place
+                row += f'{run_once(parse(tail_program(depth))):>24}'
+            print(row)
+    finally:
+        options.ENGINE, options.TAIL_CALLS, options.CONTROL_FLOW = saved
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
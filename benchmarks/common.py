@@ -0,0 +1,73 @@
+"""
+Shared helpers for the UTTR benchmark scripts.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# Make the interpreter modules importable when running a script directly
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+CORPUS_DIRS = ['examples', 'tests', 'stdlib']
+
+
+def load_corpus():
+    """Return a list of (path, source) for every .uttr file in the corpus directories."""
+    corpus = []
+    for directory in CORPUS_DIRS:
+        for path in sorted((ROOT / directory).rglob('*.uttr')):
+            with open(path, 'r', encoding='utf-8') as f:
+                corpus.append((str(path.relative_to(ROOT)), f.read()))
+    return corpus
+
+
+def parsable_sources(target_lines):
+    """Corpus sources that lex and parse cleanly, repeated until target_lines is reached."""
+    # Imported lazily so load_corpus() does not pull in the front end
+    from lexer import make_lexer
+    from parser import make_parser
+
+    sources = []
+    for path, source in load_corpus():
+        tokens, error = make_lexer(path, source).make_tokens()
+        if error or make_parser(tokens).parse().error:
+            continue
+        sources.append((path, source))
+
+    selected = []
+    lines = 0
+    while lines < target_lines:
+        for path, source in sources:
+            selected.append((path, source))
+            lines += source.count('\n') + 1
+            if lines >= target_lines:
+                break
+    return selected, lines
+
+
+def best_time(func, repeat=5):
+    """Run func repeat times and return (best seconds, last result)."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+
+def run_quietly(func):
+    """Run func with stdout discarded (for benchmarks of programs that call show)."""
+    with open(os.devnull, 'w') as devnull:
+        saved = sys.stdout
+        sys.stdout = devnull
+        try:
+            return func()
+        finally:
+            sys.stdout = saved
@@ -0,0 +1,175 @@
+"""
+Bytecode format of the UTTR virtual machine (see bytecode_compiler.py and vm.py).
+A Code object holds a flat list of (opcode, argument) integer pairs, a
+constant pool and a position table. Arguments are small integers (counts
+and jump targets) or index the pool, which holds each name and literal
+value once however many instructions use it. Source positions, used for
+values and error messages, are kept per instruction in the position table.
+"""
+
+import math
+
+# Position table entries are (pos_start, pos_end) of the instruction's node
+# unless noted otherwise.
+
+# Literals and names
+NUMBER = 0            # const value -> push Number
+STRING = 1            # const value -> push String
+REGEX = 2             # const pattern -> push Regex
+LOAD_NAME = 3         # const name -> push variable
+STORE_NAME = 4        # const name; stores top of stack, leaves it there
+PUSH_NULL = 5         # push Number.null
+POP_TOP = 6
+
+# Operators
+BINARY_OP = 7         # const method name; position also holds both operands' (pos_start, pos_end)
+NEGATE = 8
+NOT = 9
+UNARY_PLUS = 10
+INDEX = 11            # position (list pos_start, list pos_end, index pos_start, index pos_end)
+
+# Collections
+BUILD_LIST = 12       # argument is the element count
+BUILD_TUPLE = 13      # argument is the element count
+BUILD_SET = 14        # argument is the element count
+CHECK_DICT_KEY = 15   # checks the key below the top of stack; position of the key
+BUILD_DICT = 16       # argument is the pair count
+
+# Jumps (argument is the target offset)
+JUMP = 17
+POP_JUMP_IF_FALSE = 18
+POP_JUMP_IF_TRUE = 19
+CASE_MATCH = 20       # pops case value; on no match jumps, on match also pops the switch value
+
+# Loops and blocks
+SETUP_LOOP = 21       # const (cut target, skip target)
+POP_BLOCK = 22
+FOR_RANGE_INIT = 23   # argument 1 if a step value is on the stack
+FOR_RANGE_NEXT = 24   # const (name, exit target)
+FOR_EACH_INIT = 25    # position of the iterable
+FOR_EACH_NEXT = 26    # const (name, exit target)
+CUT = 27
+SKIP = 28
+SETUP_ATTEMPT = 29    # argument is the handler offset
+BIND_ERROR = 30       # const error variable name or None
+
+# Functions
+MAKE_FUNCTION = 31    # const (name, body node, arg names, Code)
+PREPARE_CALL = 32     # copies the value to call
+CALL = 33             # argument is the arg count
+GIVE = 34             # returns top of stack from the function
+RETURN_VALUE = 35     # end of a body: returns top of stack as its value
+
+# List comprehensions
+COMP_ENTER = 36       # pushes the element accumulator and enters a child scope
+COMP_ITER = 37        # position of the iterable
+COMP_NEXT = 38        # const (name, exit target)
+COMP_APPEND = 39      # argument is the accumulator's distance from the top of stack
+COMP_EXIT = 40
+
+# Nodes run by the tree interpreter ('bring', 'share')
+DELEGATE = 41         # const node
+
+OPCODE_NAMES = {value: name for name, value in globals().copy().items() if name.isupper() and isinstance(value, int)}
+
+JUMP_OPCODES = frozenset([JUMP, POP_JUMP_IF_FALSE, POP_JUMP_IF_TRUE, CASE_MATCH, SETUP_ATTEMPT])
+NO_ARG_OPCODES = frozenset([
+    PUSH_NULL, POP_TOP, NEGATE, NOT, UNARY_PLUS, INDEX, CHECK_DICT_KEY, POP_BLOCK, FOR_EACH_INIT, CUT, SKIP,
+    PREPARE_CALL, GIVE, RETURN_VALUE, COMP_ENTER, COMP_ITER, COMP_EXIT,
+])
+COUNT_OPCODES = frozenset([FOR_RANGE_INIT, BUILD_LIST, BUILD_TUPLE, BUILD_SET, BUILD_DICT, CALL, COMP_APPEND])
+
+
+class Code:
+    """Compiled body of a program, module or function"""
+
+    def __init__(self, name):
+        self.name = name
+        self.ops = []
+        self.constants = []
+        # (type, value) -> index in constants, for the values stored once
+        self.constant_indexes = {}
+        # Source positions of each instruction, indexed by offset // 2
+        self.positions = []
+
+    def emit(self, opcode, arg=0, position=None):
+        """Append an instruction and return its offset"""
+        self.ops.append(opcode)
+        self.ops.append(arg)
+        self.positions.append(position)
+        return len(self.ops) - 2
+
+    def add_constant(self, value):
+        """Index of value in the pool; equal hashable values of the same type share one entry"""
+        key = (type(value), value)
+        if type(value) is float:
+            # 0.0 and -0.0 are equal but show differently
+            key += (math.copysign(1.0, value),)
+        try:
+            index = self.constant_indexes.get(key)
+        except TypeError:
+            # Unhashable (function constants holding arg name lists)
+            self.constants.append(value)
+            return len(self.constants) - 1
+        if index is None:
+            index = self.constant_indexes[key] = len(self.constants)
+            self.constants.append(value)
+        return index
+
+    def emit_const(self, opcode, value, position=None):
+        return self.emit(opcode, self.add_constant(value), position)
+
+    def offset(self):
+        """Offset of the next instruction"""
+        return len(self.ops)
+
+    def patch(self, offset, arg):
+        self.ops[offset + 1] = arg
+
+    def __repr__(self):
+        return f'<code {self.name}>'
+
+
+def disassemble(code):
+    """Readable listing of code and every function compiled inside it"""
+    lines = [f'Disassembly of {code.name}:']
+    nested = []
+    ops = code.ops
+
+    for offset in range(0, len(ops), 2):
+        opcode, arg = ops[offset], ops[offset + 1]
+        name = OPCODE_NAMES.get(opcode, f'<{opcode}>')
+        if opcode in NO_ARG_OPCODES:
+            lines.append(f'{offset:>6}  {name}')
+        else:
+            lines.append(f'{offset:>6}  {name:<18}{arg:>5}  {describe_arg(code, opcode, arg, nested)}'.rstrip())
+
+    for inner in nested:
+        lines.append('')
+        lines.append(disassemble(inner))
+    return '\n'.join(lines)
+
+
+def describe_arg(code, opcode, arg, nested):
+    if opcode in JUMP_OPCODES:
+        return f'(to {arg})'
+    if opcode in COUNT_OPCODES:
+        return ''
+
+    constant = code.constants[arg]
+    if opcode in (NUMBER, STRING, REGEX):
+        return f'({constant!r})'
+    if opcode in (LOAD_NAME, STORE_NAME, BINARY_OP):
+        return f'({constant})'
+    if opcode == SETUP_LOOP:
+        return f'(cut to {constant[0]}, skip to {constant[1]})'
+    if opcode in (FOR_RANGE_NEXT, FOR_EACH_NEXT, COMP_NEXT):
+        return f'({constant[0]}, exit to {constant[1]})'
+    if opcode == BIND_ERROR:
+        return f'({constant})' if constant else ''
+    if opcode == MAKE_FUNCTION:
+        nested.append(constant[3])
+        return f'({constant[3].name})'
+    if opcode == DELEGATE:
+        return f'({type(constant).__name__})'
+    return ''
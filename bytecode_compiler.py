@@ -0,0 +1,347 @@
+"""
+Compiler from the UTTR AST to the linear bytecode run by vm.VM.
+Every expression leaves exactly one value on the operand stack; statement
+lists either collect their values into a List (like Interpreter) or pop
+them when the value is thrown away (loop bodies, null-returning blocks).
+"""
+
+from bytecode import (
+    BIND_ERROR, BINARY_OP, BUILD_DICT, BUILD_LIST, BUILD_SET, BUILD_TUPLE, CALL, CASE_MATCH, CHECK_DICT_KEY,
+    COMP_APPEND, COMP_ENTER, COMP_EXIT, COMP_ITER, COMP_NEXT, CUT, DELEGATE, FOR_EACH_INIT, FOR_EACH_NEXT,
+    FOR_RANGE_INIT, FOR_RANGE_NEXT, GIVE, INDEX, JUMP, LOAD_NAME, MAKE_FUNCTION, NEGATE, NOT, NUMBER, POP_BLOCK,
+    POP_JUMP_IF_FALSE, POP_JUMP_IF_TRUE, POP_TOP, PREPARE_CALL, PUSH_NULL, REGEX, RETURN_VALUE, SETUP_ATTEMPT,
+    SETUP_LOOP, SKIP, STORE_NAME, STRING, UNARY_PLUS, Code,
+)
+from nodes.list_node import ListNode
+from nodes.return_node import ReturnNode
+from tokens import KW_AND, KW_NOT, KW_OR, TT_AMPERSAND, TT_CARET, TT_DIV, TT_EE, TT_GT, TT_GTE, TT_LT, TT_LTE, TT_MINUS, TT_MOD, TT_MUL, TT_NE, TT_PLUS
+
+# Value method called for each binary operator (see Interpreter.visit_BinOpNode)
+BINARY_OP_METHODS = {
+    TT_PLUS: 'added_to',
+    TT_MINUS: 'subbed_by',
+    TT_MUL: 'multed_by',
+    TT_DIV: 'dived_by',
+    TT_MOD: 'modded_by',
+    TT_EE: 'get_comparison_eq',
+    TT_NE: 'get_comparison_ne',
+    TT_LT: 'get_comparison_lt',
+    TT_GT: 'get_comparison_gt',
+    TT_LTE: 'get_comparison_lte',
+    TT_GTE: 'get_comparison_gte',
+    TT_AMPERSAND: 'intersected_with',
+    TT_CARET: 'symmetric_diff_with',
+    KW_AND: 'anded_by',
+    KW_OR: 'ored_by',
+}
+
+
+def span(node):
+    """Position table entry of node"""
+    return (node.pos_start, node.pos_end)
+
+
+def compile_program(node, name='<program>'):
+    """Compile the AST of a whole program or module into a Code object"""
+    return BytecodeCompiler(Code(name)).compile_code(node)
+
+
+class BytecodeCompiler:
+    # Node class -> compile function, filled in the first time each class is seen
+    dispatch_table = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Same as Interpreter.__init_subclass__
+        cls.dispatch_table = {}
+
+    def __init__(self, code):
+        self.code = code
+
+    def compile_code(self, node, discard=False):
+        if discard:
+            self.compile_discarded(node)
+            self.code.emit(PUSH_NULL)
+        else:
+            self.compile(node)
+        self.code.emit(RETURN_VALUE)
+        return self.code
+
+    def compile(self, node):
+        method = self.dispatch_table.get(type(node))
+        if method is None:
+            method = self.resolve_compile_method(type(node))
+        method(self, node)
+
+    @classmethod
+    def resolve_compile_method(cls, node_class):
+        method = getattr(cls, f'compile_{node_class.__name__}', cls.compile_delegated)
+        cls.dispatch_table[node_class] = method
+        return method
+
+    def compile_delegated(self, node):
+        """Nodes without dedicated instructions run through the tree interpreter"""
+        self.code.emit_const(DELEGATE, node)
+
+    def compile_discarded(self, node):
+        """Compile node for its side effects only; leaves nothing on the stack"""
+        if type(node) is ListNode:
+            for element_node in node.element_nodes:
+                self.compile(element_node)
+                self.code.emit(POP_TOP)
+        else:
+            self.compile(node)
+            self.code.emit(POP_TOP)
+
+    def compile_NumberNode(self, node):
+        self.code.emit_const(NUMBER, node.tok.value, span(node))
+
+    def compile_StringNode(self, node):
+        self.code.emit_const(STRING, node.tok.value, span(node))
+
+    def compile_RegexNode(self, node):
+        self.code.emit_const(REGEX, node.tok.value, span(node))
+
+    def compile_ListNode(self, node):
+        for element_node in node.element_nodes:
+            self.compile(element_node)
+        self.code.emit(BUILD_LIST, len(node.element_nodes), span(node))
+
+    def compile_TupleNode(self, node):
+        for element_node in node.element_nodes:
+            self.compile(element_node)
+        self.code.emit(BUILD_TUPLE, len(node.element_nodes), span(node))
+
+    def compile_SetNode(self, node):
+        for element_node in node.element_nodes:
+            self.compile(element_node)
+        self.code.emit(BUILD_SET, len(node.element_nodes), span(node))
+
+    def compile_DictNode(self, node):
+        for key_node, value_node in node.key_value_pairs:
+            self.compile(key_node)
+            self.compile(value_node)
+            self.code.emit(CHECK_DICT_KEY, 0, span(key_node))
+        self.code.emit(BUILD_DICT, len(node.key_value_pairs), span(node))
+
+    def compile_ListComprehensionNode(self, node):
+        code = self.code
+        code.emit(COMP_ENTER)
+        exits = []
+
+        # One nested loop per clause; the accumulator sits below their iterators
+        for var_tok, iterable_node, conditions in node.comprehension_clauses:
+            self.compile(iterable_node)
+            code.emit(COMP_ITER, 0, span(iterable_node))
+            loop_start = code.offset()
+            next_op = code.emit(COMP_NEXT)
+            for condition_node in conditions:
+                self.compile(condition_node)
+                code.emit(POP_JUMP_IF_FALSE, loop_start)
+            exits.append((loop_start, next_op, var_tok.value))
+
+        self.compile(node.expression_node)
+        code.emit(COMP_APPEND, len(exits) + 1)
+
+        for loop_start, next_op, var_name in reversed(exits):
+            code.emit(JUMP, loop_start)
+            code.patch(next_op, code.add_constant((var_name, code.offset())))
+
+        code.emit(COMP_EXIT, 0, span(node))
+
+    def compile_VarAccessNode(self, node):
+        self.code.emit_const(LOAD_NAME, node.var_name_tok.value, span(node))
+
+    def compile_VarAssignNode(self, node):
+        self.compile(node.value_node)
+        self.code.emit_const(STORE_NAME, node.var_name_tok.value)
+
+    def compile_ConstAssignNode(self, node):
+        self.compile(node.value_node)
+        self.code.emit_const(STORE_NAME, node.const_name_tok.value)
+
+    def compile_BinOpNode(self, node):
+        method_name = BINARY_OP_METHODS.get(node.op_tok.kind)
+        if method_name is None:
+            raise Exception(f'No value method for binary operator {node.op_tok}')
+        self.compile(node.left_node)
+        self.compile(node.right_node)
+        self.code.emit_const(BINARY_OP, method_name, span(node) + span(node.left_node) + span(node.right_node))
+
+    def compile_UnaryOpNode(self, node):
+        self.compile(node.node)
+        if node.op_tok.type == TT_MINUS:
+            opcode = NEGATE
+        elif node.op_tok.kind == KW_NOT:
+            opcode = NOT
+        else:
+            opcode = UNARY_PLUS
+        self.code.emit(opcode, 0, span(node))
+
+    def compile_branch(self, expr, should_return_null):
+        if should_return_null:
+            self.compile_discarded(expr)
+            self.code.emit(PUSH_NULL)
+        else:
+            self.compile(expr)
+
+    def compile_IfNode(self, node):
+        code = self.code
+        end_jumps = []
+
+        for condition, expr, should_return_null in node.cases:
+            self.compile(condition)
+            next_case = code.emit(POP_JUMP_IF_FALSE)
+            self.compile_branch(expr, should_return_null)
+            end_jumps.append(code.emit(JUMP))
+            code.patch(next_case, code.offset())
+
+        if node.else_case:
+            expr, should_return_null = node.else_case
+            self.compile_branch(expr, should_return_null)
+        else:
+            code.emit(PUSH_NULL)
+
+        for jump in end_jumps:
+            code.patch(jump, code.offset())
+
+    def compile_SwitchCaseNode(self, node):
+        code = self.code
+        end_jumps = []
+        self.compile(node.switch_expr)
+
+        for case_value_node, expr, should_return_null in node.cases:
+            self.compile(case_value_node)
+            next_case = code.emit(CASE_MATCH)
+            self.compile_branch(expr, should_return_null)
+            end_jumps.append(code.emit(JUMP))
+            code.patch(next_case, code.offset())
+
+        code.emit(POP_TOP)
+        if node.default_case:
+            expr, should_return_null = node.default_case
+            self.compile_branch(expr, should_return_null)
+        else:
+            code.emit(PUSH_NULL)
+
+        for jump in end_jumps:
+            code.patch(jump, code.offset())
+
+    def compile_loop(self, next_opcode, var_name, body_node):
+        """
+        Loop over the iterator state on top of the stack:
+            SETUP_LOOP; top: <next> -> exit; body; JUMP top; exit: POP_BLOCK; cut: POP_TOP; PUSH_NULL
+        """
+        code = self.code
+        setup = code.emit(SETUP_LOOP)
+        loop_start = code.offset()
+        next_op = code.emit(next_opcode)
+        self.compile_discarded(body_node)
+        code.emit(JUMP, loop_start)
+
+        exit_offset = code.emit(POP_BLOCK)
+        cut_target = code.emit(POP_TOP)
+        code.emit(PUSH_NULL)
+
+        code.patch(setup, code.add_constant((cut_target, loop_start)))
+        code.patch(next_op, code.add_constant((var_name, exit_offset)))
+
+    def compile_ForNode(self, node):
+        self.compile(node.start_value_node)
+        self.compile(node.end_value_node)
+        if node.step_value_node:
+            self.compile(node.step_value_node)
+        self.code.emit(FOR_RANGE_INIT, 1 if node.step_value_node else 0)
+        self.compile_loop(FOR_RANGE_NEXT, node.var_name_tok.value, node.body_node)
+
+    def compile_ForEachNode(self, node):
+        self.compile(node.iterable_node)
+        self.code.emit(FOR_EACH_INIT, 0, span(node.iterable_node))
+        self.compile_loop(FOR_EACH_NEXT, node.var_name_tok.value, node.body_node)
+
+    def compile_WhileNode(self, node):
+        code = self.code
+        setup = code.emit(SETUP_LOOP)
+        loop_start = code.offset()
+        self.compile(node.condition_node)
+        exit_jump = code.emit(POP_JUMP_IF_FALSE)
+        self.compile_discarded(node.body_node)
+        code.emit(JUMP, loop_start)
+
+        code.patch(exit_jump, code.emit(POP_BLOCK))
+        cut_target = code.emit(PUSH_NULL)
+        code.patch(setup, code.add_constant((cut_target, loop_start)))
+
+    def compile_DoWhileNode(self, node):
+        code = self.code
+        setup = code.emit(SETUP_LOOP)
+        body_start = code.offset()
+        self.compile_discarded(node.body_node)
+
+        # 'skip' still checks the condition before the next iteration
+        condition_start = code.offset()
+        self.compile(node.condition_node)
+        code.emit(POP_JUMP_IF_TRUE, body_start)
+
+        code.emit(POP_BLOCK)
+        cut_target = code.emit(PUSH_NULL)
+        code.patch(setup, code.add_constant((cut_target, condition_start)))
+
+    def compile_function(self, name, node):
+        body_node = node.body_node
+        body_code = BytecodeCompiler(Code(name))
+        # A body ending in 'give' always returns through it, so its statement values are not collected
+        ends_in_give = type(body_node) is ListNode and body_node.element_nodes and type(body_node.element_nodes[-1]) is ReturnNode
+        body_code.compile_code(body_node, discard=ends_in_give)
+        return body_code.code
+
+    def compile_FuncDefNode(self, node):
+        func_name = node.var_name_tok.value if node.var_name_tok else None
+        arg_names = [arg_name.value for arg_name in node.arg_name_toks]
+        body_code = self.compile_function(func_name or '<anonymous>', node)
+        self.code.emit_const(MAKE_FUNCTION, (func_name, node.body_node, arg_names, body_code), span(node))
+        if func_name is not None:
+            self.code.emit_const(STORE_NAME, func_name)
+
+    def compile_LambdaNode(self, node):
+        arg_names = [arg_name.value for arg_name in node.arg_name_toks]
+        body_code = self.compile_function('<lambda>', node)
+        self.code.emit_const(MAKE_FUNCTION, ("<lambda>", node.body_node, arg_names, body_code), span(node))
+
+    def compile_CallNode(self, node):
+        self.compile(node.node_to_call)
+        self.code.emit(PREPARE_CALL, 0, span(node))
+        for arg_node in node.arg_nodes:
+            self.compile(arg_node)
+        self.code.emit(CALL, len(node.arg_nodes), span(node))
+
+    def compile_ReturnNode(self, node):
+        if node.node_to_return:
+            self.compile(node.node_to_return)
+        else:
+            self.code.emit(PUSH_NULL)
+        self.code.emit(GIVE)
+
+    def compile_CutNode(self, node):
+        self.code.emit(CUT)
+
+    def compile_SkipNode(self, node):
+        self.code.emit(SKIP)
+
+    def compile_ListAccessNode(self, node):
+        self.compile(node.list_node)
+        self.compile(node.index_node)
+        self.code.emit(INDEX, 0, span(node.list_node) + span(node.index_node))
+
+    def compile_AttemptHandleNode(self, node):
+        code = self.code
+        setup = code.emit(SETUP_ATTEMPT)
+        self.compile(node.attempt_body)
+        code.emit(POP_BLOCK)
+        end_jump = code.emit(JUMP)
+
+        code.patch(setup, code.offset())
+        error_var_name = node.error_var_name.value if node.error_var_name else None
+        code.emit_const(BIND_ERROR, error_var_name, span(node))
+        self.compile(node.handle_body)
+        code.patch(end_jump, code.offset())
@@ -0,0 +1,645 @@
+"""
+Closure-compiling execution engine for UTTR.
+Every AST node is compiled once into a Python closure specialized for that
+node: operators are resolved to their value method, names and positions are
+bound as closure variables and loops run as native Python loops. A compiled
+closure takes the Context to run in and returns the resulting value directly;
+'give', 'cut', 'skip' and runtime errors travel as control_flow signals.
+
+The results, errors and error positions are the same as Interpreter's.
+Selected with options.ENGINE = 'closure'.
+"""
+
+from context import Context
+from control_flow import CutSignal, ErrorSignal, ReturnSignal, SkipSignal, capture_result, unwrap_result
+from errors.run_time_error import RTError
+from functions.base_function import BaseFunction
+from functions.builtin_function import BuiltInFunction
+from functions.function import Function
+from interpreter import Interpreter
+from nodes.list_node import ListNode
+from nodes.return_node import ReturnNode
+from symbol_table import SymbolTable
+from tokens import KW_AND, KW_NOT, KW_OR, TT_AMPERSAND, TT_CARET, TT_DIV, TT_EE, TT_GT, TT_GTE, TT_LT, TT_LTE, TT_MINUS, TT_MOD, TT_MUL, TT_NE, TT_PLUS
+from values.dict_value import Dict, dict_key
+from values.error_value import ErrorValue
+from values.list_value import List
+from values.number_value import Number, placed
+from values.regex_value import Regex
+from values.set_value import Set
+from values.string_value import String
+from values.tuple_value import Tuple
+
+# Value method called for each binary operator (see Interpreter.visit_BinOpNode)
+BINARY_OP_METHODS = {
+    TT_PLUS: 'added_to',
+    TT_MINUS: 'subbed_by',
+    TT_MUL: 'multed_by',
+    TT_DIV: 'dived_by',
+    TT_MOD: 'modded_by',
+    TT_EE: 'get_comparison_eq',
+    TT_NE: 'get_comparison_ne',
+    TT_LT: 'get_comparison_lt',
+    TT_GT: 'get_comparison_gt',
+    TT_LTE: 'get_comparison_lte',
+    TT_GTE: 'get_comparison_gte',
+    TT_AMPERSAND: 'intersected_with',
+    TT_CARET: 'symmetric_diff_with',
+    KW_AND: 'anded_by',
+    KW_OR: 'ored_by',
+}
+
+
+def run_compiled(node, context):
+    """Compile node and run it in context, returning an RTResult like Interpreter.visit"""
+    return capture_result(ClosureCompiler().compile(node), context)
+
+
+def execute_compiled(func, args):
+    """Function.execute for functions whose body was compiled to a closure"""
+    return capture_result(call_function, func, args)
+
+
+def call_function(func, args):
+    """Call a compiled Function and return its value; signals propagate"""
+    exec_ctx = func.generate_new_context()
+
+    arg_names = func.arg_names
+    if len(args) != len(arg_names):
+        raise ErrorSignal(func.check_args(arg_names, args).error)
+    func.populate_args(arg_names, args, exec_ctx)
+
+    try:
+        value = func.body_code(exec_ctx)
+    except ReturnSignal as signal:
+        return signal.value or Number.null
+    return value or Number.null
+
+
+class ModuleInterpreter(Interpreter):
+    """Tree interpreter used for 'bring' and 'share' that runs imported modules compiled"""
+
+    def execute_module(self, module_ast, module_context):
+        return run_compiled(module_ast, module_context)
+
+
+class ClosureCompiler:
+    # Node class -> compile function, filled in the first time each class is seen
+    dispatch_table = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Same as Interpreter.__init_subclass__
+        cls.dispatch_table = {}
+
+    def compile(self, node):
+        method = self.dispatch_table.get(type(node))
+        if method is None:
+            method = self.resolve_compile_method(type(node))
+        return method(self, node)
+
+    @classmethod
+    def resolve_compile_method(cls, node_class):
+        method = getattr(cls, f'compile_{node_class.__name__}', cls.compile_with_interpreter)
+        cls.dispatch_table[node_class] = method
+        return method
+
+    def compile_with_interpreter(self, node):
+        """Run nodes without a specialized closure through the tree interpreter"""
+        interpreter = ModuleInterpreter()
+
+        def run(context):
+            return unwrap_result(interpreter.visit(node, context))
+        return run
+
+    def compile_all(self, nodes):
+        return [self.compile(node) for node in nodes]
+
+    def compile_discarded(self, node):
+        """
+        Closure for a node whose value is thrown away (loop bodies and blocks
+        that evaluate to null): statement lists run without collecting a List.
+        """
+        if type(node) is not ListNode:
+            return self.compile(node)
+
+        statement_codes = self.compile_all(node.element_nodes)
+        if len(statement_codes) == 1:
+            return statement_codes[0]
+
+        def block(context):
+            for code in statement_codes:
+                code(context)
+        return block
+
+    def compile_NumberNode(self, node):
+        value = node.tok.value
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        shared = Number.of(value)
+        if shared.shared:
+            def shared_number(context):
+                return shared
+            return shared_number
+
+        # Hot paths assign pos_start/pos_end/context directly instead of
+        # chaining set_pos()/set_context()
+        def number(context):
+            number = Number(value)
+            number.pos_start = pos_start
+            number.pos_end = pos_end
+            number.context = context
+            return number
+        return number
+
+    def compile_StringNode(self, node):
+        value = node.tok.value
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def string(context):
+            string = String(value)
+            string.pos_start = pos_start
+            string.pos_end = pos_end
+            string.context = context
+            return string
+        return string
+
+    def compile_RegexNode(self, node):
+        pattern = node.tok.value
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def regex(context):
+            value = Regex(pattern).set_context(context).set_pos(pos_start, pos_end)
+            if value.compiled is None:
+                raise ErrorSignal(RTError(
+                    pos_start, pos_end,
+                    f"Invalid regex pattern: {value.compile_error}",
+                    context
+                ))
+            return value
+        return regex
+
+    def compile_ListNode(self, node):
+        element_codes = self.compile_all(node.element_nodes)
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def list_(context):
+            return List([code(context) for code in element_codes]).set_context(context).set_pos(pos_start, pos_end)
+        return list_
+
+    def compile_TupleNode(self, node):
+        element_codes = self.compile_all(node.element_nodes)
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def tuple_(context):
+            return Tuple([code(context) for code in element_codes]).set_context(context).set_pos(pos_start, pos_end)
+        return tuple_
+
+    def compile_SetNode(self, node):
+        element_codes = self.compile_all(node.element_nodes)
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def set_(context):
+            return Set([code(context) for code in element_codes]).set_context(context).set_pos(pos_start, pos_end)
+        return set_
+
+    def compile_DictNode(self, node):
+        pairs = [(key_node, self.compile(key_node), self.compile(value_node))
+                 for key_node, value_node in node.key_value_pairs]
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def dict_(context):
+            elements = {}
+            for key_node, key_code, value_code in pairs:
+                key = key_code(context)
+                value = value_code(context)
+                hashable_key = dict_key(key)
+                if hashable_key is None:
+                    raise ErrorSignal(RTError(
+                        key_node.pos_start, key_node.pos_end,
+                        'Dictionary key must be a string, number or tuple',
+                        context
+                    ))
+                elements[hashable_key] = value
+            return Dict(elements).set_context(context).set_pos(pos_start, pos_end)
+        return dict_
+
+    def compile_ListComprehensionNode(self, node):
+        expression_code = self.compile(node.expression_node)
+        clauses = [(var_tok.value, iterable_node, self.compile(iterable_node), self.compile_all(conditions))
+                   for var_tok, iterable_node, conditions in node.comprehension_clauses]
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def list_comprehension(context):
+            elements = []
+            comp_context = Context(context.display_name, context.parent, context.parent_entry_pos)
+            comp_context.symbol_table = SymbolTable(context.symbol_table)
+            symbol_table = comp_context.symbol_table
+
+            def process_clauses(clause_idx):
+                if clause_idx >= len(clauses):
+                    elements.append(expression_code(comp_context))
+                    return
+
+                var_name, iterable_node, iterable_code, condition_codes = clauses[clause_idx]
+                iterable = iterable_code(comp_context)
+                if not isinstance(iterable, (List, Tuple, Set)):
+                    raise ErrorSignal(RTError(
+                        iterable_node.pos_start, iterable_node.pos_end,
+                        f"Cannot iterate over {type(iterable).__name__}",
+                        comp_context
+                    ))
+
+                for item in iterable.elements:
+                    symbol_table.set(var_name, item)
+                    for condition_code in condition_codes:
+                        condition_value = condition_code(comp_context)
+                        if hasattr(condition_value, 'is_true'):
+                            if not condition_value.is_true(): break
+                        elif not condition_value:
+                            break
+                    else:
+                        process_clauses(clause_idx + 1)
+
+            process_clauses(0)
+            return List(elements).set_context(context).set_pos(pos_start, pos_end)
+        return list_comprehension
+
+    def compile_VarAccessNode(self, node):
+        var_name = node.var_name_tok.value
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def var_access(context):
+            value = context.symbol_table.get(var_name)
+            if not value:
+                raise ErrorSignal(RTError(
+                    pos_start, pos_end,
+                    f"'{var_name}' is not defined",
+                    context
+                ))
+
+            # Same copying rules as Interpreter.visit_VarAccessNode
+            if isinstance(value, (List, Dict, BaseFunction)):
+                value = value.set_pos(pos_start, pos_end)
+                if isinstance(value, BuiltInFunction) or not isinstance(value, BaseFunction):
+                    value = value.set_context(context)
+                return value
+            if value.shared: return value
+
+            value = Number(value.value) if value.__class__ is Number else value.copy()
+            value.pos_start = pos_start
+            value.pos_end = pos_end
+            value.context = context
+            return value
+        return var_access
+
+    def compile_VarAssignNode(self, node):
+        var_name = node.var_name_tok.value
+        value_code = self.compile(node.value_node)
+
+        def var_assign(context):
+            value = value_code(context)
+            context.symbol_table.set(var_name, value)
+            return value
+        return var_assign
+
+    def compile_ConstAssignNode(self, node):
+        const_name = node.const_name_tok.value
+        value_code = self.compile(node.value_node)
+
+        def const_assign(context):
+            value = value_code(context)
+            context.symbol_table.set(const_name, value)
+            return value
+        return const_assign
+
+    def compile_BinOpNode(self, node):
+        method_name = BINARY_OP_METHODS.get(node.op_tok.kind)
+        if method_name is None:
+            raise Exception(f'No value method for binary operator {node.op_tok}')
+        left_code = self.compile(node.left_node)
+        right_code = self.compile(node.right_node)
+        left_span = (node.left_node.pos_start, node.left_node.pos_end)
+        right_span = (node.right_node.pos_start, node.right_node.pos_end)
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def bin_op(context):
+            left = left_code(context)
+            right = right_code(context)
+            result, error = getattr(left, method_name)(right)
+            if error:
+                if left.shared or right.shared:
+                    # Same as Interpreter.visit_BinOpNode
+                    result, error = getattr(placed(left, *left_span, context), method_name)(placed(right, *right_span, context))
+                raise ErrorSignal(error)
+            if not result.shared:
+                result.pos_start = pos_start
+                result.pos_end = pos_end
+                # Same as Interpreter.visit_BinOpNode
+                if left.shared: result.context = context
+            return result
+        return bin_op
+
+    def compile_UnaryOpNode(self, node):
+        operand_code = self.compile(node.node)
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        if node.op_tok.type == TT_MINUS:
+            def negate(context):
+                operand = operand_code(context)
+                number, error = operand.multed_by(Number(-1))
+                if error: raise ErrorSignal(error)
+                # Same as Interpreter.visit_BinOpNode
+                if operand.shared: number.set_context(context)
+                return number.set_pos(pos_start, pos_end)
+            return negate
+
+        if node.op_tok.kind == KW_NOT:
+            def not_(context):
+                number, error = operand_code(context).notted()
+                if error: raise ErrorSignal(error)
+                return number.set_pos(pos_start, pos_end)
+            return not_
+
+        def plus(context):
+            return operand_code(context).set_pos(pos_start, pos_end)
+        return plus
+
+    def compile_IfNode(self, node):
+        cases = [(self.compile(condition), self.compile_branch(expr, should_return_null), should_return_null)
+                 for condition, expr, should_return_null in node.cases]
+        else_case = None
+        if node.else_case:
+            expr, should_return_null = node.else_case
+            else_case = (self.compile_branch(expr, should_return_null), should_return_null)
+
+        def if_(context):
+            for condition_code, expr_code, should_return_null in cases:
+                if condition_code(context).is_true():
+                    value = expr_code(context)
+                    return Number.null if should_return_null else value
+
+            if else_case:
+                expr_code, should_return_null = else_case
+                value = expr_code(context)
+                return Number.null if should_return_null else value
+            return Number.null
+        return if_
+
+    def compile_branch(self, expr, should_return_null):
+        return self.compile_discarded(expr) if should_return_null else self.compile(expr)
+
+    def compile_SwitchCaseNode(self, node):
+        switch_code = self.compile(node.switch_expr)
+        cases = [(self.compile(case_value_node), self.compile_branch(expr, should_return_null), should_return_null)
+                 for case_value_node, expr, should_return_null in node.cases]
+        default_case = None
+        if node.default_case:
+            expr, should_return_null = node.default_case
+            default_case = (self.compile_branch(expr, should_return_null), should_return_null)
+
+        def switch_case(context):
+            switch_value = switch_code(context)
+
+            for case_code, expr_code, should_return_null in cases:
+                case_value = case_code(context)
+                if switch_value.get_comparison_eq(case_value)[0].is_true():
+                    value = expr_code(context)
+                    return Number.null if should_return_null else value
+
+            if default_case:
+                expr_code, should_return_null = default_case
+                value = expr_code(context)
+                return Number.null if should_return_null else value
+            return Number.null
+        return switch_case
+
+    def compile_ForNode(self, node):
+        var_name = node.var_name_tok.value
+        start_code = self.compile(node.start_value_node)
+        end_code = self.compile(node.end_value_node)
+        step_code = self.compile(node.step_value_node) if node.step_value_node else None
+        body_code = self.compile_discarded(node.body_node)
+
+        def for_(context):
+            start_value = start_code(context)
+            end_value = end_code(context)
+            step = step_code(context).value if step_code else 1
+            i = start_value.value
+            end = end_value.value
+            symbol_table = context.symbol_table
+
+            if type(i) is int and type(end) is int and type(step) is int and step > 0:
+                set_symbol = symbol_table.set
+                for i in range(i, end, step):
+                    set_symbol(var_name, Number(i))
+                    try:
+                        body_code(context)
+                    except CutSignal:
+                        break
+                    except SkipSignal:
+                        continue
+                return Number.null
+
+            while i < end:
+                symbol_table.set(var_name, Number(i))
+                i += step
+                try:
+                    body_code(context)
+                except CutSignal:
+                    break
+                except SkipSignal:
+                    continue
+            return Number.null
+        return for_
+
+    def compile_ForEachNode(self, node):
+        var_name = node.var_name_tok.value
+        iterable_node = node.iterable_node
+        iterable_code = self.compile(iterable_node)
+        body_code = self.compile_discarded(node.body_node)
+
+        def for_each(context):
+            iterable = iterable_code(context)
+            if not isinstance(iterable, (List, Tuple)):
+                raise ErrorSignal(RTError(
+                    iterable_node.pos_start, iterable_node.pos_end,
+                    "Can only iterate through lists and tuples",
+                    context
+                ))
+
+            symbol_table = context.symbol_table
+            for element in iterable.elements:
+                symbol_table.set(var_name, element)
+                try:
+                    body_code(context)
+                except CutSignal:
+                    break
+                except SkipSignal:
+                    continue
+            return Number.null
+        return for_each
+
+    def compile_WhileNode(self, node):
+        condition_code = self.compile(node.condition_node)
+        body_code = self.compile_discarded(node.body_node)
+
+        def while_(context):
+            while condition_code(context).is_true():
+                try:
+                    body_code(context)
+                except CutSignal:
+                    break
+                except SkipSignal:
+                    continue
+            return Number.null
+        return while_
+
+    def compile_DoWhileNode(self, node):
+        body_code = self.compile_discarded(node.body_node)
+        condition_code = self.compile(node.condition_node)
+
+        def do_while(context):
+            while True:
+                try:
+                    body_code(context)
+                except CutSignal:
+                    break
+                except SkipSignal:
+                    # Skip still checks the condition before the next iteration
+                    pass
+                if not condition_code(context).is_true():
+                    break
+            return Number.null
+        return do_while
+
+    def compile_FuncDefNode(self, node):
+        func_name = node.var_name_tok.value if node.var_name_tok else None
+        body_node = node.body_node
+        body_code = self.compile_body(body_node)
+        arg_names = [arg_name.value for arg_name in node.arg_name_toks]
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def func_def(context):
+            func_value = Function(func_name, body_node, arg_names, body_code).set_context(context).set_pos(pos_start, pos_end)
+            if func_name is not None:
+                context.symbol_table.set(func_name, func_value)
+            return func_value
+        return func_def
+
+    def compile_body(self, body_node):
+        """
+        Closure for a function body. A body that ends in 'give' always
+        returns through it, so its statement values need not be collected.
+        """
+        if type(body_node) is ListNode and body_node.element_nodes and type(body_node.element_nodes[-1]) is ReturnNode:
+            return self.compile_discarded(body_node)
+        return self.compile(body_node)
+
+    def compile_LambdaNode(self, node):
+        body_node = node.body_node
+        body_code = self.compile_body(body_node)
+        arg_names = [arg_name.value for arg_name in node.arg_name_toks]
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def lambda_(context):
+            return Function("<lambda>", body_node, arg_names, body_code).set_context(context).set_pos(pos_start, pos_end)
+        return lambda_
+
+    def compile_CallNode(self, node):
+        callee_code = self.compile(node.node_to_call)
+        arg_codes = self.compile_all(node.arg_nodes)
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def call(context):
+            callee = callee_code(context)
+            value_to_call = callee.copy().set_pos(pos_start, pos_end)
+            # Same as Interpreter.visit_CallNode
+            if callee.shared: value_to_call.set_context(context)
+            args = [code(context) for code in arg_codes]
+
+            if type(value_to_call) is Function and value_to_call.body_code is not None:
+                return_value = call_function(value_to_call, args)
+            else:
+                return_value = unwrap_result(value_to_call.execute(args))
+            return return_value.copy().set_pos(pos_start, pos_end).set_context(context)
+        return call
+
+    def compile_ReturnNode(self, node):
+        value_code = self.compile(node.node_to_return) if node.node_to_return else None
+
+        def return_(context):
+            raise ReturnSignal(value_code(context) if value_code else Number.null)
+        return return_
+
+    def compile_CutNode(self, node):
+        def cut(context):
+            raise CutSignal()
+        return cut
+
+    def compile_SkipNode(self, node):
+        def skip(context):
+            raise SkipSignal()
+        return skip
+
+    def compile_ListAccessNode(self, node):
+        list_node, index_node = node.list_node, node.index_node
+        collection_code = self.compile(list_node)
+        index_code = self.compile(index_node)
+
+        def list_access(context):
+            collection = collection_code(context)
+            index = index_code(context)
+
+            if isinstance(collection, List):
+                if not isinstance(index, Number):
+                    raise ErrorSignal(RTError(
+                        index_node.pos_start, index_node.pos_end,
+                        "List index must be a number",
+                        context
+                    ))
+                try:
+                    return collection.element_at(int(index.value))
+                except:
+                    raise ErrorSignal(RTError(
+                        index_node.pos_start, index_node.pos_end,
+                        "Index out of bounds",
+                        context
+                    ))
+
+            if isinstance(collection, Dict):
+                result, error = collection.dived_by(index)
+                if error and index.shared:
+                    result, error = collection.dived_by(placed(index, index_node.pos_start, index_node.pos_end, context))
+                if error: raise ErrorSignal(error)
+                return result
+
+            raise ErrorSignal(RTError(
+                list_node.pos_start, list_node.pos_end,
+                "Can only index lists and dictionaries",
+                context
+            ))
+        return list_access
+
+    def compile_AttemptHandleNode(self, node):
+        attempt_code = self.compile(node.attempt_body)
+        handle_code = self.compile(node.handle_body)
+        error_var_name = node.error_var_name.value if node.error_var_name else None
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def attempt_handle(context):
+            try:
+                return attempt_code(context)
+            except ErrorSignal as signal:
+                caught_error = signal.error
+
+            error_value = ErrorValue(
+                caught_error.details,
+                caught_error.error_name,
+                caught_error
+            ).set_context(context).set_pos(pos_start, pos_end)
+
+            if error_var_name is not None:
+                context.symbol_table.set(error_var_name, error_value)
+            return handle_code(context)
+        return attempt_handle
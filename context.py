@@ -1,4 +1,7 @@
 class Context:
+    # Frames of the calls this one replaced through tail calls (see tail_calls.py)
+    elided_frames = 0
+
     def __init__(self, display_name, parent=None, parent_entry_pos=None):
         self.display_name = display_name
         self.parent = parent
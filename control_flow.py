@@ -0,0 +1,58 @@
+"""
+Non-local control flow for engines that return values directly instead of
+wrapping every result in an RTResult.
+'give', 'cut', 'skip' and runtime errors unwind the Python stack as these
+exceptions and are caught by the loop, call or attempt that handles them.
+"""
+
+from run_time_result import RTResult
+
+
+class ControlFlowSignal(Exception):
+    """Base class of every signal; none of them escapes an engine entry point"""
+
+
+class ReturnSignal(ControlFlowSignal):
+    """'give': caught by the enclosing function call"""
+
+    def __init__(self, value):
+        self.value = value
+
+
+class CutSignal(ControlFlowSignal):
+    """'cut': caught by the enclosing loop"""
+
+
+class SkipSignal(ControlFlowSignal):
+    """'skip': caught by the enclosing loop"""
+
+
+class ErrorSignal(ControlFlowSignal):
+    """Runtime error: caught by 'attempt' or reported by the entry point"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def capture_result(func, *args):
+    """Call func and return its value or signal as an RTResult (the Interpreter.visit protocol)"""
+    res = RTResult()
+    try:
+        return res.success(func(*args))
+    except ErrorSignal as signal:
+        return res.failure(signal.error)
+    except ReturnSignal as signal:
+        return res.success_return(signal.value)
+    except CutSignal:
+        return res.success_cut()
+    except SkipSignal:
+        return res.success_skip()
+
+
+def unwrap_result(res):
+    """Value of an RTResult, raising the signal for its error or control flow flag"""
+    if res.error: raise ErrorSignal(res.error)
+    if res.func_return_value: raise ReturnSignal(res.func_return_value)
+    if res.loop_should_cut: raise CutSignal()
+    if res.loop_should_skip: raise SkipSignal()
+    return res.value
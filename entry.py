@@ -3,76 +3,137 @@ UTTR (Understandable Translation Tool for Routines) Interpreter
 A procedure-oriented programming language with plain English-like syntax
 """
 
+import options
 from context import Context
 from functions.builtin_function import BuiltInFunction
-from interpreter import Interpreter
-from lexer import Lexer
-from parser import Parser
+from interpreter import make_interpreter
+from lexer import make_lexer
+from optimizer import optimize
+from parser import make_parser
+from resolver import resolve
+from tail_calls import mark_tail_calls
 
 
 from symbol_table import SymbolTable
 from values.number_value import Number
 
 global_symbol_table = SymbolTable()
+
+def register_builtin(name, method):
+    """Bind name in the global table to a builtin calling method(func, *args)"""
+    global_symbol_table.set(name, BuiltInFunction(name, method))
+
 global_symbol_table.set("null", Number.null)
 global_symbol_table.set("false", Number.false)
 global_symbol_table.set("true", Number.true)
-global_symbol_table.set("show", BuiltInFunction.show)
-global_symbol_table.set("input", BuiltInFunction.input)
-global_symbol_table.set("input_int", BuiltInFunction.input_int)
-global_symbol_table.set("len", BuiltInFunction.len)
-global_symbol_table.set("append", BuiltInFunction.append)
-global_symbol_table.set("pop", BuiltInFunction.pop)
-global_symbol_table.set("extend", BuiltInFunction.extend)
-global_symbol_table.set("keys", BuiltInFunction.keys)
-global_symbol_table.set("values", BuiltInFunction.values)
-global_symbol_table.set("has_key", BuiltInFunction.has_key)
-global_symbol_table.set("remove", BuiltInFunction.remove)
-global_symbol_table.set("run", BuiltInFunction.run)
-global_symbol_table.set("help", BuiltInFunction.help)
-global_symbol_table.set("exit", BuiltInFunction.exit)
-global_symbol_table.set("clear", BuiltInFunction.clear)
-global_symbol_table.set("error_message", BuiltInFunction.error_message)
-global_symbol_table.set("error_type", BuiltInFunction.error_type)
-global_symbol_table.set("split", BuiltInFunction.split)
-global_symbol_table.set("join", BuiltInFunction.join)
-global_symbol_table.set("upper", BuiltInFunction.upper)
-global_symbol_table.set("lower", BuiltInFunction.lower)
-global_symbol_table.set("replace", BuiltInFunction.replace)
-global_symbol_table.set("substring", BuiltInFunction.substring)
-global_symbol_table.set("tuple", BuiltInFunction.tuple)
-global_symbol_table.set("list", BuiltInFunction.list)
-global_symbol_table.set("regex_match", BuiltInFunction.regex_match)
-global_symbol_table.set("regex_search", BuiltInFunction.regex_search)
-global_symbol_table.set("regex_replace", BuiltInFunction.regex_replace)
-global_symbol_table.set("regex_findall", BuiltInFunction.regex_findall)
-global_symbol_table.set("regex_split", BuiltInFunction.regex_split)
-global_symbol_table.set("union", BuiltInFunction.union)
-global_symbol_table.set("intersection", BuiltInFunction.intersection)
-global_symbol_table.set("difference", BuiltInFunction.difference)
-global_symbol_table.set("symmetric_difference", BuiltInFunction.symmetric_difference)
-global_symbol_table.set("add", BuiltInFunction.add)
-global_symbol_table.set("contains", BuiltInFunction.contains)
-global_symbol_table.set("is_subset", BuiltInFunction.is_subset)
-global_symbol_table.set("is_superset", BuiltInFunction.is_superset)
-global_symbol_table.set("set_from_list", BuiltInFunction.set_from_list)
+register_builtin("show", BuiltInFunction.execute_show)
+register_builtin("input", BuiltInFunction.execute_input)
+register_builtin("input_int", BuiltInFunction.execute_input_int)
+register_builtin("len", BuiltInFunction.execute_len)
+register_builtin("append", BuiltInFunction.execute_append)
+register_builtin("pop", BuiltInFunction.execute_pop)
+register_builtin("extend", BuiltInFunction.execute_extend)
+register_builtin("keys", BuiltInFunction.execute_keys)
+register_builtin("values", BuiltInFunction.execute_values)
+register_builtin("has_key", BuiltInFunction.execute_has_key)
+register_builtin("remove", BuiltInFunction.execute_remove)
+register_builtin("run", BuiltInFunction.execute_run)
+register_builtin("help", BuiltInFunction.execute_help)
+register_builtin("exit", BuiltInFunction.execute_exit)
+register_builtin("clear", BuiltInFunction.execute_clear)
+register_builtin("error_message", BuiltInFunction.execute_error_message)
+register_builtin("error_type", BuiltInFunction.execute_error_type)
+register_builtin("split", BuiltInFunction.execute_split)
+register_builtin("join", BuiltInFunction.execute_join)
+register_builtin("upper", BuiltInFunction.execute_upper)
+register_builtin("lower", BuiltInFunction.execute_lower)
+register_builtin("replace", BuiltInFunction.execute_replace)
+register_builtin("substring", BuiltInFunction.execute_substring)
+register_builtin("tuple", BuiltInFunction.execute_tuple)
+register_builtin("list", BuiltInFunction.execute_list)
+register_builtin("regex_match", BuiltInFunction.execute_regex_match)
+register_builtin("regex_search", BuiltInFunction.execute_regex_search)
+register_builtin("regex_replace", BuiltInFunction.execute_regex_replace)
+register_builtin("regex_findall", BuiltInFunction.execute_regex_findall)
+register_builtin("regex_split", BuiltInFunction.execute_regex_split)
+register_builtin("union", BuiltInFunction.execute_union)
+register_builtin("intersection", BuiltInFunction.execute_intersection)
+register_builtin("difference", BuiltInFunction.execute_difference)
+register_builtin("symmetric_difference", BuiltInFunction.execute_symmetric_difference)
+register_builtin("add", BuiltInFunction.execute_add)
+register_builtin("contains", BuiltInFunction.execute_contains)
+register_builtin("is_subset", BuiltInFunction.execute_is_subset)
+register_builtin("is_superset", BuiltInFunction.execute_is_superset)
+register_builtin("set_from_list", BuiltInFunction.execute_set_from_list)
+register_builtin("memoize", BuiltInFunction.execute_memoize)
+register_builtin("memo_stats", BuiltInFunction.execute_memo_stats)
 
 def run(fn, text):
     # Generate tokens
-    lexer = Lexer(fn, text)
+    lexer = make_lexer(fn, text)
     tokens, error = lexer.make_tokens()
     if error: return None, error
 
     # Generate AST
-    parser = Parser(tokens)
+    parser = make_parser(tokens)
     ast = parser.parse()
     if ast.error: return None, ast.error
 
-    # Run program
-    interpreter = Interpreter()
+    # Optimize AST (REPL input only gets folding: later lines may rebind constants)
+    node = ast.node
+    if options.OPTIMIZE == 'on':
+        node = optimize(node, propagate=fn != '<stdin>')
+
+    return run_ast(fn, node)
+
+def run_stream(fn, text):
+    # Run a whole file one top-level statement at a time, parsing each one
+    # just before it runs and keeping only the value of the last one
+    lexer = make_lexer(fn, text)
+    tokens, error = lexer.make_tokens()
+    if error: return None, error
+
+    context = program_context(fn)
+    value = None
+    for ast in make_parser(tokens).parse_statements():
+        if ast.error: return None, ast.error
+
+        # Constants are only folded: propagating them needs the whole file
+        node = ast.node
+        if options.OPTIMIZE == 'on':
+            node = optimize(node, propagate=False)
+
+        # An error, or a 'give', 'cut' or 'skip' at the top level, ends the program
+        result = run_in_context(node, context)
+        if result.should_return(): return result.value, result.error
+        value = result.value
+
+    return value, None
+
+def run_ast(fn, node):
+    # Run an already parsed program
+    result = run_in_context(node, program_context(fn))
+    return result.value, result.error
+
+def program_context(fn):
     context = Context('<program>')
     context.symbol_table = global_symbol_table
     context.display_name = fn  # Store filename for relative imports
-    result = interpreter.visit(ast.node, context)
+    return context
+
+def run_in_context(node, context):
+    # Run node on the selected engine and return its RTResult
+    if options.ENGINE == 'closure':
+        # Import here to avoid circular dependency
+        from closure_compiler import run_compiled
+        return run_compiled(node, context)
+    if options.ENGINE == 'vm':
+        # Import here to avoid circular dependency
+        from vm import run_bytecode
+        return run_bytecode(node, context)
 
-    return result.value, result.error
\ No newline at end of file
+    if options.RESOLVE == 'on':
+        resolve(node)
+    if options.TAIL_CALLS == 'on':
+        mark_tail_calls(node)
+    return make_interpreter().visit(node, context)
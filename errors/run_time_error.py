@@ -20,6 +20,9 @@ class RTError(Error):
 
         while ctx:
             result = f'  File {pos.fn}, line {str(pos.ln + 1)}, in {ctx.display_name}\n' + result
+            if ctx.elided_frames:
+                frames = 'frame' if ctx.elided_frames == 1 else 'frames'
+                result = f'  [{ctx.elided_frames} {frames} elided by tail calls]\n' + result
             pos = ctx.parent_entry_pos
             ctx = ctx.parent
 
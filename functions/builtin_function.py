@@ -1,7 +1,10 @@
+from context import Context
 from errors.run_time_error import RTError
 from functions.base_function import BaseFunction
+from functions.function import Function
+from functions.memoized_function import MemoizedFunction
 from run_time_result import RTResult
-from values.dict_value import Dict
+from values.dict_value import Dict, dict_key
 from values.error_value import ErrorValue
 from values.list_value import List
 from values.number_value import Number
@@ -9,32 +12,42 @@ from values.regex_value import Regex, Match
 from values.set_value import Set
 from values.string_value import String
 from values.tuple_value import Tuple
+import inspect
+import math
 import re
 
 
 class BuiltInFunction(BaseFunction):
-    def __init__(self, name):
+    """
+    Function implemented in Python. method is a plain callable taking the
+    BuiltInFunction (for error positions) followed by the call's arguments
+    positionally; its parameter names are read once, when it is registered.
+    """
+
+    def __init__(self, name, method, arg_names=None):
         super().__init__(name)
+        self.method = method
+        if arg_names is None:
+            arg_names = tuple(inspect.signature(method).parameters)[1:]
+        self.arg_names = arg_names
 
     def execute(self, args):
-        res = RTResult()
-        exec_ctx = self.generate_new_context()
-
-        method_name = f'execute_{self.name}'
-        method = getattr(self, method_name, self.no_visit_method)
+        if len(args) != len(self.arg_names):
+            return self.check_args(self.arg_names, args)
 
-        res.register(self.check_and_populate_args(method.arg_names, args, exec_ctx))
-        if res.should_return(): return res
+        # Arguments take the context of the call, as they did when each
+        # builtin call had a frame of its own
+        context = self.context
+        for arg in args:
+            if not arg.shared: arg.context = context
+        return self.method(self, *args)
 
-        return_value = res.register(method(exec_ctx))
-        if res.should_return(): return res
-        return res.success(return_value)
-
-    def no_visit_method(self, node, context):
-        raise Exception(f'No execute_{self.name} method defined')
+    def call_context(self):
+        """Context an error raised by the builtin is reported from"""
+        return Context(self.name, self.context, self.pos_start)
 
     def copy(self):
-        copy = BuiltInFunction(self.name)
+        copy = BuiltInFunction(self.name, self.method, self.arg_names)
         copy.set_context(self.context)
         copy.set_pos(self.pos_start, self.pos_end)
         return copy
@@ -43,18 +56,15 @@ class BuiltInFunction(BaseFunction):
         return f"<built-in function {self.name}>"
 
     # Built-in function implementations
-    def execute_show(self, exec_ctx):
-        value = exec_ctx.symbol_table.get('value')
+    def execute_show(self, value):
         print(str(value))
         return RTResult().success(Number.null)
-    execute_show.arg_names = ['value']
 
-    def execute_input(self, exec_ctx):
+    def execute_input(self):
         text = input()
         return RTResult().success(String(text))
-    execute_input.arg_names = []
 
-    def execute_input_int(self, exec_ctx):
+    def execute_input_int(self):
         while True:
             text = input()
             try:
@@ -63,58 +73,47 @@ class BuiltInFunction(BaseFunction):
             except ValueError:
                 print(f"'{text}' must be an integer. Try again!")
         return RTResult().success(Number(number))
-    execute_input_int.arg_names = []
-
-    def execute_len(self, exec_ctx):
-        list_ = exec_ctx.symbol_table.get("list")
 
+    def execute_len(self, list_):
         if isinstance(list_, List):
-            return RTResult().success(Number(len(list_.elements)))
+            return RTResult().success(Number(list_.length()))
         elif isinstance(list_, Tuple):
             return RTResult().success(Number(len(list_.elements)))
         elif isinstance(list_, Set):
             return RTResult().success(Number(len(list_.elements)))
         elif isinstance(list_, String):
-            return RTResult().success(Number(len(list_.value)))
+            return RTResult().success(Number(list_.length()))
         else:
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Argument must be list, tuple, set, or string",
-                exec_ctx
+                self.call_context()
             ))
-    execute_len.arg_names = ["list"]
-
-    def execute_append(self, exec_ctx):
-        list_ = exec_ctx.symbol_table.get("list")
-        value = exec_ctx.symbol_table.get("value")
 
+    def execute_append(self, list_, value):
         if not isinstance(list_, List):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "First argument must be list",
-                exec_ctx
+                self.call_context()
             ))
 
         list_.elements.append(value)
         return RTResult().success(Number.null)
-    execute_append.arg_names = ["list", "value"]
-
-    def execute_pop(self, exec_ctx):
-        list_ = exec_ctx.symbol_table.get("list")
-        index = exec_ctx.symbol_table.get("index")
 
+    def execute_pop(self, list_, index):
         if not isinstance(list_, List):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "First argument must be list",
-                exec_ctx
+                self.call_context()
             ))
 
         if not isinstance(index, Number):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Second argument must be number",
-                exec_ctx
+                self.call_context()
             ))
 
         try:
@@ -123,41 +122,34 @@ class BuiltInFunction(BaseFunction):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 'Element at this index could not be removed from list because index is out of bounds',
-                exec_ctx
+                self.call_context()
             ))
         return RTResult().success(element)
-    execute_pop.arg_names = ["list", "index"]
-
-    def execute_extend(self, exec_ctx):
-        listA = exec_ctx.symbol_table.get("listA")
-        listB = exec_ctx.symbol_table.get("listB")
 
+    def execute_extend(self, listA, listB):
         if not isinstance(listA, List):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "First argument must be list",
-                exec_ctx
+                self.call_context()
             ))
 
         if not isinstance(listB, List):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Second argument must be list",
-                exec_ctx
+                self.call_context()
             ))
 
         listA.elements.extend(listB.elements)
         return RTResult().success(Number.null)
-    execute_extend.arg_names = ["listA", "listB"]
-
-    def execute_run(self, exec_ctx):
-        fn = exec_ctx.symbol_table.get("fn")
 
+    def execute_run(self, fn):
         if not isinstance(fn, String):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Argument must be string",
-                exec_ctx
+                self.call_context()
             ))
 
         fn = fn.value
@@ -169,99 +161,86 @@ class BuiltInFunction(BaseFunction):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 f"Failed to load script \"{fn}\"\n" + str(e),
-                exec_ctx
+                self.call_context()
             ))
 
         # Import here to avoid circular dependency
-        from entry import run
-        _, error = run(fn, script)
+        from entry import run_ast
+        from module_loader import module_loader
+
+        # Parse (or reuse the cached AST of) the script, then run it
+        node, error = module_loader.compile_module(fn, script)
+        if not error:
+            _, error = run_ast(fn, node)
 
         if error:
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 f"Failed to finish executing script \"{fn}\"\n" + error.as_string(),
-                exec_ctx
+                self.call_context()
             ))
 
         return RTResult().success(Number.null)
-    execute_run.arg_names = ["fn"]
-
-    def execute_keys(self, exec_ctx):
-        dict_ = exec_ctx.symbol_table.get("dict")
 
+    def execute_keys(self, dict_):
         if not isinstance(dict_, Dict):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Argument must be dictionary",
-                exec_ctx
+                self.call_context()
             ))
 
         keys_list = []
-        for key in dict_.elements.keys():
+        for key, _ in dict_.items():
             if isinstance(key, str):
                 keys_list.append(String(key))
+            elif isinstance(key, Tuple):
+                keys_list.append(key)
             else:
                 keys_list.append(Number(key))
         
         return RTResult().success(List(keys_list))
-    execute_keys.arg_names = ["dict"]
-
-    def execute_values(self, exec_ctx):
-        dict_ = exec_ctx.symbol_table.get("dict")
 
+    def execute_values(self, dict_):
         if not isinstance(dict_, Dict):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Argument must be dictionary",
-                exec_ctx
+                self.call_context()
             ))
 
-        values_list = list(dict_.elements.values())
+        values_list = [value for _, value in dict_.items()]
         return RTResult().success(List(values_list))
-    execute_values.arg_names = ["dict"]
-
-    def execute_has_key(self, exec_ctx):
-        dict_ = exec_ctx.symbol_table.get("dict")
-        key = exec_ctx.symbol_table.get("key")
 
+    def execute_has_key(self, dict_, key):
         if not isinstance(dict_, Dict):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "First argument must be dictionary",
-                exec_ctx
+                self.call_context()
             ))
 
         # Convert key to hashable
-        if isinstance(key, String):
-            hashable_key = key.value
-        elif isinstance(key, Number):
-            hashable_key = key.value
-        else:
+        hashable_key = dict_key(key)
+        if hashable_key is None:
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
-                "Key must be string or number",
-                exec_ctx
+                "Key must be string, number or tuple",
+                self.call_context()
             ))
 
-        result = 1 if hashable_key in dict_.elements else 0
+        result = 1 if dict_.contains(hashable_key) else 0
         return RTResult().success(Number(result))
-    execute_has_key.arg_names = ["dict", "key"]
-
-    def execute_remove(self, exec_ctx):
-        collection = exec_ctx.symbol_table.get("dict")
-        key = exec_ctx.symbol_table.get("key")
 
+    def execute_remove(self, collection, key):
         if isinstance(collection, Dict):
             # Convert key to hashable
-            if isinstance(key, String):
-                hashable_key = key.value
-            elif isinstance(key, Number):
-                hashable_key = key.value
-            else:
+            hashable_key = dict_key(key)
+            if hashable_key is None:
                 return RTResult().failure(RTError(
                     self.pos_start, self.pos_end,
-                    "Key must be string or number",
-                    exec_ctx
+                    "Key must be string, number or tuple",
+                    self.call_context()
                 ))
 
             if hashable_key in collection.elements:
@@ -272,31 +251,30 @@ class BuiltInFunction(BaseFunction):
                 return RTResult().failure(RTError(
                     self.pos_start, self.pos_end,
                     f'Key "{hashable_key}" not found in dictionary',
-                    exec_ctx
+                    self.call_context()
                 ))
         elif isinstance(collection, Set):
             # For sets, remove element and return new set (immutable)
-            hashable_elem = collection._make_hashable(key)
-            if hashable_elem in collection.elements:
+            element = collection._make_hashable(key)
+            if element in collection.elements:
                 new_set = collection.copy()
-                new_set.elements.remove(hashable_elem)
+                new_set.elements.remove(element)
                 return RTResult().success(new_set)
             else:
                 return RTResult().failure(RTError(
                     self.pos_start, self.pos_end,
                     f'Element not found in set',
-                    exec_ctx
+                    self.call_context()
                 ))
         else:
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "First argument must be dictionary or set",
-                exec_ctx
+                self.call_context()
             ))
         
-    execute_remove.arg_names = ["dict", "key"]
 
-    def execute_help(self, exec_ctx):
+    def execute_help(self):
         help_text = """
 UTTR Quick Reference:
 --------------------
@@ -347,55 +325,43 @@ For full documentation, see README.md
 """
         print(help_text)
         return RTResult().success(Number.null)
-    execute_help.arg_names = []
 
-    def execute_exit(self, exec_ctx):
+    def execute_exit(self):
         import sys
         print("Goodbye!")
         sys.exit(0)
-    execute_exit.arg_names = []
 
-    def execute_clear(self, exec_ctx):
+    def execute_clear(self):
         import os
         os.system('cls' if os.name == 'nt' else 'clear')
         return RTResult().success(Number.null)
-    execute_clear.arg_names = []
-
-    def execute_error_message(self, exec_ctx):
-        error = exec_ctx.symbol_table.get("error")
 
+    def execute_error_message(self, error):
         if not isinstance(error, ErrorValue):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Argument must be an error",
-                exec_ctx
+                self.call_context()
             ))
 
         return RTResult().success(String(error.error_message))
-    execute_error_message.arg_names = ["error"]
-
-    def execute_error_type(self, exec_ctx):
-        error = exec_ctx.symbol_table.get("error")
 
+    def execute_error_type(self, error):
         if not isinstance(error, ErrorValue):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Argument must be an error",
-                exec_ctx
+                self.call_context()
             ))
 
         return RTResult().success(String(error.error_type))
-    execute_error_type.arg_names = ["error"]
-
-    def execute_split(self, exec_ctx):
-        string = exec_ctx.symbol_table.get("string")
-        delimiter = exec_ctx.symbol_table.get("delimiter")
 
+    def execute_split(self, string, delimiter):
         if not isinstance(string, String):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "First argument must be string",
-                exec_ctx
+                self.call_context()
             ))
 
         # Default delimiter is space if not provided or null
@@ -407,7 +373,7 @@ For full documentation, see README.md
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Delimiter must be string or null",
-                exec_ctx
+                self.call_context()
             ))
 
         # Split the string and convert to String values
@@ -415,24 +381,20 @@ For full documentation, see README.md
         result_list = [String(part) for part in parts]
         
         return RTResult().success(List(result_list))
-    execute_split.arg_names = ["string", "delimiter"]
-
-    def execute_join(self, exec_ctx):
-        list_ = exec_ctx.symbol_table.get("list")
-        separator = exec_ctx.symbol_table.get("separator")
 
+    def execute_join(self, list_, separator):
         if not isinstance(list_, List):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "First argument must be list",
-                exec_ctx
+                self.call_context()
             ))
 
         if not isinstance(separator, String):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Second argument must be string",
-                exec_ctx
+                self.call_context()
             ))
 
         # Validate all list elements are strings and convert to Python strings
@@ -446,93 +408,77 @@ For full documentation, see README.md
                 return RTResult().failure(RTError(
                     self.pos_start, self.pos_end,
                     "All list elements must be strings or numbers",
-                    exec_ctx
+                    self.call_context()
                 ))
 
         # Join the strings
         result = separator.value.join(string_parts)
         return RTResult().success(String(result))
-    execute_join.arg_names = ["list", "separator"]
-
-    def execute_upper(self, exec_ctx):
-        string = exec_ctx.symbol_table.get("string")
 
+    def execute_upper(self, string):
         if not isinstance(string, String):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Argument must be string",
-                exec_ctx
+                self.call_context()
             ))
 
         return RTResult().success(String(string.value.upper()))
-    execute_upper.arg_names = ["string"]
-
-    def execute_lower(self, exec_ctx):
-        string = exec_ctx.symbol_table.get("string")
 
+    def execute_lower(self, string):
         if not isinstance(string, String):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Argument must be string",
-                exec_ctx
+                self.call_context()
             ))
 
         return RTResult().success(String(string.value.lower()))
-    execute_lower.arg_names = ["string"]
-
-    def execute_replace(self, exec_ctx):
-        string = exec_ctx.symbol_table.get("string")
-        old = exec_ctx.symbol_table.get("old")
-        new = exec_ctx.symbol_table.get("new")
 
+    def execute_replace(self, string, old, new):
         if not isinstance(string, String):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "First argument must be string",
-                exec_ctx
+                self.call_context()
             ))
 
         if not isinstance(old, String):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Second argument must be string",
-                exec_ctx
+                self.call_context()
             ))
 
         if not isinstance(new, String):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Third argument must be string",
-                exec_ctx
+                self.call_context()
             ))
 
         result = string.value.replace(old.value, new.value)
         return RTResult().success(String(result))
-    execute_replace.arg_names = ["string", "old", "new"]
-
-    def execute_substring(self, exec_ctx):
-        string = exec_ctx.symbol_table.get("string")
-        start = exec_ctx.symbol_table.get("start")
-        end = exec_ctx.symbol_table.get("end")
 
+    def execute_substring(self, string, start, end):
         if not isinstance(string, String):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "First argument must be string",
-                exec_ctx
+                self.call_context()
             ))
 
-        if not isinstance(start, Number) or start == Number.null:
+        if not isinstance(start, Number) or start is Number.null:
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Second argument must be a number (null not allowed for start index)",
-                exec_ctx
+                self.call_context()
             ))
 
         start_idx = int(start.value)
 
         # If end is not provided or is null, slice to end of string
-        if end is None or end == Number.null or (isinstance(end, Number) and end.value == Number.null.value):
+        if end is None or end is Number.null or (isinstance(end, Number) and end.value == Number.null.value):
             result = string.value[start_idx:]
         elif isinstance(end, Number):
             end_idx = int(end.value)
@@ -541,15 +487,12 @@ For full documentation, see README.md
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Third argument must be number or null",
-                exec_ctx
+                self.call_context()
             ))
 
         return RTResult().success(String(result))
-    execute_substring.arg_names = ["string", "start", "end"]
-
-    def execute_tuple(self, exec_ctx):
-        value = exec_ctx.symbol_table.get("value")
 
+    def execute_tuple(self, value):
         if isinstance(value, List):
             # Convert list to tuple
             return RTResult().success(Tuple(value.elements))
@@ -563,11 +506,8 @@ For full documentation, see README.md
         else:
             # Wrap single value in tuple
             return RTResult().success(Tuple([value]))
-    execute_tuple.arg_names = ["value"]
-
-    def execute_list(self, exec_ctx):
-        value = exec_ctx.symbol_table.get("value")
 
+    def execute_list(self, value):
         if isinstance(value, Tuple):
             # Convert tuple to list
             return RTResult().success(List(list(value.elements)))
@@ -581,24 +521,20 @@ For full documentation, see README.md
         else:
             # Wrap single value in list
             return RTResult().success(List([value]))
-    execute_list.arg_names = ["value"]
-
-    def execute_regex_match(self, exec_ctx):
-        pattern = exec_ctx.symbol_table.get("pattern")
-        text = exec_ctx.symbol_table.get("text")
 
+    def execute_regex_match(self, pattern, text):
         if not isinstance(pattern, (Regex, String)):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "First argument must be regex or string pattern",
-                exec_ctx
+                self.call_context()
             ))
 
         if not isinstance(text, String):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Second argument must be string",
-                exec_ctx
+                self.call_context()
             ))
 
         try:
@@ -613,26 +549,22 @@ For full documentation, see README.md
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 f"Invalid regex pattern: {str(e)}",
-                exec_ctx
+                self.call_context()
             ))
-    execute_regex_match.arg_names = ["pattern", "text"]
-
-    def execute_regex_search(self, exec_ctx):
-        pattern = exec_ctx.symbol_table.get("pattern")
-        text = exec_ctx.symbol_table.get("text")
 
+    def execute_regex_search(self, pattern, text):
         if not isinstance(pattern, (Regex, String)):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "First argument must be regex or string pattern",
-                exec_ctx
+                self.call_context()
             ))
 
         if not isinstance(text, String):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Second argument must be string",
-                exec_ctx
+                self.call_context()
             ))
 
         try:
@@ -658,34 +590,29 @@ For full documentation, see README.md
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 f"Invalid regex pattern: {str(e)}",
-                exec_ctx
+                self.call_context()
             ))
-    execute_regex_search.arg_names = ["pattern", "text"]
-
-    def execute_regex_replace(self, exec_ctx):
-        pattern = exec_ctx.symbol_table.get("pattern")
-        replacement = exec_ctx.symbol_table.get("replacement")
-        text = exec_ctx.symbol_table.get("text")
 
+    def execute_regex_replace(self, pattern, replacement, text):
         if not isinstance(pattern, (Regex, String)):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "First argument must be regex or string pattern",
-                exec_ctx
+                self.call_context()
             ))
 
         if not isinstance(replacement, String):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Second argument must be string",
-                exec_ctx
+                self.call_context()
             ))
 
         if not isinstance(text, String):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Third argument must be string",
-                exec_ctx
+                self.call_context()
             ))
 
         try:
@@ -700,26 +627,22 @@ For full documentation, see README.md
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 f"Invalid regex pattern: {str(e)}",
-                exec_ctx
+                self.call_context()
             ))
-    execute_regex_replace.arg_names = ["pattern", "replacement", "text"]
-
-    def execute_regex_findall(self, exec_ctx):
-        pattern = exec_ctx.symbol_table.get("pattern")
-        text = exec_ctx.symbol_table.get("text")
 
+    def execute_regex_findall(self, pattern, text):
         if not isinstance(pattern, (Regex, String)):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "First argument must be regex or string pattern",
-                exec_ctx
+                self.call_context()
             ))
 
         if not isinstance(text, String):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Second argument must be string",
-                exec_ctx
+                self.call_context()
             ))
 
         try:
@@ -737,26 +660,22 @@ For full documentation, see README.md
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 f"Invalid regex pattern: {str(e)}",
-                exec_ctx
+                self.call_context()
             ))
-    execute_regex_findall.arg_names = ["pattern", "text"]
-
-    def execute_regex_split(self, exec_ctx):
-        pattern = exec_ctx.symbol_table.get("pattern")
-        text = exec_ctx.symbol_table.get("text")
 
+    def execute_regex_split(self, pattern, text):
         if not isinstance(pattern, (Regex, String)):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "First argument must be regex or string pattern",
-                exec_ctx
+                self.call_context()
             ))
 
         if not isinstance(text, String):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Second argument must be string",
-                exec_ctx
+                self.call_context()
             ))
 
         try:
@@ -772,83 +691,63 @@ For full documentation, see README.md
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 f"Invalid regex pattern: {str(e)}",
-                exec_ctx
+                self.call_context()
             ))
-    execute_regex_split.arg_names = ["pattern", "text"]
 
     # Set operations
-    def execute_union(self, exec_ctx):
-        set1 = exec_ctx.symbol_table.get("set1")
-        set2 = exec_ctx.symbol_table.get("set2")
-
+    def execute_union(self, set1, set2):
         if not isinstance(set1, Set) or not isinstance(set2, Set):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Both arguments must be sets",
-                exec_ctx
+                self.call_context()
             ))
 
         result, error = set1.added_to(set2)
         if error:
             return RTResult().failure(error)
         return RTResult().success(result)
-    execute_union.arg_names = ["set1", "set2"]
-
-    def execute_intersection(self, exec_ctx):
-        set1 = exec_ctx.symbol_table.get("set1")
-        set2 = exec_ctx.symbol_table.get("set2")
 
+    def execute_intersection(self, set1, set2):
         if not isinstance(set1, Set) or not isinstance(set2, Set):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Both arguments must be sets",
-                exec_ctx
+                self.call_context()
             ))
 
         result, error = set1.intersected_with(set2)
         if error:
             return RTResult().failure(error)
         return RTResult().success(result)
-    execute_intersection.arg_names = ["set1", "set2"]
-
-    def execute_difference(self, exec_ctx):
-        set1 = exec_ctx.symbol_table.get("set1")
-        set2 = exec_ctx.symbol_table.get("set2")
 
+    def execute_difference(self, set1, set2):
         if not isinstance(set1, Set) or not isinstance(set2, Set):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Both arguments must be sets",
-                exec_ctx
+                self.call_context()
             ))
 
         result, error = set1.subbed_by(set2)
         if error:
             return RTResult().failure(error)
         return RTResult().success(result)
-    execute_difference.arg_names = ["set1", "set2"]
-
-    def execute_symmetric_difference(self, exec_ctx):
-        set1 = exec_ctx.symbol_table.get("set1")
-        set2 = exec_ctx.symbol_table.get("set2")
 
+    def execute_symmetric_difference(self, set1, set2):
         if not isinstance(set1, Set) or not isinstance(set2, Set):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Both arguments must be sets",
-                exec_ctx
+                self.call_context()
             ))
 
         result, error = set1.symmetric_diff_with(set2)
         if error:
             return RTResult().failure(error)
         return RTResult().success(result)
-    execute_symmetric_difference.arg_names = ["set1", "set2"]
-
-    def execute_add(self, exec_ctx):
-        set_ = exec_ctx.symbol_table.get("set")
-        element = exec_ctx.symbol_table.get("element")
 
+    def execute_add(self, set_, element):
         if isinstance(set_, Set):
             # For sets, add element and return new set
             new_set = set_.copy()
@@ -858,17 +757,12 @@ For full documentation, see README.md
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "First argument must be a set",
-                exec_ctx
+                self.call_context()
             ))
-    execute_add.arg_names = ["set", "element"]
-
-    def execute_contains(self, exec_ctx):
-        collection = exec_ctx.symbol_table.get("collection")
-        element = exec_ctx.symbol_table.get("element")
 
+    def execute_contains(self, collection, element):
         if isinstance(collection, Set):
-            hashable_elem = collection._make_hashable(element)
-            result = Number(1 if hashable_elem in collection.elements else 0)
+            result = Number(1 if collection._make_hashable(element) in collection.elements else 0)
             return RTResult().success(result)
         elif isinstance(collection, List):
             # Also support lists for backwards compatibility
@@ -881,91 +775,68 @@ For full documentation, see README.md
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "First argument must be a set or list",
-                exec_ctx
+                self.call_context()
             ))
-    execute_contains.arg_names = ["collection", "element"]
-
-    def execute_is_subset(self, exec_ctx):
-        set1 = exec_ctx.symbol_table.get("set1")
-        set2 = exec_ctx.symbol_table.get("set2")
 
+    def execute_is_subset(self, set1, set2):
         if not isinstance(set1, Set) or not isinstance(set2, Set):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Both arguments must be sets",
-                exec_ctx
+                self.call_context()
             ))
 
         result = Number(1 if set1.elements <= set2.elements else 0)
         return RTResult().success(result)
-    execute_is_subset.arg_names = ["set1", "set2"]
-
-    def execute_is_superset(self, exec_ctx):
-        set1 = exec_ctx.symbol_table.get("set1")
-        set2 = exec_ctx.symbol_table.get("set2")
 
+    def execute_is_superset(self, set1, set2):
         if not isinstance(set1, Set) or not isinstance(set2, Set):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Both arguments must be sets",
-                exec_ctx
+                self.call_context()
             ))
 
         result = Number(1 if set1.elements >= set2.elements else 0)
         return RTResult().success(result)
-    execute_is_superset.arg_names = ["set1", "set2"]
-
-    def execute_set_from_list(self, exec_ctx):
-        list_ = exec_ctx.symbol_table.get("list")
 
+    def execute_set_from_list(self, list_):
         if not isinstance(list_, List):
             return RTResult().failure(RTError(
                 self.pos_start, self.pos_end,
                 "Argument must be a list",
-                exec_ctx
+                self.call_context()
             ))
 
         new_set = Set(list_.elements)
         return RTResult().success(new_set)
-    execute_set_from_list.arg_names = ["list"]
-
-# Create built-in function instances
-BuiltInFunction.show = BuiltInFunction("show")
-BuiltInFunction.input = BuiltInFunction("input")
-BuiltInFunction.input_int = BuiltInFunction("input_int")
-BuiltInFunction.len = BuiltInFunction("len")
-BuiltInFunction.append = BuiltInFunction("append")
-BuiltInFunction.pop = BuiltInFunction("pop")
-BuiltInFunction.extend = BuiltInFunction("extend")
-BuiltInFunction.keys = BuiltInFunction("keys")
-BuiltInFunction.values = BuiltInFunction("values")
-BuiltInFunction.has_key = BuiltInFunction("has_key")
-BuiltInFunction.remove = BuiltInFunction("remove")
-BuiltInFunction.run = BuiltInFunction("run")
-BuiltInFunction.help = BuiltInFunction("help")
-BuiltInFunction.exit = BuiltInFunction("exit")
-BuiltInFunction.clear = BuiltInFunction("clear")
-BuiltInFunction.error_message = BuiltInFunction("error_message")
-BuiltInFunction.error_type = BuiltInFunction("error_type")
-BuiltInFunction.split = BuiltInFunction("split")
-BuiltInFunction.join = BuiltInFunction("join")
-BuiltInFunction.upper = BuiltInFunction("upper")
-BuiltInFunction.lower = BuiltInFunction("lower")
-BuiltInFunction.replace = BuiltInFunction("replace")
-BuiltInFunction.substring = BuiltInFunction("substring")
-BuiltInFunction.tuple = BuiltInFunction("tuple")
-BuiltInFunction.list = BuiltInFunction("list")
-BuiltInFunction.regex_match = BuiltInFunction("regex_match")
-BuiltInFunction.regex_search = BuiltInFunction("regex_search")
-BuiltInFunction.regex_replace = BuiltInFunction("regex_replace")
-BuiltInFunction.regex_findall = BuiltInFunction("regex_findall")
-BuiltInFunction.regex_split = BuiltInFunction("regex_split")
-BuiltInFunction.union = BuiltInFunction("union")
-BuiltInFunction.intersection = BuiltInFunction("intersection")
-BuiltInFunction.difference = BuiltInFunction("difference")
-BuiltInFunction.symmetric_difference = BuiltInFunction("symmetric_difference")
-BuiltInFunction.add = BuiltInFunction("add")
-BuiltInFunction.contains = BuiltInFunction("contains")
-BuiltInFunction.is_subset = BuiltInFunction("is_subset")
-BuiltInFunction.is_superset = BuiltInFunction("is_superset")
-BuiltInFunction.set_from_list = BuiltInFunction("set_from_list")
\ No newline at end of file
+
+    def execute_memoize(self, function, max_entries):
+        if not isinstance(function, Function):
+            return RTResult().failure(RTError(
+                self.pos_start, self.pos_end,
+                "First argument must be a function",
+                self.call_context()
+            ))
+
+        if (not isinstance(max_entries, Number)
+                or (isinstance(max_entries.value, float) and not math.isfinite(max_entries.value))
+                or int(max_entries.value) != max_entries.value or max_entries.value < 1):
+            return RTResult().failure(RTError(
+                self.pos_start, self.pos_end,
+                "Second argument must be a positive whole number",
+                self.call_context()
+            ))
+
+        return RTResult().success(MemoizedFunction.wrap(function, int(max_entries.value)))
+
+    def execute_memo_stats(self, function):
+        if not isinstance(function, MemoizedFunction):
+            return RTResult().failure(RTError(
+                self.pos_start, self.pos_end,
+                "Argument must be a memoized function",
+                self.call_context()
+            ))
+
+        stats = {name: Number(count) for name, count in function.cache.stats().items()}
+        return RTResult().success(Dict(stats))
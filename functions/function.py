@@ -1,32 +1,64 @@
+from context import Context
 from functions.base_function import BaseFunction
 from run_time_result import RTResult
-from values.number_value import Number
+from symbol_table import SlotTable, SymbolTable
 
 
 class Function(BaseFunction):
-    def __init__(self, name, body_node, arg_names):
+    def __init__(self, name, body_node, arg_names, body_code=None, body_bytecode=None, scope=None):
         super().__init__(name)
         self.body_node = body_node
         self.arg_names = arg_names
+        # Closure compiled from body_node by the closure engine, if any
+        self.body_code = body_code
+        # Bytecode compiled from body_node for the VM, if any
+        self.body_bytecode = body_bytecode
+        # Variable slots of body_node given by the resolver, if any
+        self.scope = scope
+
+    def generate_new_context(self):
+        return self.new_call_context(self.context, self.pos_start)
+
+    def new_call_context(self, parent, entry_pos):
+        """Context of one call entered at entry_pos, whose free names are looked up in parent"""
+        new_context = Context(self.name, parent, entry_pos)
+        if self.scope is None:
+            new_context.symbol_table = SymbolTable(parent.symbol_table)
+        else:
+            new_context.symbol_table = SlotTable(self.scope, parent.symbol_table)
+        return new_context
+
+    def bind_args(self, args, exec_ctx):
+        """populate_args for a call whose argument count is already checked"""
+        if self.scope is None:
+            self.populate_args(self.arg_names, args, exec_ctx)
+            return
+
+        slots = exec_ctx.symbol_table.slots
+        for slot, arg_value in zip(self.scope.arg_slots, args):
+            if not arg_value.shared: arg_value.context = exec_ctx
+            slots[slot] = arg_value
 
     def execute(self, args):
-        res = RTResult()
-        # Import here to avoid circular dependency
-        from interpreter import Interpreter
-        interpreter = Interpreter()
-        exec_ctx = self.generate_new_context()
+        if self.body_code is not None:
+            # Import here to avoid circular dependency
+            from closure_compiler import execute_compiled
+            return execute_compiled(self, args)
+        if self.body_bytecode is not None:
+            # Import here to avoid circular dependency
+            from vm import execute_bytecode
+            return execute_bytecode(self, args)
 
-        res.register(self.check_and_populate_args(self.arg_names, args, exec_ctx))
+        res = RTResult()
+        res.register(self.check_args(self.arg_names, args))
         if res.should_return(): return res
 
-        value = res.register(interpreter.visit(self.body_node, exec_ctx))
-        if res.should_return() and res.func_return_value is None: return res
-
-        ret_value = res.func_return_value or value or Number.null
-        return res.success(ret_value)
+        # Import here to avoid circular dependency
+        from interpreter import make_interpreter
+        return make_interpreter().call_function(self, args, self.context, self.pos_start)
 
     def copy(self):
-        copy = Function(self.name, self.body_node, self.arg_names)
+        copy = Function(self.name, self.body_node, self.arg_names, self.body_code, self.body_bytecode, self.scope)
         copy.set_context(self.context)
         copy.set_pos(self.pos_start, self.pos_end)
         return copy
@@ -0,0 +1,106 @@
+from collections import OrderedDict
+import math
+
+from functions.function import Function
+from run_time_result import RTResult
+from values.number_value import Number
+from values.string_value import String
+from values.tuple_value import Tuple
+
+
+class MemoCache:
+    """Bounded LRU of the results of one memoized function, with its counters"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.entries),
+            'max_entries': self.max_entries,
+        }
+
+
+def memo_key(value):
+    """
+    Structural identity of an argument: numbers, strings and tuples of them
+    with equal contents share a key (1 and 1.0 do not, nor do 0.0 and -0.0,
+    as they show differently). None for values a call may mutate or that have no
+    structural identity (lists, dicts, sets, functions).
+    """
+    value_class = type(value)
+    if value_class is Number:
+        if type(value.value) is float:
+            return (float, value.value, math.copysign(1.0, value.value))
+        return (type(value.value), value.value)
+    if value_class is String:
+        return (String, value.value)
+    if value_class is Tuple:
+        keys = tuple(memo_key(element) for element in value.elements)
+        return None if None in keys else (Tuple, keys)
+    return None
+
+
+class MemoizedFunction(Function):
+    """
+    User function whose results are cached by its arguments (see the
+    'memoize' builtin). Calls with an argument memo_key cannot key run the
+    function without touching the cache, and failed calls are not cached.
+    """
+
+    def __init__(self, name, body_node, arg_names, body_code=None, body_bytecode=None, scope=None, cache=None):
+        super().__init__(name, body_node, arg_names, body_code, body_bytecode, scope)
+        self.cache = cache
+
+    @classmethod
+    def wrap(cls, func, max_entries):
+        memoized = cls(func.name, func.body_node, func.arg_names, func.body_code, func.body_bytecode, func.scope, MemoCache(max_entries))
+        memoized.set_context(func.context)
+        memoized.set_pos(func.pos_start, func.pos_end)
+        return memoized
+
+    def execute(self, args):
+        key = tuple(memo_key(arg) for arg in args)
+        if None in key:
+            return super().execute(args)
+
+        value = self.cache.get(key)
+        if value is not None:
+            return RTResult().success(value)
+
+        res = super().execute(args)
+        if not res.should_return():
+            self.cache.put(key, res.value)
+        return res
+
+    def copy(self):
+        # Copies made for each call share the cache
+        copy = MemoizedFunction(self.name, self.body_node, self.arg_names, self.body_code, self.body_bytecode, self.scope, self.cache)
+        copy.set_context(self.context)
+        copy.set_pos(self.pos_start, self.pos_end)
+        return copy
+
+    def __repr__(self):
+        return f"<memoized function {self.name}>"
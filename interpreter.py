@@ -1,13 +1,18 @@
+import options
 from errors.run_time_error import RTError
+from functions.base_function import BaseFunction
+from functions.builtin_function import BuiltInFunction
 from functions.function import Function
 from run_time_result import RTResult
-from symbol_table import SymbolTable
+from resolver import resolve
+from tail_calls import TailCall, mark_tail_calls
+from symbol_table import SlotTable, SymbolTable
 from context import Context
-from tokens import TT_AMPERSAND, TT_CARET, TT_DIV, TT_EE, TT_GT, TT_GTE, TT_KEYWORD, TT_LT, TT_LTE, TT_MINUS, TT_MOD, TT_MUL, TT_NE, TT_PLUS
-from values.dict_value import Dict
+from tokens import KW_AND, KW_NOT, KW_OR, TT_AMPERSAND, TT_CARET, TT_DIV, TT_EE, TT_GT, TT_GTE, TT_LT, TT_LTE, TT_MINUS, TT_MOD, TT_MUL, TT_NE, TT_PLUS
+from values.dict_value import Dict, dict_key
 from values.error_value import ErrorValue
 from values.list_value import List
-from values.number_value import Number
+from values.number_value import Number, placed
 from values.regex_value import Regex
 from values.set_value import Set
 from values.string_value import String
@@ -15,17 +20,32 @@ from values.tuple_value import Tuple
 
 
 class Interpreter:
+    # Node class -> visit function, filled in the first time each class is seen
+    dispatch_table = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Each subclass gets its own table so overridden visitors are honoured
+        cls.dispatch_table = {}
+
     def visit(self, node, context):
-        method_name = f'visit_{type(node).__name__}'
-        method = getattr(self, method_name, self.no_visit_method)
-        return method(node, context)
+        method = self.dispatch_table.get(type(node))
+        if method is None:
+            method = self.resolve_visit_method(type(node))
+        return method(self, node, context)
+
+    @classmethod
+    def resolve_visit_method(cls, node_class):
+        method = getattr(cls, f'visit_{node_class.__name__}', cls.no_visit_method)
+        cls.dispatch_table[node_class] = method
+        return method
 
     def no_visit_method(self, node, context):
         raise Exception(f'No visit_{type(node).__name__} method defined')
 
     def visit_NumberNode(self, node, context):
         return RTResult().success(
-            Number(node.tok.value).set_context(context).set_pos(node.pos_start, node.pos_end)
+            Number.of(node.tok.value).set_context(context).set_pos(node.pos_start, node.pos_end)
         )
 
     def visit_StringNode(self, node, context):
@@ -76,7 +96,7 @@ class Interpreter:
         
         # Create a new child context for the comprehension to avoid polluting outer scope
         comp_context = Context(context.display_name, context.parent, context.parent_entry_pos)
-        comp_context.symbol_table = SymbolTable(context.symbol_table)
+        comp_context.symbol_table = make_comprehension_table(node, context)
         
         def process_comprehension_clauses(clause_idx):
             """Recursively process comprehension clauses"""
@@ -90,6 +110,7 @@ class Interpreter:
             # Process current clause
             var_tok, iterable_node, conditions = node.comprehension_clauses[clause_idx]
             var_name = var_tok.value
+            var_slot = node.clause_slots[clause_idx] if node.clause_slots else None
             
             # Evaluate the iterable
             iterable = res.register(self.visit(iterable_node, comp_context))
@@ -113,7 +134,7 @@ class Interpreter:
             # Iterate through items
             for item in items:
                 # Set the loop variable
-                comp_context.symbol_table.set(var_name, item)
+                comp_context.symbol_table.set_slot(var_slot, var_name, item)
                 
                 # Check all conditions for this iteration
                 should_include = True
@@ -180,12 +201,11 @@ class Interpreter:
             if res.should_return(): return res
             
             # Convert key to hashable type
-            if hasattr(key, 'value'):
-                hashable_key = key.value
-            else:
+            hashable_key = dict_key(key)
+            if hashable_key is None:
                 return res.failure(RTError(
                     key_node.pos_start, key_node.pos_end,
-                    'Dictionary key must be a string or number',
+                    'Dictionary key must be a string, number or tuple',
                     context
                 ))
             
@@ -198,7 +218,10 @@ class Interpreter:
     def visit_VarAccessNode(self, node, context):
         res = RTResult()
         var_name = node.var_name_tok.value
-        value = context.symbol_table.get(var_name)
+        if node.address is None:
+            value = context.symbol_table.get(var_name)
+        else:
+            value = context.symbol_table.lookup(var_name, node.address)
 
         if not value:
             return res.failure(RTError(
@@ -208,9 +231,8 @@ class Interpreter:
             ))
 
         # For mutable types (List, Dict) and functions, don't copy to preserve their context/state
-        # For immutable types (Number, String), copy to prevent issues
-        from functions.base_function import BaseFunction
-        from functions.builtin_function import BuiltInFunction
+        # For immutable types (Number, String), copy to prevent issues, except
+        # for shared numbers, which nothing changes
         if isinstance(value, (List, Dict, BaseFunction)):
             value = value.set_pos(node.pos_start, node.pos_end)
             # Builtin functions should use current context
@@ -219,7 +241,7 @@ class Interpreter:
                 value = value.set_context(context)
             elif not isinstance(value, BaseFunction):
                 value = value.set_context(context)
-        else:
+        elif not value.shared:
             value = value.copy().set_pos(node.pos_start, node.pos_end).set_context(context)
         return res.success(value)
 
@@ -229,7 +251,7 @@ class Interpreter:
         value = res.register(self.visit(node.value_node, context))
         if res.should_return(): return res
 
-        context.symbol_table.set(var_name, value)
+        context.symbol_table.set_slot(node.slot, var_name, value)
         return res.success(value)
 
     def visit_ConstAssignNode(self, node, context):
@@ -238,7 +260,7 @@ class Interpreter:
         value = res.register(self.visit(node.value_node, context))
         if res.should_return(): return res
 
-        context.symbol_table.set(const_name, value)
+        context.symbol_table.set_slot(node.slot, const_name, value)
         return res.success(value)
 
     def visit_BinOpNode(self, node, context):
@@ -248,41 +270,57 @@ class Interpreter:
         right = res.register(self.visit(node.right_node, context))
         if res.should_return(): return res
 
-        if node.op_tok.type == TT_PLUS:
+        result, error = self.binary_operation(node.op_tok, left, right)
+        if error and (left.shared or right.shared):
+            # Shared numbers have no position, so redo the operation on
+            # placed copies for the error to point at the operands
+            result, error = self.binary_operation(
+                node.op_tok,
+                placed(left, node.left_node.pos_start, node.left_node.pos_end, context),
+                placed(right, node.right_node.pos_start, node.right_node.pos_end, context)
+            )
+
+        if error:
+            return res.failure(error)
+        if left.shared:
+            # A shared number has no context to hand its result, so the
+            # result takes this operation's for later errors to trace from
+            result.set_context(context)
+        return res.success(result.set_pos(node.pos_start, node.pos_end))
+
+    def binary_operation(self, op_tok, left, right):
+        if op_tok.type == TT_PLUS:
             result, error = left.added_to(right)
-        elif node.op_tok.type == TT_MINUS:
+        elif op_tok.type == TT_MINUS:
             result, error = left.subbed_by(right)
-        elif node.op_tok.type == TT_MUL:
+        elif op_tok.type == TT_MUL:
             result, error = left.multed_by(right)
-        elif node.op_tok.type == TT_DIV:
+        elif op_tok.type == TT_DIV:
             result, error = left.dived_by(right)
-        elif node.op_tok.type == TT_MOD:
+        elif op_tok.type == TT_MOD:
             result, error = left.modded_by(right)
-        elif node.op_tok.type == TT_EE:
+        elif op_tok.type == TT_EE:
             result, error = left.get_comparison_eq(right)
-        elif node.op_tok.type == TT_NE:
+        elif op_tok.type == TT_NE:
             result, error = left.get_comparison_ne(right)
-        elif node.op_tok.type == TT_LT:
+        elif op_tok.type == TT_LT:
             result, error = left.get_comparison_lt(right)
-        elif node.op_tok.type == TT_GT:
+        elif op_tok.type == TT_GT:
             result, error = left.get_comparison_gt(right)
-        elif node.op_tok.type == TT_LTE:
+        elif op_tok.type == TT_LTE:
             result, error = left.get_comparison_lte(right)
-        elif node.op_tok.type == TT_GTE:
+        elif op_tok.type == TT_GTE:
             result, error = left.get_comparison_gte(right)
-        elif node.op_tok.type == TT_AMPERSAND:
+        elif op_tok.type == TT_AMPERSAND:
             result, error = left.intersected_with(right)
-        elif node.op_tok.type == TT_CARET:
+        elif op_tok.type == TT_CARET:
             result, error = left.symmetric_diff_with(right)
-        elif node.op_tok.matches(TT_KEYWORD, 'and'):
+        elif op_tok.kind == KW_AND:
             result, error = left.anded_by(right)
-        elif node.op_tok.matches(TT_KEYWORD, 'or'):
+        elif op_tok.kind == KW_OR:
             result, error = left.ored_by(right)
 
-        if error:
-            return res.failure(error)
-        else:
-            return res.success(result.set_pos(node.pos_start, node.pos_end))
+        return result, error
 
     def visit_UnaryOpNode(self, node, context):
         res = RTResult()
@@ -292,8 +330,11 @@ class Interpreter:
         error = None
 
         if node.op_tok.type == TT_MINUS:
+            operand = number
             number, error = number.multed_by(Number(-1))
-        elif node.op_tok.matches(TT_KEYWORD, 'not'):
+            # Same as visit_BinOpNode
+            if not error and operand.shared: number.set_context(context)
+        elif node.op_tok.kind == KW_NOT:
             number, error = number.notted()
 
         if error:
@@ -350,7 +391,6 @@ class Interpreter:
 
     def visit_ForNode(self, node, context):
         res = RTResult()
-        elements = []
 
         start_value = res.register(self.visit(node.start_value_node, context))
         if res.should_return(): return res
@@ -367,24 +407,42 @@ class Interpreter:
             step = 1
 
         i = start_value.value
-
-        while i < end_value.value:
-            context.symbol_table.set(node.var_name_tok.value, Number(i))
+        end = end_value.value
+
+        # Integer bounds and a positive integer step count up exactly like
+        # the general loop below, so they run on a Python range
+        if type(i) is int and type(end) is int and type(step) is int and step > 0:
+            visit = self.visit
+            body_node = node.body_node
+            set_slot = context.symbol_table.set_slot
+            slot = node.slot
+            var_name = node.var_name_tok.value
+
+            for i in range(i, end, step):
+                set_slot(slot, var_name, Number(i))
+
+                res.register(visit(body_node, context))
+                if res.error: return res
+                if res.loop_should_cut: break
+                if res.loop_should_skip: continue
+                if res.func_return_value: return res
+
+            return res.success(Number.null)
+
+        while i < end:
+            context.symbol_table.set_slot(node.slot, node.var_name_tok.value, Number(i))
             i += step
 
-            value = res.register(self.visit(node.body_node, context))
+            res.register(self.visit(node.body_node, context))
             if res.error: return res
             if res.loop_should_cut: break
             if res.loop_should_skip: continue
             if res.func_return_value: return res
 
-            elements.append(value)
-
         return res.success(Number.null)
 
     def visit_ForEachNode(self, node, context):
         res = RTResult()
-        elements = []
 
         iterable = res.register(self.visit(node.iterable_node, context))
         if res.should_return(): return res
@@ -397,21 +455,18 @@ class Interpreter:
             ))
 
         for element in iterable.elements:
-            context.symbol_table.set(node.var_name_tok.value, element)
+            context.symbol_table.set_slot(node.slot, node.var_name_tok.value, element)
 
-            value = res.register(self.visit(node.body_node, context))
+            res.register(self.visit(node.body_node, context))
             if res.error: return res
             if res.loop_should_cut: break
             if res.loop_should_skip: continue
             if res.func_return_value: return res
 
-            elements.append(value)
-
         return res.success(Number.null)
 
     def visit_WhileNode(self, node, context):
         res = RTResult()
-        elements = []
 
         while True:
             condition = res.register(self.visit(node.condition_node, context))
@@ -420,32 +475,25 @@ class Interpreter:
             if not condition.is_true():
                 break
 
-            value = res.register(self.visit(node.body_node, context))
+            res.register(self.visit(node.body_node, context))
             if res.error: return res
             if res.loop_should_cut: break
             if res.loop_should_skip: continue
             if res.func_return_value: return res
 
-            elements.append(value)
-
         return res.success(Number.null)
 
     def visit_DoWhileNode(self, node, context):
         res = RTResult()
-        elements = []
 
         while True:
             # Execute body first (this is the key difference from while loop)
-            value = res.register(self.visit(node.body_node, context))
+            res.register(self.visit(node.body_node, context))
             if res.error: return res
             if res.loop_should_cut: break
             if res.func_return_value: return res
-            
-            # Skip still adds the value before continuing
-            if not res.loop_should_skip:
-                elements.append(value)
 
-            # Then check condition
+            # Then check condition (also after a skip)
             condition = res.register(self.visit(node.condition_node, context))
             if res.should_return(): return res
 
@@ -460,10 +508,10 @@ class Interpreter:
         func_name = node.var_name_tok.value if node.var_name_tok else None
         body_node = node.body_node
         arg_names = [arg_name.value for arg_name in node.arg_name_toks]
-        func_value = Function(func_name, body_node, arg_names).set_context(context).set_pos(node.pos_start, node.pos_end)
+        func_value = Function(func_name, body_node, arg_names, scope=node.scope).set_context(context).set_pos(node.pos_start, node.pos_end)
 
         if node.var_name_tok:
-            context.symbol_table.set(func_name, func_value)
+            context.symbol_table.set_slot(node.slot, func_name, func_value)
 
         return res.success(func_value)
 
@@ -474,31 +522,74 @@ class Interpreter:
         func_name = "<lambda>"
         body_node = node.body_node
         arg_names = [arg_name.value for arg_name in node.arg_name_toks]
-        func_value = Function(func_name, body_node, arg_names).set_context(context).set_pos(node.pos_start, node.pos_end)
+        func_value = Function(func_name, body_node, arg_names, scope=node.scope).set_context(context).set_pos(node.pos_start, node.pos_end)
 
         return res.success(func_value)
 
-    def visit_CallNode(self, node, context):
+    def visit_CallNode(self, node, context, tail=False):
         res = RTResult()
         args = []
 
         value_to_call = res.register(self.visit(node.node_to_call, context))
         if res.should_return(): return res
-        value_to_call = value_to_call.copy().set_pos(node.pos_start, node.pos_end)
+
+        # Functions this interpreter runs are called in place instead of
+        # through a positioned copy; their context is read before the
+        # arguments run, as the copy would have been made then
+        func = value_to_call if type(value_to_call) is Function and value_to_call.body_code is None and value_to_call.body_bytecode is None else None
+        if func is not None:
+            parent = func.context
+        else:
+            callee = value_to_call
+            value_to_call = callee.copy().set_pos(node.pos_start, node.pos_end)
+            # A shared number has no context of its own to report the failed call from
+            if callee.shared: value_to_call.set_context(context)
 
         for arg_node in node.arg_nodes:
             args.append(res.register(self.visit(arg_node, context)))
             if res.should_return(): return res
 
-        return_value = res.register(value_to_call.execute(args))
+        if func is not None and len(args) == len(func.arg_names):
+            # A tail call is left for the running call_function to make
+            if tail: return res.success(TailCall(func, args, parent, node.pos_start))
+            return_value = res.register(self.call_function(func, args, parent, node.pos_start))
+        else:
+            if func is not None:
+                # Let Function.execute report the wrong argument count
+                value_to_call = func.copy().set_pos(node.pos_start, node.pos_end).set_context(parent)
+            return_value = res.register(value_to_call.execute(args))
         if res.should_return(): return res
         return_value = return_value.copy().set_pos(node.pos_start, node.pos_end).set_context(context)
         return res.success(return_value)
 
+    def call_function(self, func, args, parent, entry_pos):
+        """Run the body of a Function with the right number of args in a new call context"""
+        res = RTResult()
+        elided_frames = 0
+
+        while True:
+            exec_ctx = func.new_call_context(parent, entry_pos)
+            if elided_frames: exec_ctx.elided_frames = elided_frames
+            func.bind_args(args, exec_ctx)
+
+            value = res.register(self.visit(func.body_node, exec_ctx))
+            if res.should_return() and res.func_return_value is None: return res
+
+            # The body ended in a tail call: run the callee in place of this frame
+            tail_call = res.func_return_value
+            if type(tail_call) is not TailCall: break
+            func, args, parent, entry_pos = tail_call.func, tail_call.args, tail_call.parent, tail_call.entry_pos
+            elided_frames += 1
+
+        return res.success(res.func_return_value or value or Number.null)
+
     def visit_ReturnNode(self, node, context):
         res = RTResult()
 
-        if node.node_to_return:
+        if node.tail_call:
+            value = res.register(self.visit_CallNode(node.node_to_return, context, True))
+            if res.should_return(): return res
+        elif node.node_to_return:
             value = res.register(self.visit(node.node_to_return, context))
             if res.should_return(): return res
         else:
@@ -521,6 +612,12 @@ class Interpreter:
         index = res.register(self.visit(node.index_node, context))
         if res.should_return(): return res
 
+        return self.index_collection(node, context, collection, index)
+
+    def index_collection(self, node, context, collection, index):
+        """Element of collection at index for a ListAccessNode"""
+        res = RTResult()
+
         # Handle list access
         if isinstance(collection, List):
             if not isinstance(index, Number):
@@ -531,7 +628,7 @@ class Interpreter:
                 ))
 
             try:
-                element = collection.elements[int(index.value)]
+                element = collection.element_at(int(index.value))
                 return res.success(element)
             except:
                 return res.failure(RTError(
@@ -543,6 +640,8 @@ class Interpreter:
         # Handle dictionary access
         elif isinstance(collection, Dict):
             result, error = collection.dived_by(index)
+            if error and index.shared:
+                result, error = collection.dived_by(placed(index, node.index_node.pos_start, node.index_node.pos_end, context))
             if error:
                 return res.failure(error)
             return res.success(result)
@@ -575,7 +674,7 @@ class Interpreter:
         
         # If an error variable name was provided, bind it to the symbol table
         if node.error_var_name:
-            context.symbol_table.set(node.error_var_name.value, error_value)
+            context.symbol_table.set_slot(node.slot, node.error_var_name.value, error_value)
         
         # Execute the handle body
         handle_result = res.register(self.visit(node.handle_body, context))
@@ -590,8 +689,6 @@ class Interpreter:
         from errors.module_not_found_error import ModuleNotFoundError
         from errors.circular_import_error import CircularImportError
         from module import Module
-        from lexer import Lexer
-        from parser import Parser
         from context import Context
         
         module_name = node.module_name_tok.value
@@ -637,9 +734,8 @@ class Interpreter:
             module_loader.begin_loading(module_path)
             
             try:
-                # Tokenize module source
-                lexer = Lexer(module_path, source)
-                tokens, error = lexer.make_tokens()
+                # Tokenize and parse module source (or reuse its cached AST)
+                module_ast, error = module_loader.compile_module(module_path, source)
                 if error:
                     module_loader.end_loading(module_path)
                     return res.failure(RTError(
@@ -648,17 +744,6 @@ class Interpreter:
                         context
                     ))
                 
-                # Parse module
-                parser = Parser(tokens)
-                ast = parser.parse()
-                if ast.error:
-                    module_loader.end_loading(module_path)
-                    return res.failure(RTError(
-                        node.pos_start, node.pos_end,
-                        f"Error in module '{module_name}': {ast.error.as_string()}",
-                        context
-                    ))
-                
                 # Create module context with its own symbol table
                 # Inherit global symbols but isolate module-specific definitions
                 from entry import global_symbol_table
@@ -667,7 +752,7 @@ class Interpreter:
                 module_context.display_name = module_path
                 
                 # Execute module
-                module_result = self.visit(ast.node, module_context)
+                module_result = self.execute_module(module_ast, module_context)
                 module_loader.end_loading(module_path)
                 
                 if module_result.error:
@@ -721,6 +806,14 @@ class Interpreter:
         
         return res.success(Number.null)
 
+    def execute_module(self, module_ast, module_context):
+        """Run the AST of an imported module in its own context"""
+        if options.RESOLVE == 'on':
+            resolve(module_ast)
+        if options.TAIL_CALLS == 'on':
+            mark_tail_calls(module_ast)
+        return self.visit(module_ast, module_context)
+
     def visit_ShareNode(self, node, context):
         """Handle share (export) statements."""
         res = RTResult()
@@ -745,4 +838,29 @@ class Interpreter:
             
             context._exports.add(item_name)
         
-        return res.success(Number.null)
\ No newline at end of file
+        return res.success(Number.null)
+
+
+# options.CONTROL_FLOW -> interpreter; they keep no state, so calls and runs share one
+interpreters = {}
+
+
+def make_interpreter():
+    """The tree interpreter for options.CONTROL_FLOW ('result' or 'exceptions')"""
+    interpreter = interpreters.get(options.CONTROL_FLOW)
+    if interpreter is None:
+        if options.CONTROL_FLOW == 'exceptions':
+            # Import here to avoid circular dependency
+            from signal_interpreter import SignalInterpreter
+            interpreter = SignalInterpreter()
+        else:
+            interpreter = Interpreter()
+        interpreters[options.CONTROL_FLOW] = interpreter
+    return interpreter
+
+
+def make_comprehension_table(node, context):
+    """Symbol table of a list comprehension's own scope"""
+    if node.scope is None:
+        return SymbolTable(context.symbol_table)
+    return SlotTable(node.scope, context.symbol_table)
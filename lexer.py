@@ -1,28 +1,38 @@
 from errors.illegal_character import IllegalCharError
-from position import Position
-from tokens import KEYWORDS, TT_AMPERSAND, TT_ARROW, TT_AT, TT_CARET, TT_COLON, TT_COMMA, TT_DIV, TT_EE, TT_EOF, TT_FLOAT, TT_GT, TT_GTE, TT_IDENTIFIER, TT_INT, TT_KEYWORD, TT_LANGLE, TT_LCURLY, TT_LPAREN, TT_LSETBRACE, TT_LSQUARE, TT_LT, TT_LTE, TT_MINUS, TT_MOD, TT_MUL, TT_NE, TT_NEWLINE, TT_PLUS, TT_RANGLE, TT_RCURLY, TT_REGEX, TT_RPAREN, TT_RSETBRACE, TT_RSQUARE, TT_STRING, Token
+from position import Position, SourceFile
+from tokens import KEYWORD_IDS, TT_AMPERSAND, TT_ARROW, TT_AT, TT_CARET, TT_COLON, TT_COMMA, TT_DIV, TT_EE, TT_EOF, TT_FLOAT, TT_GT, TT_GTE, TT_IDENTIFIER, TT_INT, TT_KEYWORD, TT_LANGLE, TT_LCURLY, TT_LPAREN, TT_LSETBRACE, TT_LSQUARE, TT_LT, TT_LTE, TT_MINUS, TT_MOD, TT_MUL, TT_NE, TT_NEWLINE, TT_PLUS, TT_RANGLE, TT_RCURLY, TT_REGEX, TT_RPAREN, TT_RSETBRACE, TT_RSQUARE, TT_STRING, Token
 from constants import DIGITS, LETTERS, LETTERS_DIGITS
+import options
 
 
 class Lexer:
     def __init__(self, fn, text):
         self.fn = fn
         self.text = text
-        self.pos = Position(-1, 0, -1, fn, text)
+        self.source = SourceFile(fn, text)
+        self.idx = -1
         self.current_char = None
         self.advance()
+
+    @property
+    def pos(self):
+        return Position(self.idx, self.source)
+
+    @pos.setter
+    def pos(self, pos):
+        self.idx = pos.idx
     
     def advance(self):
-        self.pos.advance(self.current_char)
-        self.current_char = self.text[self.pos.idx] if self.pos.idx < len(self.text) else None
+        self.idx += 1
+        self.current_char = self.text[self.idx] if self.idx < len(self.text) else None
 
     def peek(self, offset=1):
-        peek_idx = self.pos.idx + offset
+        peek_idx = self.idx + offset
         return self.text[peek_idx] if peek_idx < len(self.text) else None
 
     def peek_word(self):
         """Peek ahead and return the next word (identifier/keyword) after current position"""
-        idx = self.pos.idx
+        idx = self.idx
         # Skip whitespace
         while idx < len(self.text) and self.text[idx] in ' \t':
             idx += 1
@@ -219,7 +229,7 @@ class Lexer:
         if id_str == 'r' and self.current_char in ['"', "'"]:
             # Restore position to before 'r'
             self.pos = pos_start
-            self.current_char = self.text[self.pos.idx] if self.pos.idx < len(self.text) else None
+            self.current_char = self.text[self.idx] if self.idx < len(self.text) else None
             token, error = self.make_regex()
             if error:
                 return error
@@ -246,16 +256,16 @@ class Lexer:
                     temp_str = temp_str + ' ' + next_word
                     
                     # Check if this combination is a keyword
-                    if temp_str in KEYWORDS:
+                    if temp_str in KEYWORD_IDS:
                         return Token(TT_KEYWORD, temp_str, pos_start, self.pos)
                 else:
                     break
             
             # Not a multi-word keyword, restore position
             self.pos = saved_pos
-            self.current_char = self.text[self.pos.idx] if self.pos.idx < len(self.text) else None
+            self.current_char = self.text[self.idx] if self.idx < len(self.text) else None
 
-        tok_type = TT_KEYWORD if id_str in KEYWORDS else TT_IDENTIFIER
+        tok_type = TT_KEYWORD if id_str in KEYWORD_IDS else TT_IDENTIFIER
         return Token(tok_type, id_str, pos_start, self.pos)
 
     def make_not_equals(self):
@@ -296,7 +306,7 @@ class Lexer:
         next_char = self.current_char
         
         # Handle whitespace
-        temp_idx = self.pos.idx
+        temp_idx = self.idx
         while temp_idx < len(self.text) and self.text[temp_idx] in ' \t':
             temp_idx += 1
         
@@ -409,4 +419,13 @@ class Lexer:
         else:
             # Single line comment
             while self.current_char is not None and self.current_char != '\n':
-                self.advance()
\ No newline at end of file
+                self.advance()
+
+
+def make_lexer(fn, text):
+    """Create the lexer selected by options.LEXER_MODE ('table' or 'char')"""
+    if options.LEXER_MODE == 'char':
+        return Lexer(fn, text)
+    # Import here to avoid circular dependency
+    from table_lexer import TableLexer
+    return TableLexer(fn, text)
@@ -4,6 +4,8 @@ Handles finding, loading, and caching modules.
 """
 
 import os
+import ast_cache
+import options
 from module_config import get_module_search_paths, MODULE_EXTENSION
 
 
@@ -58,6 +60,39 @@ class ModuleLoader:
         except Exception as e:
             return None, f"Failed to read module file: {str(e)}"
     
+    def compile_module(self, module_path, source):
+        """
+        Get the AST of a module, from the on-disk cache when it is up to date.
+        
+        Args:
+            module_path: Path to the module file
+            source: Module source code
+        
+        Returns:
+            Tuple of (ast_node, None) on success or (None, error) on a lexing/parsing error
+        """
+        node = ast_cache.load_ast(module_path, source)
+        if node is not None:
+            return node, None
+
+        # Import here to avoid circular dependency
+        from lexer import make_lexer
+        from optimizer import optimize
+        from parser import make_parser
+
+        tokens, error = make_lexer(module_path, source).make_tokens()
+        if error: return None, error
+
+        ast = make_parser(tokens).parse()
+        if ast.error: return None, ast.error
+
+        node = ast.node
+        if options.OPTIMIZE == 'on':
+            node = optimize(node)
+
+        ast_cache.store_ast(module_path, source, node)
+        return node, None
+    
     def is_loading(self, module_path):
         """Check if a module is currently being loaded (circular import detection)."""
         return module_path in self.loading_stack
@@ -6,3 +6,5 @@ class AttemptHandleNode:
         
         self.pos_start = self.attempt_body.pos_start
         self.pos_end = self.handle_body.pos_end
+        # Slot of the error variable in its function's frame, set by resolver.py
+        self.slot = None
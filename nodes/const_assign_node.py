@@ -3,4 +3,6 @@ class ConstAssignNode:
         self.const_name_tok = const_name_tok
         self.value_node = value_node
         self.pos_start = self.value_node.pos_start
-        self.pos_end = self.const_name_tok.pos_end
\ No newline at end of file
+        self.pos_end = self.const_name_tok.pos_end
+        # Slot of the constant in its function's frame, set by resolver.py
+        self.slot = None
\ No newline at end of file
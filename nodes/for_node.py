@@ -6,4 +6,6 @@ class ForNode:
         self.step_value_node = step_value_node
         self.body_node = body_node
         self.pos_start = self.var_name_tok.pos_start
-        self.pos_end = self.body_node.pos_end
\ No newline at end of file
+        self.pos_end = self.body_node.pos_end
+        # Slot of the loop variable in its function's frame, set by resolver.py
+        self.slot = None
\ No newline at end of file
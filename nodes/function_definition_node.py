@@ -11,4 +11,7 @@ class FuncDefNode:
         else:
             self.pos_start = self.body_node.pos_start
         
-        self.pos_end = self.body_node.pos_end
\ No newline at end of file
+        self.pos_end = self.body_node.pos_end
+        # Slot of the function name and Scope of the body, set by resolver.py
+        self.slot = None
+        self.scope = None
\ No newline at end of file
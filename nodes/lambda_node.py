@@ -4,6 +4,8 @@ class LambdaNode:
         self.body_node = body_node
         self.pos_start = pos_start
         self.pos_end = pos_end
+        # Scope of the body, set by resolver.py
+        self.scope = None
     
     def __repr__(self):
         return f'LambdaNode({self.arg_name_toks}, {self.body_node})'
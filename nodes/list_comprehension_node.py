@@ -17,3 +17,6 @@ class ListComprehensionNode:
         
         self.pos_start = pos_start
         self.pos_end = pos_end
+        # Scope of the comprehension and slot of each clause variable, set by resolver.py
+        self.scope = None
+        self.clause_slots = None
@@ -1,8 +1,15 @@
 class NumberNode:
     def __init__(self, tok):
         self.tok = tok
-        self.pos_start = self.tok.pos_start
-        self.pos_end = self.tok.pos_end
+
+    # Positions are resolved from the token on demand instead of being stored
+    @property
+    def pos_start(self):
+        return self.tok.pos_start
+
+    @property
+    def pos_end(self):
+        return self.tok.pos_end
 
     def __repr__(self):
         return f'{self.tok}'
\ No newline at end of file
@@ -2,4 +2,6 @@ class ReturnNode:
     def __init__(self, node_to_return, pos_start, pos_end):
         self.node_to_return = node_to_return
         self.pos_start = pos_start
-        self.pos_end = pos_end
\ No newline at end of file
+        self.pos_end = pos_end
+        # True for a 'give f(...)' that can replace its function's frame, set by tail_calls.py
+        self.tail_call = False
@@ -1,5 +1,14 @@
 class VarAccessNode:
     def __init__(self, var_name_tok):
         self.var_name_tok = var_name_tok
-        self.pos_start = self.var_name_tok.pos_start
-        self.pos_end = self.var_name_tok.pos_end
\ No newline at end of file
+        # (depth, slot) of the variable read, set by resolver.py
+        self.address = None
+
+    # Positions are resolved from the token on demand instead of being stored
+    @property
+    def pos_start(self):
+        return self.var_name_tok.pos_start
+
+    @property
+    def pos_end(self):
+        return self.var_name_tok.pos_end
\ No newline at end of file
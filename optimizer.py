@@ -0,0 +1,254 @@
+"""
+AST optimization pass for UTTR.
+Runs between parsing and interpretation and rewrites the tree in place:
+- folds arithmetic, comparisons, logic and string concatenation whose
+  operands are literals into a single literal node
+- propagates 'keep' constants into the places that read them
+Folding evaluates the operation with the runtime value classes, so results
+are exactly what the interpreter would compute. Operations that fail
+(division by zero, illegal operations) are left in the tree and still
+report their error at run time, at the original location. Folded and
+propagated literals keep the source span of the code they replace.
+"""
+
+from nodes.binary_operator_node import BinOpNode
+from nodes.const_assign_node import ConstAssignNode
+from nodes.for_each_node import ForEachNode
+from nodes.for_node import ForNode
+from nodes.function_definition_node import FuncDefNode
+from nodes.import_node import ImportNode
+from nodes.lambda_node import LambdaNode
+from nodes.list_comprehension_node import ListComprehensionNode
+from nodes.list_node import ListNode
+from nodes.attempt_handle_node import AttemptHandleNode
+from nodes.number_node import NumberNode
+from nodes.string_node import StringNode
+from nodes.unary_operator_node import UnaryOpNode
+from nodes.var_access_node import VarAccessNode
+from nodes.var_assign_node import VarAssignNode
+from tokens import KW_AND, KW_NOT, KW_OR, TT_DIV, TT_EE, TT_FLOAT, TT_GT, TT_GTE, TT_INT, TT_LT, TT_LTE, TT_MINUS, TT_MOD, TT_MUL, TT_NE, TT_PLUS, TT_STRING, Token
+from values.number_value import Number
+from values.string_value import String
+
+# Value method used by Interpreter.visit_BinOpNode for each foldable operator
+FOLDABLE_BINARY_OPS = {
+    TT_PLUS: 'added_to',
+    TT_MINUS: 'subbed_by',
+    TT_MUL: 'multed_by',
+    TT_DIV: 'dived_by',
+    TT_MOD: 'modded_by',
+    TT_EE: 'get_comparison_eq',
+    TT_NE: 'get_comparison_ne',
+    TT_LT: 'get_comparison_lt',
+    TT_GT: 'get_comparison_gt',
+    TT_LTE: 'get_comparison_lte',
+    TT_GTE: 'get_comparison_gte',
+    KW_AND: 'anded_by',
+    KW_OR: 'ored_by',
+}
+
+# Larger folded strings are left to be built at run time
+MAX_FOLDED_STRING = 1024
+
+# Reading this name may rebind globals behind the optimizer's back
+DYNAMIC_BINDERS = frozenset(['run'])
+
+# Attribute names of each node class, read from its first instance (see node_fields)
+NODE_FIELDS = {}
+
+
+def node_fields(node):
+    """
+    Attribute names of an AST node; empty for tokens and plain values.
+    Touching __dict__ gives a node a real dict, which makes every later
+    attribute read on it slower for the interpreter, so only the first
+    object of each class is inspected and its names are reused for the rest.
+    """
+    fields = NODE_FIELDS.get(type(node))
+    if fields is None:
+        try:
+            fields = tuple(vars(node))
+        except TypeError:
+            fields = ()
+        NODE_FIELDS[type(node)] = fields
+    return fields
+
+
+def optimize(node, propagate=True):
+    """
+    Optimize the AST of a whole file and return its new root.
+    propagate=False only folds (used for REPL lines, which can be rebound by
+    later input).
+    """
+    optimizer = Optimizer()
+    try:
+        if propagate:
+            optimizer.collect_bindings(node)
+        return optimizer.optimize_program(node)
+    except RecursionError:
+        # Every rewrite is valid on its own, so a partly optimized tree is
+        # still correct; the interpreter reports deep nesting if it matters
+        return node
+
+
+class Optimizer:
+    def __init__(self):
+        self.binding_counts = {}
+        self.can_propagate = False
+        # Constant name -> (literal value, source offset after which it may be used)
+        self.constants = {}
+
+    def collect_bindings(self, root):
+        """Count how often each name is bound anywhere in the file"""
+        self.can_propagate = True
+        counts = self.binding_counts
+        stack = [root]
+
+        while stack:
+            node = stack.pop()
+            if isinstance(node, (list, tuple)):
+                stack.extend(node)
+                continue
+            if not node_fields(node):
+                continue
+
+            for tok in self.bound_name_toks(node):
+                counts[tok.value] = counts.get(tok.value, 0) + 1
+
+            if isinstance(node, ImportNode) and node.items is None:
+                # 'bring in module' may bind any name
+                self.can_propagate = False
+            elif isinstance(node, VarAccessNode) and node.var_name_tok.value in DYNAMIC_BINDERS:
+                self.can_propagate = False
+
+            stack.extend(getattr(node, name) for name in node_fields(node))
+
+    def bound_name_toks(self, node):
+        """Name tokens a node binds when it runs"""
+        if isinstance(node, VarAssignNode):
+            return [node.var_name_tok]
+        if isinstance(node, ConstAssignNode):
+            return [node.const_name_tok]
+        if isinstance(node, (ForNode, ForEachNode)):
+            return [node.var_name_tok]
+        if isinstance(node, FuncDefNode):
+            return ([node.var_name_tok] if node.var_name_tok else []) + list(node.arg_name_toks)
+        if isinstance(node, LambdaNode):
+            return list(node.arg_name_toks)
+        if isinstance(node, ListComprehensionNode):
+            return [clause[0] for clause in node.comprehension_clauses]
+        if isinstance(node, AttemptHandleNode):
+            return [node.error_var_name] if node.error_var_name else []
+        if isinstance(node, ImportNode) and node.items is not None:
+            return [alias_tok or item_tok for item_tok, alias_tok in node.items]
+        return []
+
+    def optimize_program(self, root):
+        if not isinstance(root, ListNode):
+            return self.optimize_node(root)
+
+        # Top-level statements run in order, so a 'keep' seen here is bound
+        # before any later statement executes
+        for i, statement in enumerate(root.element_nodes):
+            statement = self.optimize_node(statement)
+            root.element_nodes[i] = statement
+
+            if isinstance(statement, ConstAssignNode):
+                self.record_constant(statement)
+        return root
+
+    def record_constant(self, node):
+        name = node.const_name_tok.value
+        if not self.can_propagate or self.binding_counts.get(name) != 1:
+            return
+        if isinstance(node.value_node, (NumberNode, StringNode)):
+            self.constants[name] = (node.value_node.tok.value, node.const_name_tok.idx_end)
+
+    def optimize_node(self, node):
+        if isinstance(node, (list, tuple)):
+            items = [self.optimize_node(item) for item in node]
+            return items if isinstance(node, list) else tuple(items)
+        if not node_fields(node) or isinstance(node, (NumberNode, StringNode)):
+            return node
+
+        for name in node_fields(node):
+            if name in ('pos_start', 'pos_end'):
+                continue
+            value = getattr(node, name)
+            new_value = self.optimize_node(value)
+            if new_value is not value:
+                setattr(node, name, new_value)
+
+        if isinstance(node, VarAccessNode):
+            return self.propagate_constant(node)
+        if isinstance(node, BinOpNode):
+            return self.fold_binary(node)
+        if isinstance(node, UnaryOpNode):
+            return self.fold_unary(node)
+        return node
+
+    def propagate_constant(self, node):
+        tok = node.var_name_tok
+        constant = self.constants.get(tok.value)
+        if constant is None: return node
+
+        value, bound_after = constant
+        if tok.idx_start < bound_after: return node
+        return self.make_literal(value, tok.pos_start, tok.pos_end) or node
+
+    def fold_binary(self, node):
+        method_name = FOLDABLE_BINARY_OPS.get(node.op_tok.kind)
+        left = self.literal_value(node.left_node)
+        right = self.literal_value(node.right_node)
+        if method_name is None or left is None or right is None:
+            return node
+
+        method = getattr(left, method_name, None)
+        if method is None: return node
+        # Repeating a string builds the whole result, so check its size first
+        if node.op_tok.type == TT_MUL and isinstance(left, String) and isinstance(right, Number):
+            if len(left.value) * int(right.value) > MAX_FOLDED_STRING: return node
+        try:
+            result, error = method(right)
+        except Exception:
+            return node
+        if error: return node
+
+        return self.make_literal(result.value, node.pos_start, node.pos_end) or node
+
+    def fold_unary(self, node):
+        operand = self.literal_value(node.node)
+        if operand is None: return node
+
+        try:
+            if node.op_tok.type == TT_MINUS:
+                result, error = operand.multed_by(Number(-1))
+            elif node.op_tok.kind == KW_NOT:
+                result, error = operand.notted()
+            else:
+                result, error = operand, None
+        except Exception:
+            return node
+        if error: return node
+
+        return self.make_literal(result.value, node.pos_start, node.pos_end) or node
+
+    def literal_value(self, node):
+        """Runtime value of a literal node, or None"""
+        if isinstance(node, NumberNode):
+            return Number(node.tok.value)
+        if isinstance(node, StringNode):
+            return String(node.tok.value)
+        return None
+
+    def make_literal(self, value, pos_start, pos_end):
+        """Literal node for value spanning pos_start..pos_end, or None if value has no literal form"""
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, int):
+            return NumberNode(Token(TT_INT, value, pos_start, pos_end))
+        if isinstance(value, float):
+            return NumberNode(Token(TT_FLOAT, value, pos_start, pos_end))
+        if isinstance(value, str) and len(value) <= MAX_FOLDED_STRING:
+            return StringNode(Token(TT_STRING, value, pos_start, pos_end))
+        return None
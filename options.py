@@ -0,0 +1,72 @@
+"""
+Runtime options for the UTTR interpreter.
+Selects between interchangeable implementations of the pipeline stages.
+Every option can be overridden with an environment variable.
+"""
+
+import os
+
+
+def _call_depth(text, default=10000):
+    """Positive integer in text, or default if it is not one"""
+    try:
+        depth = int(text)
+    except ValueError:
+        return default
+    return depth if depth >= 1 else default
+
+
+# Tokenizer used by entry.run and module imports:
+#   'table' - regex/dispatch-table scanner (table_lexer.TableLexer)
+#   'char'  - the original character-at-a-time scanner (lexer.Lexer)
+LEXER_MODE = os.environ.get('UTTR_LEXER', 'table')
+
+# Expression parser used by entry.run and module imports:
+#   'pratt'   - precedence-table parser (pratt_parser.PrattParser)
+#   'descent' - the original one-method-per-precedence-level parser (parser.Parser)
+EXPR_PARSER = os.environ.get('UTTR_EXPR_PARSER', 'pratt')
+
+# On-disk cache of parsed module ASTs (.uttrc files, see ast_cache.py):
+#   'on'  - reuse cached ASTs for 'bring' and run() when the source is unchanged
+#   'off' - always lex and parse from source
+AST_CACHE = os.environ.get('UTTR_AST_CACHE', 'on')
+
+# Directory for .uttrc files; empty means the user's cache directory
+# ($XDG_CACHE_HOME/uttr, ~/.cache/uttr or %LOCALAPPDATA%\uttr)
+AST_CACHE_DIR = os.environ.get('UTTR_AST_CACHE_DIR', '')
+
+# AST optimization pass run after parsing (see optimizer.py):
+#   'on'  - fold constant expressions and propagate 'keep' constants
+#   'off' - run the tree exactly as parsed
+OPTIMIZE = os.environ.get('UTTR_OPTIMIZE', 'on')
+
+# Variable resolution pass run before the tree engine (see resolver.py):
+#   'on'  - function and comprehension variables live in list slots read by (depth, slot) address
+#   'off' - every variable is looked up by name through the chain of symbol tables
+RESOLVE = os.environ.get('UTTR_RESOLVE', 'on')
+
+# Tail call pass run before the tree engine (see tail_calls.py):
+#   'on'  - 'give f(...)' directly in a function body runs f in place of the caller's frame
+#   'off' - every call nests a new frame
+TAIL_CALLS = os.environ.get('UTTR_TAIL_CALLS', 'on')
+
+# Deepest stack of frames the bytecode VM runs before stopping the program
+# with a runtime error (its frames live on the heap, not the Python stack);
+# values that are not a positive integer fall back to 10000
+MAX_CALL_DEPTH = _call_depth(os.environ.get('UTTR_MAX_CALL_DEPTH', '10000'))
+
+# How shell.py runs a file:
+#   'batch'  - parse the whole file into one ListNode, then run it, keeping every statement's value
+#   'stream' - parse and run one top-level statement at a time, keeping only the last value
+PROGRAM_MODE = os.environ.get('UTTR_PROGRAM_MODE', 'batch')
+
+# Execution engine used by entry.run, run() and module imports:
+#   'tree'    - AST-walking visitor (interpreter.Interpreter)
+#   'closure' - AST compiled once into Python closures (closure_compiler.ClosureCompiler)
+#   'vm'      - AST compiled to bytecode and run on a stack machine (vm.VM)
+ENGINE = os.environ.get('UTTR_ENGINE', 'tree')
+
+# How the tree engine passes 'give', 'cut', 'skip' and runtime errors upwards:
+#   'result'     - every visit returns an RTResult whose flags callers check (interpreter.Interpreter)
+#   'exceptions' - values are returned directly, control flow is raised (signal_interpreter.SignalInterpreter)
+CONTROL_FLOW = os.environ.get('UTTR_CONTROL_FLOW', 'result')
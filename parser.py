@@ -29,7 +29,21 @@ from nodes.var_access_node import VarAccessNode
 from nodes.var_assign_node import VarAssignNode
 from nodes.while_node import WhileNode
 from parse_result import ParseResult
-from tokens import TT_AMPERSAND, TT_ARROW, TT_AT, TT_CARET, TT_COLON, TT_COMMA, TT_DIV, TT_EE, TT_EOF, TT_FLOAT, TT_GT, TT_GTE, TT_IDENTIFIER, TT_INT, TT_KEYWORD, TT_LANGLE, TT_LCURLY, TT_LPAREN, TT_LSETBRACE, TT_LSQUARE, TT_LT, TT_LTE, TT_MINUS, TT_MOD, TT_MUL, TT_NE, TT_NEWLINE, TT_PLUS, TT_RANGLE, TT_RCURLY, TT_REGEX, TT_RPAREN, TT_RSETBRACE, TT_RSQUARE, TT_STRING, Token
+from tokens import KW_AND, KW_AS, KW_AS_LONG_AS, KW_ATTEMPT, KW_BRING, KW_CHECK, KW_CUT, KW_CYCLE, KW_DEFAULT, KW_EACH, KW_END, KW_FALSE, KW_FROM, KW_GIVE, KW_HANDLE, KW_IN, KW_KEEP, KW_LAMBDA, KW_MAKE_FUNCTION, KW_NOT, KW_OR, KW_OTHERWISE, KW_PUT, KW_REPEAT_WHILE, KW_SHARE, KW_SHOW, KW_SKIP, KW_STEP, KW_THROUGH, KW_TO, KW_TRUE, KW_WHEN, KW_WHERE, KW_WHETHER, TT_AMPERSAND, TT_ARROW, TT_AT, TT_CARET, TT_COLON, TT_COMMA, TT_DIV, TT_EE, TT_EOF, TT_FLOAT, TT_GT, TT_GTE, TT_IDENTIFIER, TT_INT, TT_LANGLE, TT_LCURLY, TT_LPAREN, TT_LSETBRACE, TT_LSQUARE, TT_LT, TT_LTE, TT_MINUS, TT_MOD, TT_MUL, TT_NE, TT_NEWLINE, TT_PLUS, TT_RANGLE, TT_RCURLY, TT_REGEX, TT_RPAREN, TT_RSETBRACE, TT_RSQUARE, TT_STRING, Token
+import options
+
+
+# Tokens that close a statement block (the caller checks which one it expects)
+BLOCK_END_KINDS = frozenset((TT_EOF, KW_END, KW_OTHERWISE, KW_HANDLE, KW_WHETHER, KW_DEFAULT))
+
+# Tokens that can start an expression (FIRST set of expr)
+EXPR_START_KINDS = frozenset((
+    KW_PUT, KW_KEEP, KW_SHOW, KW_NOT, TT_PLUS, TT_MINUS,
+    TT_INT, TT_FLOAT, TT_STRING, TT_REGEX, TT_IDENTIFIER, KW_TRUE, KW_FALSE,
+    TT_LPAREN, TT_LSQUARE, TT_LANGLE, TT_LCURLY, TT_LSETBRACE,
+    KW_WHEN, KW_CYCLE, KW_AS_LONG_AS, KW_REPEAT_WHILE, KW_MAKE_FUNCTION,
+    KW_LAMBDA, KW_ATTEMPT, KW_CHECK,
+))
 
 
 class Parser:
@@ -61,6 +75,71 @@ class Parser:
             ))
         return res
 
+    def parse_statements(self):
+        """
+        parse() one top-level statement at a time: yields a ParseResult for
+        each statement as soon as it is parsed, and a failed one for the
+        syntax error that stops parse(), if any.
+        """
+        while self.current_tok.type == TT_NEWLINE:
+            self.advance()
+        if self.current_tok.type == TT_EOF: return
+
+        # Same statement boundaries as statements(); a statement is only
+        # yielded once the token after it is known to end it
+        res = ParseResult()
+        statement = res.register(self.statement())
+        if res.error:
+            yield res
+            return
+        error = self.statement_end_error()
+        if error:
+            yield ParseResult().failure(error)
+            return
+        yield res.success(statement)
+
+        while True:
+            newline_count = 0
+            while self.current_tok.type == TT_NEWLINE:
+                self.advance()
+                newline_count += 1
+
+            if newline_count == 0 or self.current_tok.kind in BLOCK_END_KINDS: break
+
+            res = ParseResult()
+            statement = res.try_register(self.statement())
+            if not statement:
+                self.reverse(res.to_reverse_count)
+                break
+            error = self.statement_end_error()
+            if error:
+                yield ParseResult().failure(error)
+                return
+            yield res.success(statement)
+
+        if self.current_tok.type != TT_EOF:
+            yield ParseResult().failure(InvalidSyntaxError(
+                self.current_tok.pos_start, self.current_tok.pos_end,
+                "Unexpected token"
+            ))
+
+    def statement_end_error(self):
+        """
+        The error parse() reports for the tokens after a top-level statement
+        (anything but newlines followed by a statement, or the end of the
+        file), or None
+        """
+        idx = self.tok_idx
+        if self.tokens[idx].type != TT_EOF:
+            if self.tokens[idx].type == TT_NEWLINE:
+                while self.tokens[idx].type == TT_NEWLINE:
+                    idx += 1
+                if self.tokens[idx].type == TT_EOF or self.tokens[idx].kind not in BLOCK_END_KINDS:
+                    return None
+            tok = self.tokens[idx]
+            return InvalidSyntaxError(tok.pos_start, tok.pos_end, "Unexpected token")
+        return None
+
     def statements(self):
         res = ParseResult()
         statements = []
@@ -82,23 +161,21 @@ class Parser:
         if res.error: return res
         statements.append(statement)
 
-        more_statements = True
-
         while True:
             newline_count = 0
             while self.current_tok.type == TT_NEWLINE:
                 res.register_advancement()
                 self.advance()
                 newline_count += 1
-            if newline_count == 0:
-                more_statements = False
-            
-            if not more_statements: break
+
+            # The block ends at a closing keyword, decided by lookahead alone
+            if newline_count == 0 or self.current_tok.kind in BLOCK_END_KINDS: break
+
             statement = res.try_register(self.statement())
             if not statement:
+                # Leave the offending token for the enclosing construct to report
                 self.reverse(res.to_reverse_count)
-                more_statements = False
-                continue
+                break
             statements.append(statement)
 
         return res.success(ListNode(
@@ -112,31 +189,33 @@ class Parser:
         pos_start = self.current_tok.pos_start.copy()
 
         # Check for 'bring' (import)
-        if self.current_tok.matches(TT_KEYWORD, 'bring'):
+        if self.current_tok.kind == KW_BRING:
             return self.import_expr()
 
         # Check for 'share' (export)
-        if self.current_tok.matches(TT_KEYWORD, 'share'):
+        if self.current_tok.kind == KW_SHARE:
             return self.share_expr()
 
         # Check for 'give' (return)
-        if self.current_tok.matches(TT_KEYWORD, 'give'):
+        if self.current_tok.kind == KW_GIVE:
             res.register_advancement()
             self.advance()
 
-            expr = res.try_register(self.expr())
-            if not expr:
-                self.reverse(res.to_reverse_count)
+            expr = None
+            if self.current_tok.kind in EXPR_START_KINDS:
+                expr = res.try_register(self.expr())
+                if not expr:
+                    self.reverse(res.to_reverse_count)
             return res.success(ReturnNode(expr, pos_start, self.current_tok.pos_start.copy()))
 
         # Check for 'cut' (break)
-        if self.current_tok.matches(TT_KEYWORD, 'cut'):
+        if self.current_tok.kind == KW_CUT:
             res.register_advancement()
             self.advance()
             return res.success(CutNode(pos_start, self.current_tok.pos_start.copy()))
 
         # Check for 'skip' (continue)
-        if self.current_tok.matches(TT_KEYWORD, 'skip'):
+        if self.current_tok.kind == KW_SKIP:
             res.register_advancement()
             self.advance()
             return res.success(SkipNode(pos_start, self.current_tok.pos_start.copy()))
@@ -153,14 +232,14 @@ class Parser:
         res = ParseResult()
 
         # Check for 'put X in Y' (variable assignment)
-        if self.current_tok.matches(TT_KEYWORD, 'put'):
+        if self.current_tok.kind == KW_PUT:
             res.register_advancement()
             self.advance()
 
             value_expr = res.register(self.logic_expr())
             if res.error: return res
 
-            if not self.current_tok.matches(TT_KEYWORD, 'in'):
+            if self.current_tok.kind != KW_IN:
                 return res.failure(InvalidSyntaxError(
                     self.current_tok.pos_start, self.current_tok.pos_end,
                     "Expected 'in'"
@@ -195,14 +274,14 @@ class Parser:
             return res.success(VarAssignNode(var_name, value_expr))
 
         # Check for 'keep X as Y' (constant assignment)
-        if self.current_tok.matches(TT_KEYWORD, 'keep'):
+        if self.current_tok.kind == KW_KEEP:
             res.register_advancement()
             self.advance()
 
             value_expr = res.register(self.logic_expr())
             if res.error: return res
 
-            if not self.current_tok.matches(TT_KEYWORD, 'as'):
+            if self.current_tok.kind != KW_AS:
                 return res.failure(InvalidSyntaxError(
                     self.current_tok.pos_start, self.current_tok.pos_end,
                     "Expected 'as'"
@@ -224,7 +303,7 @@ class Parser:
             return res.success(ConstAssignNode(const_name, value_expr))
 
         # Check for 'show' (print)
-        if self.current_tok.matches(TT_KEYWORD, 'show'):
+        if self.current_tok.kind == KW_SHOW:
             res.register_advancement()
             self.advance()
 
@@ -242,7 +321,7 @@ class Parser:
     def logic_expr(self):
         res = ParseResult()
 
-        if self.current_tok.matches(TT_KEYWORD, 'not'):
+        if self.current_tok.kind == KW_NOT:
             op_tok = self.current_tok
             res.register_advancement()
             self.advance()
@@ -251,7 +330,7 @@ class Parser:
             if res.error: return res
             return res.success(UnaryOpNode(op_tok, node))
 
-        node = res.register(self.bin_op(self.comp_expr, ((TT_KEYWORD, 'and'), (TT_KEYWORD, 'or'))))
+        node = res.register(self.bin_op(self.comp_expr, (KW_AND, KW_OR)))
         
         if res.error:
             return res.failure(InvalidSyntaxError(
@@ -291,6 +370,10 @@ class Parser:
         atom = res.register(self.atom())
         if res.error: return res
 
+        return self.call_suffix(res, atom)
+
+    def call_suffix(self, res, atom):
+        """Parse the argument list or '@' accesses that may follow an atom"""
         if self.current_tok.type == TT_LPAREN:
             res.register_advancement()
             self.advance()
@@ -357,12 +440,12 @@ class Parser:
             self.advance()
             return res.success(VarAccessNode(tok))
 
-        elif tok.matches(TT_KEYWORD, 'true'):
+        elif tok.kind == KW_TRUE:
             res.register_advancement()
             self.advance()
             return res.success(NumberNode(Token(TT_INT, 1, tok.pos_start, tok.pos_end)))
 
-        elif tok.matches(TT_KEYWORD, 'false'):
+        elif tok.kind == KW_FALSE:
             res.register_advancement()
             self.advance()
             return res.success(NumberNode(Token(TT_INT, 0, tok.pos_start, tok.pos_end)))
@@ -402,42 +485,42 @@ class Parser:
             if res.error: return res
             return res.success(set_expr)
 
-        elif tok.matches(TT_KEYWORD, 'when'):
+        elif tok.kind == KW_WHEN:
             if_expr = res.register(self.if_expr())
             if res.error: return res
             return res.success(if_expr)
 
-        elif tok.matches(TT_KEYWORD, 'cycle'):
+        elif tok.kind == KW_CYCLE:
             loop_expr = res.register(self.loop_expr())
             if res.error: return res
             return res.success(loop_expr)
 
-        elif tok.matches(TT_KEYWORD, 'as long as'):
+        elif tok.kind == KW_AS_LONG_AS:
             while_expr = res.register(self.while_expr())
             if res.error: return res
             return res.success(while_expr)
 
-        elif tok.matches(TT_KEYWORD, 'repeat while'):
+        elif tok.kind == KW_REPEAT_WHILE:
             do_while_expr = res.register(self.do_while_expr())
             if res.error: return res
             return res.success(do_while_expr)
 
-        elif tok.matches(TT_KEYWORD, 'make function'):
+        elif tok.kind == KW_MAKE_FUNCTION:
             func_def = res.register(self.func_def())
             if res.error: return res
             return res.success(func_def)
 
-        elif tok.matches(TT_KEYWORD, 'lambda'):
+        elif tok.kind == KW_LAMBDA:
             lambda_expr = res.register(self.lambda_expr())
             if res.error: return res
             return res.success(lambda_expr)
 
-        elif tok.matches(TT_KEYWORD, 'attempt'):
+        elif tok.kind == KW_ATTEMPT:
             attempt_handle_expr = res.register(self.attempt_handle_expr())
             if res.error: return res
             return res.success(attempt_handle_expr)
 
-        elif tok.matches(TT_KEYWORD, 'check'):
+        elif tok.kind == KW_CHECK:
             switch_case_expr = res.register(self.switch_case_expr())
             if res.error: return res
             return res.success(switch_case_expr)
@@ -470,7 +553,7 @@ class Parser:
             if res.error: return res
 
             # Check if this is a list comprehension
-            if self.current_tok.matches(TT_KEYWORD, 'cycle'):
+            if self.current_tok.kind == KW_CYCLE:
                 # This is a list comprehension
                 comprehension_clauses = []
                 
@@ -490,7 +573,7 @@ class Parser:
                 self.advance()
                 
                 # Expect 'in'
-                if not self.current_tok.matches(TT_KEYWORD, 'in'):
+                if self.current_tok.kind != KW_IN:
                     return res.failure(InvalidSyntaxError(
                         self.current_tok.pos_start, self.current_tok.pos_end,
                         "Expected 'in' in list comprehension"
@@ -505,7 +588,7 @@ class Parser:
                 
                 # Parse optional 'where' conditions
                 conditions = []
-                while self.current_tok.matches(TT_KEYWORD, 'where'):
+                while self.current_tok.kind == KW_WHERE:
                     res.register_advancement()
                     self.advance()
                     
@@ -516,7 +599,7 @@ class Parser:
                 comprehension_clauses.append((var_tok, iterable_expr, conditions))
                 
                 # Parse additional cycle clauses
-                while self.current_tok.matches(TT_KEYWORD, 'cycle'):
+                while self.current_tok.kind == KW_CYCLE:
                     res.register_advancement()
                     self.advance()
                     
@@ -532,7 +615,7 @@ class Parser:
                     self.advance()
                     
                     # Expect 'in'
-                    if not self.current_tok.matches(TT_KEYWORD, 'in'):
+                    if self.current_tok.kind != KW_IN:
                         return res.failure(InvalidSyntaxError(
                             self.current_tok.pos_start, self.current_tok.pos_end,
                             "Expected 'in' in list comprehension"
@@ -547,7 +630,7 @@ class Parser:
                     
                     # Parse optional 'where' conditions
                     conditions = []
-                    while self.current_tok.matches(TT_KEYWORD, 'where'):
+                    while self.current_tok.kind == KW_WHERE:
                         res.register_advancement()
                         self.advance()
                         
@@ -747,7 +830,7 @@ class Parser:
         cases = []
         else_case = None
 
-        if not self.current_tok.matches(TT_KEYWORD, 'when'):
+        if self.current_tok.kind != KW_WHEN:
             return res.failure(InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
                 "Expected 'when'"
@@ -777,11 +860,11 @@ class Parser:
             cases.append((condition, statements, True))
 
             # Check for 'otherwise when' or 'otherwise'
-            while self.current_tok.matches(TT_KEYWORD, 'otherwise'):
+            while self.current_tok.kind == KW_OTHERWISE:
                 res.register_advancement()
                 self.advance()
 
-                if self.current_tok.matches(TT_KEYWORD, 'when'):
+                if self.current_tok.kind == KW_WHEN:
                     res.register_advancement()
                     self.advance()
 
@@ -824,7 +907,7 @@ class Parser:
                         else_case = (statements, True)
                     break
 
-            if not self.current_tok.matches(TT_KEYWORD, 'end'):
+            if self.current_tok.kind != KW_END:
                 return res.failure(InvalidSyntaxError(
                     self.current_tok.pos_start, self.current_tok.pos_end,
                     "Expected 'end'"
@@ -842,7 +925,7 @@ class Parser:
     def loop_expr(self):
         res = ParseResult()
 
-        if not self.current_tok.matches(TT_KEYWORD, 'cycle'):
+        if self.current_tok.kind != KW_CYCLE:
             return res.failure(InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
                 "Expected 'cycle'"
@@ -852,7 +935,7 @@ class Parser:
         self.advance()
 
         # Check for 'cycle each item through list' pattern
-        if self.current_tok.matches(TT_KEYWORD, 'each'):
+        if self.current_tok.kind == KW_EACH:
             res.register_advancement()
             self.advance()
 
@@ -866,7 +949,7 @@ class Parser:
             res.register_advancement()
             self.advance()
 
-            if not self.current_tok.matches(TT_KEYWORD, 'through'):
+            if self.current_tok.kind != KW_THROUGH:
                 return res.failure(InvalidSyntaxError(
                     self.current_tok.pos_start, self.current_tok.pos_end,
                     "Expected 'through'"
@@ -894,7 +977,7 @@ class Parser:
                 body = res.register(self.statements())
                 if res.error: return res
 
-                if not self.current_tok.matches(TT_KEYWORD, 'end'):
+                if self.current_tok.kind != KW_END:
                     return res.failure(InvalidSyntaxError(
                         self.current_tok.pos_start, self.current_tok.pos_end,
                         "Expected 'end'"
@@ -916,7 +999,7 @@ class Parser:
         res.register_advancement()
         self.advance()
 
-        if not self.current_tok.matches(TT_KEYWORD, 'from'):
+        if self.current_tok.kind != KW_FROM:
             return res.failure(InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
                 "Expected 'from'"
@@ -928,7 +1011,7 @@ class Parser:
         start_value = res.register(self.logic_expr())
         if res.error: return res
 
-        if not self.current_tok.matches(TT_KEYWORD, 'to'):
+        if self.current_tok.kind != KW_TO:
             return res.failure(InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
                 "Expected 'to'"
@@ -942,7 +1025,7 @@ class Parser:
 
         # Check for optional 'step' keyword
         step_value = None
-        if self.current_tok.matches(TT_KEYWORD, 'step'):
+        if self.current_tok.kind == KW_STEP:
             res.register_advancement()
             self.advance()
             
@@ -965,7 +1048,7 @@ class Parser:
             body = res.register(self.statements())
             if res.error: return res
 
-            if not self.current_tok.matches(TT_KEYWORD, 'end'):
+            if self.current_tok.kind != KW_END:
                 return res.failure(InvalidSyntaxError(
                     self.current_tok.pos_start, self.current_tok.pos_end,
                     "Expected 'end'"
@@ -984,7 +1067,7 @@ class Parser:
     def while_expr(self):
         res = ParseResult()
 
-        if not self.current_tok.matches(TT_KEYWORD, 'as long as'):
+        if self.current_tok.kind != KW_AS_LONG_AS:
             return res.failure(InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
                 "Expected 'as long as'"
@@ -1012,7 +1095,7 @@ class Parser:
             body = res.register(self.statements())
             if res.error: return res
 
-            if not self.current_tok.matches(TT_KEYWORD, 'end'):
+            if self.current_tok.kind != KW_END:
                 return res.failure(InvalidSyntaxError(
                     self.current_tok.pos_start, self.current_tok.pos_end,
                     "Expected 'end'"
@@ -1031,7 +1114,7 @@ class Parser:
     def do_while_expr(self):
         res = ParseResult()
 
-        if not self.current_tok.matches(TT_KEYWORD, 'repeat while'):
+        if self.current_tok.kind != KW_REPEAT_WHILE:
             return res.failure(InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
                 "Expected 'repeat while'"
@@ -1060,7 +1143,7 @@ class Parser:
             body = res.register(self.statements())
             if res.error: return res
 
-            if not self.current_tok.matches(TT_KEYWORD, 'end'):
+            if self.current_tok.kind != KW_END:
                 return res.failure(InvalidSyntaxError(
                     self.current_tok.pos_start, self.current_tok.pos_end,
                     "Expected 'end'"
@@ -1080,7 +1163,7 @@ class Parser:
     def func_def(self):
         res = ParseResult()
 
-        if not self.current_tok.matches(TT_KEYWORD, 'make function'):
+        if self.current_tok.kind != KW_MAKE_FUNCTION:
             return res.failure(InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
                 "Expected 'make function'"
@@ -1156,7 +1239,7 @@ class Parser:
             body = res.register(self.statements())
             if res.error: return res
 
-            if not self.current_tok.matches(TT_KEYWORD, 'end'):
+            if self.current_tok.kind != KW_END:
                 return res.failure(InvalidSyntaxError(
                     self.current_tok.pos_start, self.current_tok.pos_end,
                     "Expected 'end'"
@@ -1176,7 +1259,7 @@ class Parser:
         res = ParseResult()
         pos_start = self.current_tok.pos_start.copy()
 
-        if not self.current_tok.matches(TT_KEYWORD, 'lambda'):
+        if self.current_tok.kind != KW_LAMBDA:
             return res.failure(InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
                 "Expected 'lambda'"
@@ -1227,7 +1310,7 @@ class Parser:
     def attempt_handle_expr(self):
         res = ParseResult()
 
-        if not self.current_tok.matches(TT_KEYWORD, 'attempt'):
+        if self.current_tok.kind != KW_ATTEMPT:
             return res.failure(InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
                 "Expected 'attempt'"
@@ -1252,7 +1335,7 @@ class Parser:
             attempt_body = res.register(self.statements())
             if res.error: return res
 
-            if not self.current_tok.matches(TT_KEYWORD, 'end'):
+            if self.current_tok.kind != KW_END:
                 return res.failure(InvalidSyntaxError(
                     self.current_tok.pos_start, self.current_tok.pos_end,
                     "Expected 'end'"
@@ -1267,7 +1350,7 @@ class Parser:
                 self.advance()
 
             # Now expect 'handle'
-            if not self.current_tok.matches(TT_KEYWORD, 'handle'):
+            if self.current_tok.kind != KW_HANDLE:
                 return res.failure(InvalidSyntaxError(
                     self.current_tok.pos_start, self.current_tok.pos_end,
                     "Expected 'handle'"
@@ -1278,7 +1361,7 @@ class Parser:
 
             # Check for optional error variable binding: 'as <identifier>'
             error_var_name = None
-            if self.current_tok.matches(TT_KEYWORD, 'as'):
+            if self.current_tok.kind == KW_AS:
                 res.register_advancement()
                 self.advance()
 
@@ -1308,7 +1391,7 @@ class Parser:
                 handle_body = res.register(self.statements())
                 if res.error: return res
 
-                if not self.current_tok.matches(TT_KEYWORD, 'end'):
+                if self.current_tok.kind != KW_END:
                     return res.failure(InvalidSyntaxError(
                         self.current_tok.pos_start, self.current_tok.pos_end,
                         "Expected 'end'"
@@ -1327,7 +1410,7 @@ class Parser:
         attempt_body = res.register(self.statement())
         if res.error: return res
 
-        if not self.current_tok.matches(TT_KEYWORD, 'handle'):
+        if self.current_tok.kind != KW_HANDLE:
             return res.failure(InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
                 "Expected 'handle'"
@@ -1337,7 +1420,7 @@ class Parser:
         self.advance()
 
         error_var_name = None
-        if self.current_tok.matches(TT_KEYWORD, 'as'):
+        if self.current_tok.kind == KW_AS:
             res.register_advancement()
             self.advance()
 
@@ -1370,7 +1453,7 @@ class Parser:
         cases = []
         default_case = None
 
-        if not self.current_tok.matches(TT_KEYWORD, 'check'):
+        if self.current_tok.kind != KW_CHECK:
             return res.failure(InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
                 "Expected 'check'"
@@ -1407,7 +1490,7 @@ class Parser:
             self.advance()
 
         # Parse whether cases
-        while self.current_tok.matches(TT_KEYWORD, 'whether'):
+        while self.current_tok.kind == KW_WHETHER:
             res.register_advancement()
             self.advance()
 
@@ -1447,7 +1530,7 @@ class Parser:
                 self.advance()
 
         # Parse optional default case
-        if self.current_tok.matches(TT_KEYWORD, 'default'):
+        if self.current_tok.kind == KW_DEFAULT:
             res.register_advancement()
             self.advance()
 
@@ -1483,7 +1566,7 @@ class Parser:
             self.advance()
 
         # Expect 'end'
-        if not self.current_tok.matches(TT_KEYWORD, 'end'):
+        if self.current_tok.kind != KW_END:
             return res.failure(InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
                 "Expected 'whether', 'default', or 'end'"
@@ -1502,7 +1585,7 @@ class Parser:
         left = res.register(func_a())
         if res.error: return res
 
-        while self.current_tok.type in ops or (self.current_tok.type, self.current_tok.value) in ops:
+        while self.current_tok.kind in ops:
             op_tok = self.current_tok
             res.register_advancement()
             self.advance()
@@ -1533,7 +1616,7 @@ class Parser:
         items = None  # None means import all
 
         # Check if it's 'bring in module' (full import)
-        if self.current_tok.matches(TT_KEYWORD, 'in'):
+        if self.current_tok.kind == KW_IN:
             res.register_advancement()
             self.advance()
 
@@ -1559,7 +1642,7 @@ class Parser:
 
         # Check for alias
         alias = None
-        if self.current_tok.matches(TT_KEYWORD, 'as'):
+        if self.current_tok.kind == KW_AS:
             res.register_advancement()
             self.advance()
 
@@ -1592,7 +1675,7 @@ class Parser:
 
             # Check for alias
             alias = None
-            if self.current_tok.matches(TT_KEYWORD, 'as'):
+            if self.current_tok.kind == KW_AS:
                 res.register_advancement()
                 self.advance()
 
@@ -1609,7 +1692,7 @@ class Parser:
             items.append((item_name, alias))
 
         # Now expect 'from module'
-        if not self.current_tok.matches(TT_KEYWORD, 'from'):
+        if self.current_tok.kind != KW_FROM:
             return res.failure(InvalidSyntaxError(
                 self.current_tok.pos_start, self.current_tok.pos_end,
                 "Expected 'from'"
@@ -1711,4 +1794,13 @@ class Parser:
             res.register_advancement()
             self.advance()
 
-        return res.success(ShareNode(item_names, pos_start, self.current_tok.pos_start.copy()))
\ No newline at end of file
+        return res.success(ShareNode(item_names, pos_start, self.current_tok.pos_start.copy()))
+
+
+def make_parser(tokens):
+    """Create the parser selected by options.EXPR_PARSER ('pratt' or 'descent')"""
+    if options.EXPR_PARSER == 'descent':
+        return Parser(tokens)
+    # Import here to avoid circular dependency
+    from pratt_parser import PrattParser
+    return PrattParser(tokens)
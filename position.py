@@ -1,20 +1,92 @@
+from bisect import bisect_right
+
+
+class SourceFile:
+    """
+    Source text shared by every token, node and position of one file.
+    Line starts are indexed on first use, so line/column numbers are only
+    computed when an error is actually rendered.
+    """
+    __slots__ = ('fn', 'text', '_line_starts')
+
+    def __init__(self, fn, text):
+        self.fn = fn
+        self.text = text
+        self._line_starts = None
+
+    def __reduce__(self):
+        # The line index is rebuilt on demand after unpickling
+        return (SourceFile, (self.fn, self.text))
+
+    def line_starts(self):
+        if self._line_starts is None:
+            starts = [0]
+            text = self.text
+            idx = text.find('\n')
+            while idx >= 0:
+                starts.append(idx + 1)
+                idx = text.find('\n', idx + 1)
+            self._line_starts = starts
+        return self._line_starts
+
+    def line_col(self, idx):
+        """Line and column of the character at idx"""
+        if idx <= 0:
+            return 0, idx
+        starts = self.line_starts()
+        ln = bisect_right(starts, idx) - 1
+        return ln, idx - starts[ln]
+
+    def end_line_col(self, idx):
+        """Line and column just past the character at idx - 1 (end of a span)"""
+        if idx <= 0:
+            return 0, idx
+        ln, col = self.line_col(idx - 1)
+        return ln, col + 1
+
+
 class Position:
-    def __init__(self, idx, ln, col, fn, ftxt):
+    __slots__ = ('idx', 'source')
+
+    def __init__(self, idx, source):
         self.idx = idx
-        self.ln = ln
-        self.col = col
-        self.fn = fn
-        self.ftxt = ftxt
+        self.source = source
 
-    def advance(self, current_char=None):
-        self.idx += 1
-        self.col += 1
+    def __reduce__(self):
+        return (type(self), (self.idx, self.source))
 
-        if current_char == '\n':
-            self.ln += 1
-            self.col = 0
+    @property
+    def ln(self):
+        return self.source.line_col(self.idx)[0]
 
-        return self
+    @property
+    def col(self):
+        return self.source.line_col(self.idx)[1]
+
+    @property
+    def fn(self):
+        return self.source.fn
+
+    @property
+    def ftxt(self):
+        return self.source.text
 
     def copy(self):
-        return Position(self.idx, self.ln, self.col, self.fn, self.ftxt)
\ No newline at end of file
+        # Positions are immutable, so they can be shared freely
+        return self
+
+
+class EndPosition(Position):
+    """
+    Exclusive end of a token span. It stays on the line of the token's last
+    character, so a NEWLINE token ends on its own line rather than the next.
+    """
+    __slots__ = ()
+
+    @property
+    def ln(self):
+        return self.source.end_line_col(self.idx)[0]
+
+    @property
+    def col(self):
+        return self.source.end_line_col(self.idx)[1]
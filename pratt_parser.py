@@ -0,0 +1,107 @@
+"""
+Precedence-climbing (Pratt) expression parser for UTTR.
+Replaces the chain logic_expr -> comp_expr -> set_expr_op -> arith_expr ->
+term -> factor with one loop driven by a precedence table, so an operand
+costs a couple of Python frames instead of one frame and one ParseResult
+per precedence level. Builds the same BinOpNode/UnaryOpNode trees and
+reports the same errors as Parser.
+"""
+
+from nodes.binary_operator_node import BinOpNode
+from nodes.number_node import NumberNode
+from nodes.string_node import StringNode
+from nodes.unary_operator_node import UnaryOpNode
+from nodes.var_access_node import VarAccessNode
+from errors.invalid_syntax import InvalidSyntaxError
+from parse_result import ParseResult
+from parser import Parser
+from tokens import KW_AND, KW_NOT, KW_OR, TT_AMPERSAND, TT_CARET, TT_DIV, TT_EE, TT_FLOAT, TT_GT, TT_GTE, TT_IDENTIFIER, TT_INT, TT_LT, TT_LTE, TT_MINUS, TT_MOD, TT_MUL, TT_NE, TT_PLUS, TT_STRING
+
+
+# Binding power of each binary operator; all of them are left-associative
+BINARY_PRECEDENCE = {
+    KW_AND: 1, KW_OR: 1,
+    TT_EE: 2, TT_NE: 2, TT_LT: 2, TT_GT: 2, TT_LTE: 2, TT_GTE: 2,
+    TT_AMPERSAND: 3, TT_CARET: 3,
+    TT_PLUS: 4, TT_MINUS: 4,
+    TT_MUL: 5, TT_DIV: 5, TT_MOD: 5,
+}
+
+# Atoms that are a single token and can be built without calling atom()
+TOKEN_ATOMS = {
+    TT_INT: NumberNode,
+    TT_FLOAT: NumberNode,
+    TT_STRING: StringNode,
+    TT_IDENTIFIER: VarAccessNode,
+}
+
+
+class PrattParser(Parser):
+    """
+    Drop-in replacement for Parser with a precedence-climbing logic_expr.
+    Statements and compound atoms (lists, blocks, functions, ...) are parsed
+    by the inherited methods.
+    """
+
+    def logic_expr(self):
+        res = ParseResult()
+
+        if self.current_tok.kind == KW_NOT:
+            op_tok = self.current_tok
+            res.register_advancement()
+            self.advance()
+
+            node = res.register(self.logic_expr())
+            if res.error: return res
+            return res.success(UnaryOpNode(op_tok, node))
+
+        node = self.binary_expr(res, 1)
+
+        if res.error:
+            return res.failure(InvalidSyntaxError(
+                self.current_tok.pos_start, self.current_tok.pos_end,
+                "Expected value, identifier, 'not', or expression"
+            ))
+
+        return res.success(node)
+
+    def binary_expr(self, res, min_precedence):
+        """Parse operands joined by operators binding at least min_precedence"""
+        left = self.unary_expr(res)
+        if res.error: return None
+
+        while True:
+            op_tok = self.current_tok
+            precedence = BINARY_PRECEDENCE.get(op_tok.kind)
+            if precedence is None or precedence < min_precedence:
+                return left
+
+            res.register_advancement()
+            self.advance()
+
+            right = self.binary_expr(res, precedence + 1)
+            if res.error: return None
+            left = BinOpNode(left, op_tok, right)
+
+    def unary_expr(self, res):
+        """Parse prefix '+'/'-' followed by an atom with its call/'@' suffix"""
+        tok = self.current_tok
+
+        if tok.type in (TT_PLUS, TT_MINUS):
+            res.register_advancement()
+            self.advance()
+
+            operand = self.unary_expr(res)
+            if res.error: return None
+            return UnaryOpNode(tok, operand)
+
+        node_class = TOKEN_ATOMS.get(tok.type)
+        if node_class is not None:
+            res.register_advancement()
+            self.advance()
+            atom = node_class(tok)
+        else:
+            atom = res.register(self.atom())
+            if res.error: return None
+
+        return self.call_suffix(res, atom).node
@@ -0,0 +1,151 @@
+"""
+Variable resolution pass for the tree interpreter.
+Runs once over a parsed (and optimized) file and gives every variable of a
+function body or list comprehension a slot number, so that its frame can
+keep them in a Python list (symbol_table.SlotTable) instead of a dict.
+
+Annotations left on the tree:
+- FuncDefNode/LambdaNode/ListComprehensionNode.scope: the Scope of the body
+- binding nodes (put, keep, cycle, for each, make function, handle as)
+  .slot: slot of the name they bind, or None at the top level of the file
+- ListComprehensionNode.clause_slots: slot of each clause variable
+- VarAccessNode.address: (depth, slot) of the name read, where depth counts
+  the scopes to walk up and slot None means an ordinary name lookup in the
+  table found there (the file's top level, or a scope that runs a wildcard
+  'bring in'). None for reads at the top level, which are always looked up
+  by name so the REPL and 'bring in' can bind anything there.
+
+Function values are called in the context they were last given, not
+always the one they were defined in, so an address is only a shortcut:
+SlotTable.lookup checks that the frames above it really are the scopes the
+resolver saw and otherwise falls back to a lookup by name.
+"""
+
+from nodes.attempt_handle_node import AttemptHandleNode
+from nodes.const_assign_node import ConstAssignNode
+from nodes.for_each_node import ForEachNode
+from nodes.for_node import ForNode
+from nodes.function_definition_node import FuncDefNode
+from nodes.import_node import ImportNode
+from nodes.lambda_node import LambdaNode
+from nodes.list_comprehension_node import ListComprehensionNode
+from nodes.var_access_node import VarAccessNode
+from nodes.var_assign_node import VarAssignNode
+from optimizer import node_fields
+
+# Nodes whose children run in a new scope
+SCOPE_NODES = (FuncDefNode, LambdaNode, ListComprehensionNode)
+
+
+class Scope:
+    """Names bound in one function body or list comprehension, in slot order"""
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.slots = {}
+        # A wildcard 'bring in' may bind names the resolver cannot see
+        self.dynamic = False
+        # Slot of each parameter of a function body, in order
+        self.arg_slots = []
+
+    def declare(self, name):
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = self.slots[name] = len(self.slots)
+        return slot
+
+    def address(self, name):
+        depth = 0
+        scope = self
+        while scope is not None:
+            slot = scope.slots.get(name)
+            if slot is not None:
+                return depth, slot
+            if scope.dynamic:
+                return depth, None
+            scope = scope.parent
+            depth += 1
+        return depth, None
+
+    def __repr__(self):
+        return f'<scope {list(self.slots)}>'
+
+
+def resolve(node):
+    """Annotate the AST of a whole file in place and return it"""
+    pending = [(node, None)]
+    while pending:
+        body, scope = pending.pop()
+        pending.extend(resolve_scope(body, scope))
+    return node
+
+
+def resolve_scope(body, scope):
+    """
+    Annotate the nodes that run directly in scope and return the
+    (body, scope) pairs of the scopes nested in it.
+    All bindings of a scope are declared before any read is resolved, since
+    a name assigned anywhere in a function is a slot of its frame.
+    """
+    binders = []
+    reads = []
+    nested = []
+    stack = [body]
+
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (list, tuple)):
+            stack.extend(node)
+            continue
+        fields = node_fields(node)
+        if not fields:
+            continue
+
+        if isinstance(node, VarAccessNode):
+            reads.append(node)
+            continue
+        if isinstance(node, SCOPE_NODES):
+            nested.append(node)
+            if isinstance(node, FuncDefNode) and node.var_name_tok:
+                binders.append((node, node.var_name_tok.value))
+            continue
+
+        name_tok = bound_name_tok(node)
+        if name_tok is not None:
+            binders.append((node, name_tok.value))
+        elif isinstance(node, ImportNode) and scope is not None:
+            if node.items is None:
+                scope.dynamic = True
+            else:
+                for item_tok, alias_tok in node.items:
+                    scope.declare((alias_tok or item_tok).value)
+
+        stack.extend(getattr(node, name) for name in fields)
+
+    for node, name in binders:
+        node.slot = scope.declare(name) if scope is not None else None
+    for node in reads:
+        node.address = scope.address(node.var_name_tok.value) if scope is not None else None
+
+    children = []
+    for node in nested:
+        inner = Scope(scope)
+        node.scope = inner
+        if isinstance(node, ListComprehensionNode):
+            node.clause_slots = [inner.declare(clause[0].value) for clause in node.comprehension_clauses]
+            children.append(([node.expression_node, node.comprehension_clauses], inner))
+        else:
+            inner.arg_slots = [inner.declare(arg_tok.value) for arg_tok in node.arg_name_toks]
+            children.append((node.body_node, inner))
+    return children
+
+
+def bound_name_tok(node):
+    """Name token bound in the current scope by a node with a 'slot' annotation"""
+    if isinstance(node, (VarAssignNode, ForNode, ForEachNode)):
+        return node.var_name_tok
+    if isinstance(node, ConstAssignNode):
+        return node.const_name_tok
+    if isinstance(node, AttemptHandleNode):
+        return node.error_var_name
+    return None
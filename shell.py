@@ -4,6 +4,7 @@ Run UTTR code interactively or execute .uttr files
 """
 
 import entry
+import options
 import sys
 import os
 from values.list_value import List
@@ -18,7 +19,14 @@ def run_file(filename):
     try:
         with open(filename, 'r') as f:
             code = f.read()
-        
+
+        if options.PROGRAM_MODE == 'stream':
+            # The values of a file's statements are not shown, only its errors
+            _, error = entry.run_stream(filename, code)
+            if error:
+                print(error.as_string())
+            return
+
         result, error = entry.run(filename, code)
         
         if error:
@@ -33,6 +41,33 @@ def run_file(filename):
     except Exception as e:
         print(f"Error reading file: {e}")
 
+def disassemble_file(filename):
+    """Print the bytecode the VM would run for a UTTR file"""
+    from bytecode import disassemble
+    from bytecode_compiler import compile_program
+    from lexer import make_lexer
+    from optimizer import optimize
+    from parser import make_parser
+
+    if not os.path.exists(filename):
+        print(f"Error: File '{filename}' not found")
+        return
+
+    with open(filename, 'r') as f:
+        code = f.read()
+
+    tokens, error = make_lexer(filename, code).make_tokens()
+    if error:
+        print(error.as_string())
+        return
+    ast = make_parser(tokens).parse()
+    if ast.error:
+        print(ast.error.as_string())
+        return
+
+    node = optimize(ast.node) if options.OPTIMIZE == 'on' else ast.node
+    print(disassemble(compile_program(node, filename)))
+
 def run_interactive():
     """Run the interactive REPL"""
     print("=" * 60)
@@ -155,14 +190,39 @@ def run_interactive():
 
 def main():
     """Main entry point"""
-    if len(sys.argv) > 1:
+    args = sys.argv[1:]
+
+    # --vm runs on the bytecode VM; --depth also reports the deepest call
+    # stack it reached; --stream runs a file statement by statement as it is
+    # parsed; --dis prints the bytecode instead of running
+    disassemble_only = False
+    report_depth = False
+    while args and args[0] in ('--vm', '--depth', '--stream', '--dis'):
+        flag = args.pop(0)
+        if flag == '--dis':
+            disassemble_only = True
+        elif flag == '--stream':
+            options.PROGRAM_MODE = 'stream'
+        else:
+            options.ENGINE = 'vm'
+            report_depth = report_depth or flag == '--depth'
+
+    if disassemble_only:
+        if not args:
+            print("Usage: python shell.py --dis <file_name>")
+            return
+        disassemble_file(args[0])
+    elif args:
         # File execution mode
-        filename = sys.argv[1]
+        filename = args[0]
         
         if not filename.endswith('.uttr'):
             print(f"Warning: '{filename}' doesn't have .uttr extension")
         
         run_file(filename)
+        if report_depth:
+            import vm
+            print(f"Peak call depth: {vm.peak_call_depth}")
     else:
         # Interactive mode
         run_interactive()
@@ -0,0 +1,424 @@
+"""
+Tree-walking interpreter with exception-based control flow.
+Interpreter.visit wraps every result in an RTResult and every caller polls
+its flags after each child. Here evaluate() returns values directly, and
+'give', 'cut', 'skip' and runtime errors are raised as control_flow
+signals that only loops, calls and 'attempt' catch.
+visit() keeps the RTResult protocol for callers outside the interpreter.
+Selected with options.CONTROL_FLOW = 'exceptions'.
+"""
+
+from context import Context
+from control_flow import CutSignal, ErrorSignal, ReturnSignal, SkipSignal, capture_result, unwrap_result
+from errors.run_time_error import RTError
+from functions.base_function import BaseFunction
+from functions.builtin_function import BuiltInFunction
+from functions.function import Function
+from interpreter import Interpreter, make_comprehension_table
+from tail_calls import TailCall
+from tokens import KW_AND, KW_NOT, KW_OR, TT_AMPERSAND, TT_CARET, TT_DIV, TT_EE, TT_GT, TT_GTE, TT_LT, TT_LTE, TT_MINUS, TT_MOD, TT_MUL, TT_NE, TT_PLUS
+from values.dict_value import Dict, dict_key
+from values.error_value import ErrorValue
+from values.list_value import List
+from values.number_value import Number, placed
+from values.regex_value import Regex
+from values.set_value import Set
+from values.string_value import String
+from values.tuple_value import Tuple
+
+# Value method called for each binary operator (see Interpreter.visit_BinOpNode)
+BINARY_OP_METHODS = {
+    TT_PLUS: 'added_to',
+    TT_MINUS: 'subbed_by',
+    TT_MUL: 'multed_by',
+    TT_DIV: 'dived_by',
+    TT_MOD: 'modded_by',
+    TT_EE: 'get_comparison_eq',
+    TT_NE: 'get_comparison_ne',
+    TT_LT: 'get_comparison_lt',
+    TT_GT: 'get_comparison_gt',
+    TT_LTE: 'get_comparison_lte',
+    TT_GTE: 'get_comparison_gte',
+    TT_AMPERSAND: 'intersected_with',
+    TT_CARET: 'symmetric_diff_with',
+    KW_AND: 'anded_by',
+    KW_OR: 'ored_by',
+}
+
+
+class SignalInterpreter(Interpreter):
+    # Node class -> evaluate function, filled in the first time each class is seen
+    evaluation_table = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Same as Interpreter.__init_subclass__
+        cls.evaluation_table = {}
+
+    def visit(self, node, context):
+        return capture_result(self.evaluate, node, context)
+
+    def evaluate(self, node, context):
+        method = self.evaluation_table.get(type(node))
+        if method is None:
+            method = self.resolve_evaluate_method(type(node))
+        return method(self, node, context)
+
+    @classmethod
+    def resolve_evaluate_method(cls, node_class):
+        method = getattr(cls, f'evaluate_{node_class.__name__}', cls.evaluate_with_visitor)
+        cls.evaluation_table[node_class] = method
+        return method
+
+    def evaluate_with_visitor(self, node, context):
+        """Nodes without an evaluate_ method ('bring', 'share') use the RTResult visitor"""
+        return unwrap_result(Interpreter.visit(self, node, context))
+
+    def evaluate_NumberNode(self, node, context):
+        return Number.of(node.tok.value).set_context(context).set_pos(node.pos_start, node.pos_end)
+
+    def evaluate_StringNode(self, node, context):
+        return String(node.tok.value).set_context(context).set_pos(node.pos_start, node.pos_end)
+
+    def evaluate_RegexNode(self, node, context):
+        regex = Regex(node.tok.value).set_context(context).set_pos(node.pos_start, node.pos_end)
+        if regex.compiled is None:
+            raise ErrorSignal(RTError(
+                node.pos_start, node.pos_end,
+                f"Invalid regex pattern: {regex.compile_error}",
+                context
+            ))
+        return regex
+
+    def evaluate_ListNode(self, node, context):
+        elements = [self.evaluate(element_node, context) for element_node in node.element_nodes]
+        return List(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
+
+    def evaluate_TupleNode(self, node, context):
+        elements = [self.evaluate(element_node, context) for element_node in node.element_nodes]
+        return Tuple(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
+
+    def evaluate_SetNode(self, node, context):
+        elements = [self.evaluate(element_node, context) for element_node in node.element_nodes]
+        return Set(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
+
+    def evaluate_DictNode(self, node, context):
+        elements = {}
+        for key_node, value_node in node.key_value_pairs:
+            key = self.evaluate(key_node, context)
+            value = self.evaluate(value_node, context)
+            hashable_key = dict_key(key)
+            if hashable_key is None:
+                raise ErrorSignal(RTError(
+                    key_node.pos_start, key_node.pos_end,
+                    'Dictionary key must be a string, number or tuple',
+                    context
+                ))
+            elements[hashable_key] = value
+        return Dict(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
+
+    def evaluate_ListComprehensionNode(self, node, context):
+        elements = []
+        comp_context = Context(context.display_name, context.parent, context.parent_entry_pos)
+        comp_context.symbol_table = make_comprehension_table(node, context)
+        clauses = node.comprehension_clauses
+        clause_slots = node.clause_slots or [None] * len(clauses)
+
+        def process_comprehension_clauses(clause_idx):
+            if clause_idx >= len(clauses):
+                elements.append(self.evaluate(node.expression_node, comp_context))
+                return
+
+            var_tok, iterable_node, conditions = clauses[clause_idx]
+            iterable = self.evaluate(iterable_node, comp_context)
+            if not isinstance(iterable, (List, Tuple, Set)):
+                raise ErrorSignal(RTError(
+                    iterable_node.pos_start, iterable_node.pos_end,
+                    f"Cannot iterate over {type(iterable).__name__}",
+                    comp_context
+                ))
+
+            for item in iterable.elements:
+                comp_context.symbol_table.set_slot(clause_slots[clause_idx], var_tok.value, item)
+                for condition_node in conditions:
+                    condition_value = self.evaluate(condition_node, comp_context)
+                    if hasattr(condition_value, 'is_true'):
+                        if not condition_value.is_true(): break
+                    elif not condition_value:
+                        break
+                else:
+                    process_comprehension_clauses(clause_idx + 1)
+
+        process_comprehension_clauses(0)
+        return List(elements).set_context(context).set_pos(node.pos_start, node.pos_end)
+
+    def evaluate_VarAccessNode(self, node, context):
+        var_name = node.var_name_tok.value
+        if node.address is None:
+            value = context.symbol_table.get(var_name)
+        else:
+            value = context.symbol_table.lookup(var_name, node.address)
+
+        if not value:
+            raise ErrorSignal(RTError(
+                node.pos_start, node.pos_end,
+                f"'{var_name}' is not defined",
+                context
+            ))
+
+        # Same copying rules as Interpreter.visit_VarAccessNode
+        if isinstance(value, (List, Dict, BaseFunction)):
+            value = value.set_pos(node.pos_start, node.pos_end)
+            if isinstance(value, BuiltInFunction) or not isinstance(value, BaseFunction):
+                value = value.set_context(context)
+            return value
+        if value.shared: return value
+        return value.copy().set_pos(node.pos_start, node.pos_end).set_context(context)
+
+    def evaluate_VarAssignNode(self, node, context):
+        value = self.evaluate(node.value_node, context)
+        context.symbol_table.set_slot(node.slot, node.var_name_tok.value, value)
+        return value
+
+    def evaluate_ConstAssignNode(self, node, context):
+        value = self.evaluate(node.value_node, context)
+        context.symbol_table.set_slot(node.slot, node.const_name_tok.value, value)
+        return value
+
+    def evaluate_BinOpNode(self, node, context):
+        left = self.evaluate(node.left_node, context)
+        right = self.evaluate(node.right_node, context)
+
+        method_name = BINARY_OP_METHODS[node.op_tok.kind]
+        result, error = getattr(left, method_name)(right)
+        if error:
+            if left.shared or right.shared:
+                # Same as Interpreter.visit_BinOpNode
+                left = placed(left, node.left_node.pos_start, node.left_node.pos_end, context)
+                right = placed(right, node.right_node.pos_start, node.right_node.pos_end, context)
+                result, error = getattr(left, method_name)(right)
+            raise ErrorSignal(error)
+        # Same as Interpreter.visit_BinOpNode
+        if left.shared: result.set_context(context)
+        return result.set_pos(node.pos_start, node.pos_end)
+
+    def evaluate_UnaryOpNode(self, node, context):
+        number = self.evaluate(node.node, context)
+        error = None
+
+        if node.op_tok.type == TT_MINUS:
+            operand = number
+            number, error = number.multed_by(Number(-1))
+            # Same as Interpreter.visit_BinOpNode
+            if not error and operand.shared: number.set_context(context)
+        elif node.op_tok.kind == KW_NOT:
+            number, error = number.notted()
+
+        if error: raise ErrorSignal(error)
+        return number.set_pos(node.pos_start, node.pos_end)
+
+    def evaluate_IfNode(self, node, context):
+        for condition, expr, should_return_null in node.cases:
+            if self.evaluate(condition, context).is_true():
+                expr_value = self.evaluate(expr, context)
+                return Number.null if should_return_null else expr_value
+
+        if node.else_case:
+            expr, should_return_null = node.else_case
+            expr_value = self.evaluate(expr, context)
+            return Number.null if should_return_null else expr_value
+
+        return Number.null
+
+    def evaluate_SwitchCaseNode(self, node, context):
+        switch_value = self.evaluate(node.switch_expr, context)
+
+        for case_value_node, expr, should_return_null in node.cases:
+            case_value = self.evaluate(case_value_node, context)
+            if switch_value.get_comparison_eq(case_value)[0].is_true():
+                expr_value = self.evaluate(expr, context)
+                return Number.null if should_return_null else expr_value
+
+        if node.default_case:
+            expr, should_return_null = node.default_case
+            expr_value = self.evaluate(expr, context)
+            return Number.null if should_return_null else expr_value
+
+        return Number.null
+
+    def evaluate_ForNode(self, node, context):
+        start_value = self.evaluate(node.start_value_node, context)
+        end_value = self.evaluate(node.end_value_node, context)
+        step = self.evaluate(node.step_value_node, context).value if node.step_value_node else 1
+
+        i = start_value.value
+        end = end_value.value
+
+        # Integer bounds and a positive integer step count up exactly like
+        # the general loop below, so they run on a Python range
+        if type(i) is int and type(end) is int and type(step) is int and step > 0:
+            evaluate = self.evaluate
+            body_node = node.body_node
+            set_slot = context.symbol_table.set_slot
+            slot = node.slot
+            var_name = node.var_name_tok.value
+
+            for i in range(i, end, step):
+                set_slot(slot, var_name, Number(i))
+                try:
+                    evaluate(body_node, context)
+                except CutSignal:
+                    break
+                except SkipSignal:
+                    continue
+
+            return Number.null
+
+        while i < end:
+            context.symbol_table.set_slot(node.slot, node.var_name_tok.value, Number(i))
+            i += step
+
+            try:
+                self.evaluate(node.body_node, context)
+            except CutSignal:
+                break
+            except SkipSignal:
+                continue
+
+        return Number.null
+
+    def evaluate_ForEachNode(self, node, context):
+        iterable = self.evaluate(node.iterable_node, context)
+
+        if not isinstance(iterable, (List, Tuple)):
+            raise ErrorSignal(RTError(
+                node.iterable_node.pos_start, node.iterable_node.pos_end,
+                "Can only iterate through lists and tuples",
+                context
+            ))
+
+        for element in iterable.elements:
+            context.symbol_table.set_slot(node.slot, node.var_name_tok.value, element)
+
+            try:
+                self.evaluate(node.body_node, context)
+            except CutSignal:
+                break
+            except SkipSignal:
+                continue
+
+        return Number.null
+
+    def evaluate_WhileNode(self, node, context):
+        while self.evaluate(node.condition_node, context).is_true():
+            try:
+                self.evaluate(node.body_node, context)
+            except CutSignal:
+                break
+            except SkipSignal:
+                continue
+
+        return Number.null
+
+    def evaluate_DoWhileNode(self, node, context):
+        while True:
+            try:
+                self.evaluate(node.body_node, context)
+            except CutSignal:
+                break
+            except SkipSignal:
+                # Skip still checks the condition before the next iteration
+                pass
+
+            if not self.evaluate(node.condition_node, context).is_true():
+                break
+
+        return Number.null
+
+    def evaluate_FuncDefNode(self, node, context):
+        return unwrap_result(self.visit_FuncDefNode(node, context))
+
+    def evaluate_LambdaNode(self, node, context):
+        return unwrap_result(self.visit_LambdaNode(node, context))
+
+    def evaluate_CallNode(self, node, context, tail=False):
+        value_to_call = self.evaluate(node.node_to_call, context)
+
+        # Same in-place call of tree Functions as Interpreter.visit_CallNode
+        if type(value_to_call) is Function and value_to_call.body_code is None and value_to_call.body_bytecode is None:
+            parent = value_to_call.context
+            args = [self.evaluate(arg_node, context) for arg_node in node.arg_nodes]
+            if len(args) == len(value_to_call.arg_names):
+                if tail: return TailCall(value_to_call, args, parent, node.pos_start)
+                return_value = self.invoke_function(value_to_call, args, parent, node.pos_start)
+            else:
+                callee = value_to_call.copy().set_pos(node.pos_start, node.pos_end).set_context(parent)
+                return_value = unwrap_result(callee.execute(args))
+        else:
+            callee = value_to_call
+            value_to_call = callee.copy().set_pos(node.pos_start, node.pos_end)
+            # Same as Interpreter.visit_CallNode
+            if callee.shared: value_to_call.set_context(context)
+            args = [self.evaluate(arg_node, context) for arg_node in node.arg_nodes]
+            return_value = unwrap_result(value_to_call.execute(args))
+        return return_value.copy().set_pos(node.pos_start, node.pos_end).set_context(context)
+
+    def call_function(self, func, args, parent, entry_pos):
+        return capture_result(self.invoke_function, func, args, parent, entry_pos)
+
+    def invoke_function(self, func, args, parent, entry_pos):
+        """call_function without the RTResult round trip"""
+        elided_frames = 0
+
+        while True:
+            exec_ctx = func.new_call_context(parent, entry_pos)
+            if elided_frames: exec_ctx.elided_frames = elided_frames
+            func.bind_args(args, exec_ctx)
+
+            try:
+                return self.evaluate(func.body_node, exec_ctx) or Number.null
+            except ReturnSignal as signal:
+                tail_call = signal.value
+                if type(tail_call) is not TailCall:
+                    return tail_call or Number.null
+
+            # Same frame replacement as Interpreter.call_function
+            func, args, parent, entry_pos = tail_call.func, tail_call.args, tail_call.parent, tail_call.entry_pos
+            elided_frames += 1
+
+    def evaluate_ReturnNode(self, node, context):
+        if node.tail_call:
+            raise ReturnSignal(self.evaluate_CallNode(node.node_to_return, context, True))
+        if node.node_to_return:
+            raise ReturnSignal(self.evaluate(node.node_to_return, context))
+        raise ReturnSignal(Number.null)
+
+    def evaluate_CutNode(self, node, context):
+        raise CutSignal()
+
+    def evaluate_SkipNode(self, node, context):
+        raise SkipSignal()
+
+    def evaluate_ListAccessNode(self, node, context):
+        return unwrap_result(self.index_collection(
+            node, context,
+            self.evaluate(node.list_node, context),
+            self.evaluate(node.index_node, context)
+        ))
+
+    def evaluate_AttemptHandleNode(self, node, context):
+        try:
+            return self.evaluate(node.attempt_body, context)
+        except ErrorSignal as signal:
+            caught_error = signal.error
+
+        error_value = ErrorValue(
+            caught_error.details,
+            caught_error.error_name,
+            caught_error
+        ).set_context(context).set_pos(node.pos_start, node.pos_end)
+
+        if node.error_var_name:
+            context.symbol_table.set_slot(node.slot, node.error_var_name.value, error_value)
+
+        return self.evaluate(node.handle_body, context)
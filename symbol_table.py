@@ -1,4 +1,8 @@
 class SymbolTable:
+    # Resolver scope this table holds the slots of (see SlotTable)
+    scope = None
+    lexical = False
+
     def __init__(self, parent=None):
         self.symbols = {}
         self.parent = parent
@@ -9,8 +13,75 @@ class SymbolTable:
             return self.parent.get(name)
         return value
 
+    def lookup(self, name, address):
+        """Value of a variable read by a resolved VarAccessNode"""
+        return self.get(name)
+
     def set(self, name, value):
         self.symbols[name] = value
 
+    def set_slot(self, slot, name, value):
+        """Bind a name for a resolved binding node"""
+        self.symbols[name] = value
+
+    def remove(self, name):
+        del self.symbols[name]
+
+
+class SlotTable(SymbolTable):
+    """
+    Frame of a function call or list comprehension resolved by resolver.py.
+    Variables the resolver found live in a list indexed by their slot; names
+    it could not see (bound by a wildcard 'bring in') go in the dict.
+    """
+
+    def __init__(self, scope, parent):
+        super().__init__(parent)
+        self.scope = scope
+        self.slots = [None] * len(scope.slots)
+        # True when the tables above are the scopes the resolver saw around
+        # this one, so an address can skip straight to the table it names
+        self.lexical = parent.scope is scope.parent and (scope.parent is None or parent.lexical)
+        if self.lexical:
+            # Tables above this one by address depth - 1, up to the file's top level
+            self.chain = (parent,) if scope.parent is None else (parent,) + parent.chain
+
+    def get(self, name):
+        slot = self.scope.slots.get(name)
+        value = self.symbols.get(name) if slot is None else self.slots[slot]
+        if value is None and self.parent:
+            return self.parent.get(name)
+        return value
+
+    def lookup(self, name, address):
+        depth, slot = address
+        if depth == 0:
+            table = self
+        elif self.lexical:
+            table = self.chain[depth - 1]
+        else:
+            return self.get(name)
+
+        if slot is None:
+            return table.get(name)
+        value = table.slots[slot]
+        if value is None:
+            return table.parent.get(name)
+        return value
+
+    def set(self, name, value):
+        slot = self.scope.slots.get(name)
+        if slot is None:
+            self.symbols[name] = value
+        else:
+            self.slots[slot] = value
+
+    def set_slot(self, slot, name, value):
+        self.slots[slot] = value
+
     def remove(self, name):
-        del self.symbols[name]
\ No newline at end of file
+        slot = self.scope.slots.get(name)
+        if slot is None:
+            del self.symbols[name]
+        else:
+            self.slots[slot] = None
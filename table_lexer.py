@@ -0,0 +1,191 @@
+"""
+Table-driven lexer for UTTR.
+Scans the source with compiled patterns and a dispatch table keyed by the
+first character of each token instead of advancing one character at a time.
+Produces exactly the same token stream and error positions as Lexer.
+"""
+
+import re
+
+from errors.illegal_character import IllegalCharError
+from lexer import Lexer
+from position import Position
+from tokens import KEYWORD_IDS, TT_AMPERSAND, TT_AT, TT_CARET, TT_COLON, TT_COMMA, TT_DIV, TT_EOF, TT_FLOAT, TT_IDENTIFIER, TT_INT, TT_KEYWORD, TT_LCURLY, TT_LPAREN, TT_LSETBRACE, TT_LSQUARE, TT_MINUS, TT_MOD, TT_MUL, TT_NEWLINE, TT_PLUS, TT_RCURLY, TT_RPAREN, TT_RSETBRACE, TT_RSQUARE, TT_STRING, Token
+from constants import DIGITS, LETTERS
+
+
+WHITESPACE_RE = re.compile(r'[ \t]+')
+NUMBER_RE = re.compile(r'[0-9]+(?:\.[0-9]*)?')
+IDENTIFIER_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+# Strings without escapes; anything else goes through Lexer.make_string
+SIMPLE_STRING_RE = re.compile(r'"[^"\\]*"')
+
+# Words that may start a multi-word keyword ('as long as', 'make function', ...)
+MULTI_WORD_STARTS = frozenset(['as', 'make', 'each', 'repeat'])
+
+SINGLE_CHAR_TOKENS = {
+    '+': TT_PLUS,
+    '-': TT_MINUS,
+    '*': TT_MUL,
+    '/': TT_DIV,
+    '%': TT_MOD,
+    '(': TT_LPAREN,
+    ')': TT_RPAREN,
+    '[': TT_LSQUARE,
+    ']': TT_RSQUARE,
+    '}': TT_RCURLY,
+    '&': TT_AMPERSAND,
+    '^': TT_CARET,
+    ',': TT_COMMA,
+    '@': TT_AT,
+}
+
+# Dispatch actions
+SKIP_WHITESPACE = 0
+COMMENT = 1
+NEWLINE = 2
+NUMBER = 3
+IDENTIFIER = 4
+STRING = 5
+SINGLE = 6
+LCURLY = 7
+COLON = 8
+FALLBACK = 9
+
+DISPATCH = {}
+for char in ' \t':
+    DISPATCH[char] = SKIP_WHITESPACE
+for char in ';\n':
+    DISPATCH[char] = NEWLINE
+for char in DIGITS:
+    DISPATCH[char] = NUMBER
+for char in LETTERS:
+    DISPATCH[char] = IDENTIFIER
+for char in SINGLE_CHAR_TOKENS:
+    DISPATCH[char] = SINGLE
+# Context-sensitive operators keep using the character-level scanner
+for char in '!=<>':
+    DISPATCH[char] = FALLBACK
+DISPATCH['$'] = COMMENT
+DISPATCH['"'] = STRING
+DISPATCH['{'] = LCURLY
+DISPATCH[':'] = COLON
+
+
+class TableLexer(Lexer):
+    """
+    Drop-in replacement for Lexer.
+
+    Tokens are built straight from offsets into the shared SourceFile.
+    Rare or context-sensitive constructs (escaped strings, regex literals,
+    multi-word keywords, '<', '>', '=', '!') are delegated to the inherited
+    Lexer methods, so their behaviour and error positions stay identical.
+    """
+
+    def make_tokens(self):
+        text = self.text
+        source = self.source
+        length = len(text)
+        tokens = []
+        append = tokens.append
+        make_token = Token.at
+
+        idx = self.idx
+
+        while idx < length:
+            char = text[idx]
+            action = DISPATCH.get(char)
+
+            if action == SKIP_WHITESPACE:
+                idx = WHITESPACE_RE.match(text, idx).end()
+
+            elif action == IDENTIFIER:
+                end = IDENTIFIER_RE.match(text, idx).end()
+                word = text[idx:end]
+
+                if word in MULTI_WORD_STARTS or (word == 'r' and end < length and text[end] in '"\''):
+                    self._sync(idx, char)
+                    append(self.make_identifier())
+                    idx = self.idx
+                    continue
+
+                append(make_token(TT_KEYWORD if word in KEYWORD_IDS else TT_IDENTIFIER, word, source, idx, end))
+                idx = end
+
+            elif action == SINGLE:
+                append(make_token(SINGLE_CHAR_TOKENS[char], None, source, idx, idx + 1))
+                idx += 1
+
+            elif action == NEWLINE:
+                append(make_token(TT_NEWLINE, None, source, idx, idx + 1))
+                idx += 1
+
+            elif action == NUMBER:
+                end = NUMBER_RE.match(text, idx).end()
+                num_str = text[idx:end]
+                if '.' in num_str:
+                    append(make_token(TT_FLOAT, float(num_str), source, idx, end))
+                else:
+                    append(make_token(TT_INT, int(num_str), source, idx, end))
+                idx = end
+
+            elif action == STRING:
+                match = SIMPLE_STRING_RE.match(text, idx)
+                if match is None:
+                    self._sync(idx, char)
+                    append(self.make_string())
+                    idx = self.idx
+                    continue
+
+                end = match.end()
+                append(make_token(TT_STRING, text[idx + 1:end - 1], source, idx, end))
+                idx = end
+
+            elif action == COMMENT:
+                if text.startswith('[', idx + 1):
+                    close = text.find(']$', idx + 2)
+                    idx = length if close < 0 else close + 2
+                else:
+                    idx = text.find('\n', idx)
+                    if idx < 0: idx = length
+
+            elif action == LCURLY:
+                if text.startswith(':', idx + 1):
+                    append(make_token(TT_LSETBRACE, None, source, idx, idx + 1))
+                    idx += 2
+                else:
+                    append(make_token(TT_LCURLY, None, source, idx, idx + 1))
+                    idx += 1
+
+            elif action == COLON:
+                if text.startswith('}', idx + 1):
+                    append(make_token(TT_RSETBRACE, None, source, idx, idx + 1))
+                    idx += 2
+                else:
+                    append(make_token(TT_COLON, None, source, idx, idx + 1))
+                    idx += 1
+
+            elif action == FALLBACK:
+                self._sync(idx, char)
+                if char == '!':
+                    token, error = self.make_not_equals()
+                    if error: return [], error
+                    append(token)
+                elif char == '=':
+                    append(self.make_equals())
+                elif char == '<':
+                    append(self.make_less_than_or_langle(tokens[-1] if tokens else None))
+                else:
+                    append(self.make_greater_than_or_rangle(tokens[-1] if tokens else None))
+                idx = self.idx
+
+            else:
+                return [], IllegalCharError(Position(idx, source), Position(idx + 1, source), "'" + char + "'")
+
+        append(make_token(TT_EOF, None, source, idx, idx + 1))
+        return tokens, None
+
+    def _sync(self, idx, char):
+        """Hand the scan position over to the character-level Lexer methods"""
+        self.idx = idx
+        self.current_char = char
@@ -0,0 +1,66 @@
+"""
+Tail call pass for the tree interpreter.
+Marks every 'give f(...)' whose call can take over the frame of the function
+it is in (ReturnNode.tail_call). Such a give hands the callee, its arguments
+and its context back to the function call that is running (as a TailCall),
+which runs the callee in a new frame in place of its own, so tail-recursive
+functions run in constant Python stack and memory.
+
+A give is only a tail call directly in a function body: inside a loop a
+'cut' or 'skip' coming out of the callee must still stop that loop, and
+inside an 'attempt' block an error coming out of it must still be handled.
+"""
+
+from nodes.attempt_handle_node import AttemptHandleNode
+from nodes.call_node import CallNode
+from nodes.do_while_node import DoWhileNode
+from nodes.for_each_node import ForEachNode
+from nodes.for_node import ForNode
+from nodes.function_definition_node import FuncDefNode
+from nodes.lambda_node import LambdaNode
+from nodes.return_node import ReturnNode
+from nodes.while_node import WhileNode
+from optimizer import node_fields
+
+LOOP_NODES = (ForNode, ForEachNode, WhileNode, DoWhileNode)
+
+
+class TailCall:
+    """Call a tail-position give leaves for the running function call to make"""
+    __slots__ = ('func', 'args', 'parent', 'entry_pos')
+
+    def __init__(self, func, args, parent, entry_pos):
+        self.func = func
+        self.args = args
+        self.parent = parent
+        self.entry_pos = entry_pos
+
+
+def mark_tail_calls(node):
+    """Annotate the AST of a whole file in place and return it"""
+    # (node, whether a give found under it is in tail position)
+    stack = [(node, False)]
+
+    while stack:
+        node, tail = stack.pop()
+        if isinstance(node, (list, tuple)):
+            stack.extend((child, tail) for child in node)
+            continue
+        fields = node_fields(node)
+        if not fields:
+            continue
+
+        if isinstance(node, (FuncDefNode, LambdaNode)):
+            stack.append((node.body_node, True))
+            continue
+        if isinstance(node, LOOP_NODES):
+            tail = False
+        elif isinstance(node, AttemptHandleNode):
+            stack.append((node.attempt_body, False))
+            stack.append((node.handle_body, tail))
+            continue
+        elif isinstance(node, ReturnNode):
+            node.tail_call = tail and isinstance(node.node_to_return, CallNode)
+
+        stack.extend((getattr(node, name), tail) for name in fields)
+    return node
@@ -11,9 +11,11 @@ from pathlib import Path
 
 def run_test(test_file):
     """Run a single test file and return success status."""
+    # .uttr files run on the interpreter, Python test modules run directly
+    command = ['python', str(test_file)] if test_file.suffix == '.py' else ['python', 'shell.py', test_file]
     try:
         result = subprocess.run(
-            ['python', 'shell.py', test_file],
+            command,
             capture_output=True,
             text=True,
             timeout=30
@@ -33,7 +35,7 @@ def main():
     
     # Get tests directory
     tests_dir = Path(__file__).parent
-    test_files = sorted(tests_dir.glob('test_*.uttr'))
+    test_files = sorted([*tests_dir.glob('test_*.uttr'), *tests_dir.glob('test_*.py')])
     
     if not test_files:
         print("No test files found in tests/ directory")
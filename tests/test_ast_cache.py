@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+AST cache tests.
+A cached AST is reused only while its source is unchanged, and a cache file
+that was not signed with the user's key is never unpickled, whoever could
+write to the cache directory.
+"""
+
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import ast_cache
+import options
+from module_loader import ModuleLoader
+
+SOURCE = 'put 1 + 2 in x;\nshow x;\n'
+
+
+unpickled = []
+
+
+def record_unpickling():
+    unpickled.append(True)
+
+
+class Payload:
+    """Pickles into a call that records it ran"""
+
+    def __reduce__(self):
+        return (record_unpickling, ())
+
+
+class AstCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        root = Path(self.directory.name)
+        self.saved = options.AST_CACHE, options.AST_CACHE_DIR, os.environ.get('XDG_CACHE_HOME')
+        options.AST_CACHE = 'on'
+        options.AST_CACHE_DIR = ''
+        os.environ['XDG_CACHE_HOME'] = str(root / 'cache')
+        ast_cache._secret_key = None
+
+        self.module = root / 'src' / 'module.uttr'
+        self.module.parent.mkdir()
+        self.module.write_text(SOURCE)
+        unpickled.clear()
+
+    def tearDown(self):
+        options.AST_CACHE, options.AST_CACHE_DIR, xdg_cache_home = self.saved
+        if xdg_cache_home is None:
+            os.environ.pop('XDG_CACHE_HOME', None)
+        else:
+            os.environ['XDG_CACHE_HOME'] = xdg_cache_home
+        ast_cache._secret_key = None
+        self.directory.cleanup()
+
+    def compile_module(self):
+        node, error = ModuleLoader().compile_module(str(self.module), SOURCE)
+        self.assertIsNone(error)
+        return node
+
+    def test_entry_reused(self):
+        self.compile_module()
+        self.assertIsNotNone(ast_cache.load_ast(str(self.module), SOURCE))
+
+    def test_entry_in_user_cache_dir(self):
+        self.compile_module()
+        path = Path(ast_cache.cache_path(str(self.module)))
+        self.assertTrue(path.exists())
+        self.assertEqual(path.parent, Path(self.directory.name) / 'cache' / 'uttr')
+        self.assertEqual(list(self.module.parent.iterdir()), [self.module])
+
+    def test_changed_source_is_a_miss(self):
+        self.compile_module()
+        self.assertIsNone(ast_cache.load_ast(str(self.module), SOURCE + 'show 3;\n'))
+
+    def rewrite_payload(self, payload):
+        path = Path(ast_cache.cache_path(str(self.module)))
+        lines = path.read_bytes().split(b'\n', 3)
+        path.write_bytes(b'\n'.join(lines[:3] + [payload]))
+
+    def test_unsigned_entry_not_unpickled(self):
+        self.compile_module()
+        self.rewrite_payload(pickle.dumps(Payload()))
+        self.assertIsNone(ast_cache.load_ast(str(self.module), SOURCE))
+        self.assertEqual(unpickled, [])
+
+    def test_entry_signed_with_another_key_not_unpickled(self):
+        self.compile_module()
+        ast_cache._secret_key = None
+        (Path(self.directory.name) / 'cache' / 'uttr' / ast_cache.KEY_FILE_NAME).write_bytes(os.urandom(32))
+        self.assertIsNone(ast_cache.load_ast(str(self.module), SOURCE))
+
+    def test_key_readable_by_user_only(self):
+        if os.name == 'nt':
+            self.skipTest('POSIX permissions')
+        self.compile_module()
+        key_path = Path(self.directory.name) / 'cache' / 'uttr' / ast_cache.KEY_FILE_NAME
+        self.assertEqual(key_path.stat().st_mode & 0o777, 0o600)
+
+
+if __name__ == '__main__':
+    unittest.main()
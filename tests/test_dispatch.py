@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Visitor dispatch tests.
+Each engine caches the method it picks for a node class; a subclass that
+overrides a visitor must get that override even after the parent class has
+already cached its own method for the same node class.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from bytecode import Code
+from bytecode_compiler import BytecodeCompiler
+from closure_compiler import ClosureCompiler
+from context import Context
+from interpreter import Interpreter
+from lexer import make_lexer
+from parser import make_parser
+from run_time_result import RTResult
+from signal_interpreter import SignalInterpreter
+from symbol_table import SymbolTable
+from values.string_value import String
+
+
+def parse_number():
+    """NumberNode of the program '5'"""
+    tokens, error = make_lexer('<test>', '5').make_tokens()
+    assert error is None
+    node = make_parser(tokens).parse().node
+    while type(node).__name__ != 'NumberNode':
+        node = node.element_nodes[0]
+    return node
+
+
+def make_context():
+    context = Context('<test>')
+    context.symbol_table = SymbolTable()
+    return context
+
+
+class OverridingSubclassTests(unittest.TestCase):
+    def setUp(self):
+        self.node = parse_number()
+
+    def test_interpreter(self):
+        Interpreter().visit(self.node, make_context())
+
+        class Sub(Interpreter):
+            def visit_NumberNode(self, node, context):
+                return RTResult().success(String('overridden'))
+
+        self.assertEqual(Sub().visit(self.node, make_context()).value.value, 'overridden')
+        self.assertEqual(Interpreter().visit(self.node, make_context()).value.value, 5)
+
+    def test_signal_interpreter(self):
+        SignalInterpreter().evaluate(self.node, make_context())
+
+        class Sub(SignalInterpreter):
+            def evaluate_NumberNode(self, node, context):
+                return String('overridden')
+
+        self.assertEqual(Sub().evaluate(self.node, make_context()).value, 'overridden')
+        self.assertEqual(SignalInterpreter().evaluate(self.node, make_context()).value, 5)
+
+    def test_closure_compiler(self):
+        ClosureCompiler().compile(self.node)
+
+        class Sub(ClosureCompiler):
+            def compile_NumberNode(self, node):
+                return lambda context: 'overridden'
+
+        self.assertEqual(Sub().compile(self.node)(make_context()), 'overridden')
+
+    def test_bytecode_compiler(self):
+        BytecodeCompiler(Code('<test>')).compile(self.node)
+        compiled = []
+
+        class Sub(BytecodeCompiler):
+            def compile_NumberNode(self, node):
+                compiled.append(node)
+
+        Sub(Code('<test>')).compile(self.node)
+        self.assertEqual(compiled, [self.node])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Optimizer folding tests.
+Constant string repeats fold only when the result stays within
+MAX_FOLDED_STRING; larger ones are left for run time, so a program never
+builds them while it is being parsed (even in code that never runs).
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from lexer import make_lexer
+from nodes.binary_operator_node import BinOpNode
+from nodes.string_node import StringNode
+from optimizer import MAX_FOLDED_STRING, optimize
+from parser import make_parser
+
+
+def optimized_expression(source):
+    """Optimized node of the single expression statement in source"""
+    tokens, error = make_lexer('<test>', source).make_tokens()
+    assert error is None
+    node = make_parser(tokens).parse().node
+    return optimize(node).element_nodes[0]
+
+
+class StringRepeatFoldingTests(unittest.TestCase):
+    def test_small_repeat_folded(self):
+        node = optimized_expression('"ab" * 3')
+        self.assertIsInstance(node, StringNode)
+        self.assertEqual(node.tok.value, 'ababab')
+
+    def test_repeat_at_limit_folded(self):
+        node = optimized_expression(f'"x" * {MAX_FOLDED_STRING}')
+        self.assertIsInstance(node, StringNode)
+
+    def test_large_repeat_not_folded(self):
+        node = optimized_expression(f'"x" * {MAX_FOLDED_STRING + 1}')
+        self.assertIsInstance(node, BinOpNode)
+
+    def test_large_dead_repeat_not_folded(self):
+        # Would allocate about 3 GB if the fold built the string first
+        tokens, error = make_lexer('<test>', 'when false: show "x" * 3000000000; end').make_tokens()
+        self.assertIsNone(error)
+        node = optimize(make_parser(tokens).parse().node)
+        repeats = []
+        pending = [node]
+        while pending:
+            current = pending.pop()
+            if isinstance(current, BinOpNode):
+                repeats.append(current)
+            elif isinstance(current, (list, tuple)):
+                pending.extend(current)
+            elif hasattr(current, '__dict__'):
+                pending.extend(vars(current).values())
+        self.assertEqual(len(repeats), 1)
+        self.assertEqual(repeats[0].right_node.tok.value, 3000000000)
+
+
+if __name__ == '__main__':
+    unittest.main()
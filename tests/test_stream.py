@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Stream mode tests.
+A program run one top-level statement at a time must split statements and
+report syntax errors where the batch parser does; the statement with the
+error must not run, only the statements before it.
+"""
+
+import io
+import sys
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from entry import run, run_stream
+
+
+def run_capturing(runner, source):
+    """(printed output, error text) of running source with runner"""
+    output = io.StringIO()
+    with redirect_stdout(output):
+        _, error = runner('<test>', source)
+    return output.getvalue(), error.as_string() if error else None
+
+
+class StreamSyntaxErrorTests(unittest.TestCase):
+    def assert_same_error(self, source, streamed_output):
+        batch_output, batch_error = run_capturing(run, source)
+        stream_output, stream_error = run_capturing(run_stream, source)
+        self.assertIn('Invalid Syntax', batch_error)
+        self.assertEqual(stream_error, batch_error)
+        self.assertEqual(batch_output, '')
+        self.assertEqual(stream_output, streamed_output)
+
+    def test_unknown_loop_keyword(self):
+        # 'for' parses as a name, 'each' cannot follow it
+        self.assert_same_error('show "before";\nfor each x in 5:\n    show x;\nend;\n', 'before\n')
+
+    def test_trailing_tokens(self):
+        # 'show "abc"' is a whole statement, '[7]' cannot follow it
+        self.assert_same_error('show "before";\nshow "abc"[7];\nshow "after";\n', 'before\n')
+
+    def test_block_end_at_top_level(self):
+        self.assert_same_error('show 1;\nend;\n', '')
+
+    def test_valid_program(self):
+        source = 'put 2 in x;\nshow x * 3;\n\nshow "done";\n'
+        self.assertEqual(run_capturing(run_stream, source), run_capturing(run, source))
+
+
+if __name__ == '__main__':
+    unittest.main()
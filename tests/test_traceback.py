@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Traceback tests.
+Shared small numbers have no context of their own, so a value computed from
+one takes the context of the operation that made it; an error on that value
+later in the expression still traces through every call on every engine.
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PROGRAM = Path('tests') / 'shared_number_traceback.uttr'
+
+ENGINES = {
+    'tree': {'UTTR_ENGINE': 'tree', 'UTTR_CONTROL_FLOW': 'result'},
+    'exceptions': {'UTTR_ENGINE': 'tree', 'UTTR_CONTROL_FLOW': 'exceptions'},
+    'closure': {'UTTR_ENGINE': 'closure'},
+    'vm': {'UTTR_ENGINE': 'vm'},
+}
+
+
+def run_program(options):
+    """Output of python shell.py running PROGRAM with options set"""
+    env = dict(os.environ)
+    env.update(options)
+    result = subprocess.run(
+        [sys.executable, 'shell.py', str(PROGRAM)],
+        cwd=ROOT, env=env, stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=60,
+    )
+    return result.stdout
+
+
+class SharedNumberTracebackTests(unittest.TestCase):
+    def test_file_lines(self):
+        for engine, options in ENGINES.items():
+            lines = run_program(options).splitlines()
+            self.assertEqual(lines[:4], [
+                'Traceback (most recent call last):',
+                f'  File {PROGRAM}, line 8, in {PROGRAM}',
+                f'  File {PROGRAM}, line 5, in f',
+                'Runtime Error: Illegal operation',
+            ], engine)
+
+
+if __name__ == '__main__':
+    unittest.main()
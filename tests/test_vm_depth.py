@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+VM call depth tests.
+The VM keeps its frames on the heap, so recursion is bounded by
+UTTR_MAX_CALL_DEPTH instead of the Python stack: going past it is a runtime
+error that 'attempt' can handle, and --depth reports the deepest stack of
+frames (the program's own frame included) a run reached.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DOWN = '''make function down(n):
+    when n == 0:
+        give 0;
+    end;
+    give down(n - 1);
+end;
+'''
+
+
+def run_on_vm(source, max_call_depth=None):
+    """Output of python shell.py --depth running source"""
+    env = dict(os.environ)
+    env.pop('UTTR_MAX_CALL_DEPTH', None)
+    if max_call_depth is not None:
+        env['UTTR_MAX_CALL_DEPTH'] = str(max_call_depth)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'depth.uttr'
+        path.write_text(source)
+        result = subprocess.run(
+            [sys.executable, 'shell.py', '--depth', str(path)],
+            cwd=ROOT, env=env, stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=60,
+        )
+    return result.stdout
+
+
+class CallDepthTests(unittest.TestCase):
+    def test_peak_depth_reported(self):
+        output = run_on_vm(DOWN + 'show down(10);\n')
+        self.assertEqual(output.splitlines(), ['0', 'Peak call depth: 12'])
+
+    def test_limit_exceeded(self):
+        output = run_on_vm(DOWN + 'show down(10);\n', max_call_depth=5)
+        self.assertIn('Runtime Error: Maximum call depth of 5 exceeded', output)
+        self.assertEqual(output.splitlines()[-1], 'Peak call depth: 5')
+
+    def test_attempt_handles_limit(self):
+        source = DOWN + '\n'.join([
+            'attempt:',
+            '    show down(100);',
+            'end',
+            'handle as err:',
+            '    show "caught: " + error_message(err);',
+            'end;',
+            'show down(10);',
+            '',
+        ])
+        output = run_on_vm(source, max_call_depth=20)
+        self.assertEqual(output.splitlines(), [
+            'caught: Maximum call depth of 20 exceeded',
+            '0',
+            'Peak call depth: 20',
+        ])
+
+    def test_deep_recursion_under_limit(self):
+        # Deeper than nested Python calls could go
+        output = run_on_vm(DOWN + 'show down(5000);\n')
+        self.assertEqual(output.splitlines(), ['0', 'Peak call depth: 5002'])
+
+    def test_invalid_limit_uses_default(self):
+        for value in ['abc', '0', '-5']:
+            output = run_on_vm(DOWN + 'show down(10);\n', max_call_depth=value)
+            self.assertEqual(output.splitlines(), ['0', 'Peak call depth: 12'], value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,39 +1,83 @@
-TT_INT = 'INT'
-TT_FLOAT = 'FLOAT'
-TT_STRING = 'STRING'
-TT_REGEX = 'REGEX'
-TT_IDENTIFIER = 'IDENTIFIER'
-TT_KEYWORD = 'KEYWORD'
-TT_PLUS = 'PLUS'
-TT_MINUS = 'MINUS'
-TT_MUL = 'MUL'
-TT_DIV = 'DIV'
-TT_MOD = 'MOD'
-TT_LPAREN = 'LPAREN'
-TT_RPAREN = 'RPAREN'
-TT_LSQUARE = 'LSQUARE'
-TT_RSQUARE = 'RSQUARE'
-TT_LCURLY = 'LCURLY'
-TT_RCURLY = 'RCURLY'
-TT_LSETBRACE = 'LSETBRACE'
-TT_RSETBRACE = 'RSETBRACE'
-TT_LANGLE = 'LANGLE'
-TT_RANGLE = 'RANGLE'
-TT_AMPERSAND = 'AMPERSAND'
-TT_CARET = 'CARET'
-TT_EE = 'EE'
-TT_NE = 'NE'
-TT_LT = 'LT'
-TT_GT = 'GT'
-TT_LTE = 'LTE'
-TT_GTE = 'GTE'
-TT_COMMA = 'COMMA'
-TT_COLON = 'COLON'
-TT_SEMICOLON = 'SEMICOLON'
-TT_AT = 'AT'
-TT_ARROW = 'ARROW'
-TT_NEWLINE = 'NEWLINE'
-TT_EOF = 'EOF'
+from position import EndPosition, Position
+
+
+# Token kinds are small ints so the parser compares integers, not strings
+TT_INT = 0
+TT_FLOAT = 1
+TT_STRING = 2
+TT_REGEX = 3
+TT_IDENTIFIER = 4
+TT_KEYWORD = 5
+TT_PLUS = 6
+TT_MINUS = 7
+TT_MUL = 8
+TT_DIV = 9
+TT_MOD = 10
+TT_LPAREN = 11
+TT_RPAREN = 12
+TT_LSQUARE = 13
+TT_RSQUARE = 14
+TT_LCURLY = 15
+TT_RCURLY = 16
+TT_LSETBRACE = 17
+TT_RSETBRACE = 18
+TT_LANGLE = 19
+TT_RANGLE = 20
+TT_AMPERSAND = 21
+TT_CARET = 22
+TT_EE = 23
+TT_NE = 24
+TT_LT = 25
+TT_GT = 26
+TT_LTE = 27
+TT_GTE = 28
+TT_COMMA = 29
+TT_COLON = 30
+TT_SEMICOLON = 31
+TT_AT = 32
+TT_ARROW = 33
+TT_NEWLINE = 34
+TT_EOF = 35
+
+# Names used by Token.__repr__, indexed by token kind
+TOKEN_NAMES = (
+    'INT',
+    'FLOAT',
+    'STRING',
+    'REGEX',
+    'IDENTIFIER',
+    'KEYWORD',
+    'PLUS',
+    'MINUS',
+    'MUL',
+    'DIV',
+    'MOD',
+    'LPAREN',
+    'RPAREN',
+    'LSQUARE',
+    'RSQUARE',
+    'LCURLY',
+    'RCURLY',
+    'LSETBRACE',
+    'RSETBRACE',
+    'LANGLE',
+    'RANGLE',
+    'AMPERSAND',
+    'CARET',
+    'EE',
+    'NE',
+    'LT',
+    'GT',
+    'LTE',
+    'GTE',
+    'COMMA',
+    'COLON',
+    'SEMICOLON',
+    'AT',
+    'ARROW',
+    'NEWLINE',
+    'EOF',
+)
 
 KEYWORDS = [
     'put',
@@ -72,23 +116,98 @@ KEYWORDS = [
     'where',
 ]
 
+# Keyword IDs continue after the token kinds, so a token's kind is unique
+# across both: Token.kind is the keyword ID for keywords and the type otherwise
+KW_PUT = 36
+KW_IN = 37
+KW_KEEP = 38
+KW_AS = 39
+KW_SHOW = 40
+KW_WHEN = 41
+KW_OTHERWISE = 42
+KW_END = 43
+KW_CYCLE = 44
+KW_FROM = 45
+KW_TO = 46
+KW_STEP = 47
+KW_EACH = 48
+KW_THROUGH = 49
+KW_AS_LONG_AS = 50
+KW_REPEAT_WHILE = 51
+KW_MAKE_FUNCTION = 52
+KW_LAMBDA = 53
+KW_GIVE = 54
+KW_AND = 55
+KW_OR = 56
+KW_NOT = 57
+KW_TRUE = 58
+KW_FALSE = 59
+KW_CUT = 60
+KW_SKIP = 61
+KW_ATTEMPT = 62
+KW_HANDLE = 63
+KW_BRING = 64
+KW_SHARE = 65
+KW_CHECK = 66
+KW_WHETHER = 67
+KW_DEFAULT = 68
+KW_WHERE = 69
+
+KEYWORD_IDS = {word: KW_PUT + i for i, word in enumerate(KEYWORDS)}
+
 class Token:
+    __slots__ = ('type', 'kind', 'value', 'source', 'idx_start', 'idx_end', '_pos_start', '_pos_end')
+
     def __init__(self, type_, value=None, pos_start=None, pos_end=None):
         self.type = type_
+        self.kind = KEYWORD_IDS[value] if type_ == TT_KEYWORD else type_
         self.value = value
+        self._pos_start = None
+        self._pos_end = None
 
         if pos_start:
-            self.pos_start = pos_start.copy()
-            self.pos_end = pos_start.copy()
-            self.pos_end.advance()
+            self.source = pos_start.source
+            self.idx_start = pos_start.idx
+            self.idx_end = pos_start.idx + 1
 
         if pos_end:
-            self.pos_end = pos_end.copy()
+            self.idx_end = pos_end.idx
+
+    @classmethod
+    def at(cls, type_, value, source, idx_start, idx_end):
+        """Build a token straight from offsets into source (used by the lexers)"""
+        tok = cls.__new__(cls)
+        tok.type = type_
+        tok.kind = KEYWORD_IDS[value] if type_ == TT_KEYWORD else type_
+        tok.value = value
+        tok.source = source
+        tok.idx_start = idx_start
+        tok.idx_end = idx_end
+        tok._pos_start = None
+        tok._pos_end = None
+        return tok
+
+    # Position objects are only built when a node or error asks for them
+    @property
+    def pos_start(self):
+        if self._pos_start is None:
+            self._pos_start = Position(self.idx_start, self.source)
+        return self._pos_start
+
+    @property
+    def pos_end(self):
+        if self._pos_end is None:
+            self._pos_end = EndPosition(self.idx_end, self.source)
+        return self._pos_end
+
+    def __reduce__(self):
+        # Pickle (for the AST cache) only the offsets, not the cached positions
+        return (Token.at, (self.type, self.value, self.source, self.idx_start, self.idx_end))
 
     def matches(self, type_, value):
         return self.type == type_ and self.value == value
     
     def __repr__(self):
         if self.value:
-            return f'{self.type}:{self.value}'
-        return f'{self.type}'
\ No newline at end of file
+            return f'{TOKEN_NAMES[self.type]}:{self.value}'
+        return f'{TOKEN_NAMES[self.type]}'
@@ -1,30 +1,101 @@
 from errors.run_time_error import RTError
+from values.hamt import Hamt
+from values.list_value import List
 from values.number_value import Number
 from values.string_value import String
+from values.tuple_value import Tuple
 from values.value import Value
 
 
+def dict_key(value):
+    """
+    Python key a value is stored under: strings and numbers by their Python
+    value, tuples of keys as themselves (they hash structurally). None for
+    values that cannot be keys.
+    """
+    if isinstance(value, (String, Number)):
+        return value.value
+    if isinstance(value, Tuple) and all(dict_key(element) is not None for element in value.elements):
+        return value
+    return None
+
+
 class Dict(Value):
+    """
+    Dictionary value, held in a Python dict or, once it has been made with
+    '+' or '-', in a persistent Hamt those operations update in O(log n)
+    without copying. Reading 'elements', the Python dict builtins mutate in
+    place, turns a Hamt-backed dict back into a Python dict, shared through
+    Hamt.table with every copy of it.
+    """
+
     def __init__(self, elements):
         super().__init__()
-        self.elements = elements  # Python dict storing key-value pairs
+        self._elements = elements  # Python dict storing key-value pairs
+        self._map = None
+
+    @classmethod
+    def from_map(cls, hamt):
+        new_dict = cls.__new__(cls)
+        Value.__init__(new_dict)
+        new_dict._elements = None
+        new_dict._map = hamt
+        return new_dict
+
+    @property
+    def elements(self):
+        hamt = self.current_map()
+        if hamt is not None:
+            hamt.table = hamt.to_dict()
+            self._elements = hamt.table
+            self._map = None
+        return self._elements
+
+    @elements.setter
+    def elements(self, elements):
+        self._elements = elements
+        self._map = None
+
+    def current_map(self):
+        """Hamt holding this dict's contents, or None if a Python dict does"""
+        hamt = self._map
+        if hamt is not None and hamt.table is not None:
+            # A copy has already been mutated in place
+            self._elements = hamt.table
+            self._map = hamt = None
+        return hamt
+
+    def as_map(self):
+        hamt = self.current_map()
+        return Hamt.from_dict(self._elements) if hamt is None else hamt
+
+    def items(self):
+        """(key, value) pairs in insertion order"""
+        hamt = self.current_map()
+        return list(self._elements.items()) if hamt is None else hamt.items()
+
+    def contains(self, key):
+        hamt = self.current_map()
+        return key in (self._elements if hamt is None else hamt)
+
+    def length(self):
+        hamt = self.current_map()
+        return len(self._elements) if hamt is None else hamt.size
 
     def added_to(self, other):
         # Add a key-value pair (expects a list with [key, value])
-        if hasattr(other, 'elements') and isinstance(other.elements, list) and len(other.elements) == 2:
-            # Create a new dict with copied elements for immutable operation
-            new_dict = Dict(self.elements.copy())
-            new_dict.set_pos(self.pos_start, self.pos_end)
-            new_dict.set_context(self.context)
-            
-            key = self._get_hashable_key(other.elements[0])
+        if isinstance(other, List) and other.length() == 2:
+            key = self._get_hashable_key(other.element_at(0))
             if key is None:
                 return None, RTError(
                     other.pos_start, other.pos_end,
-                    'Dictionary key must be a string or number',
+                    'Dictionary key must be a string, number or tuple',
                     self.context
                 )
-            new_dict.elements[key] = other.elements[1]
+            # New dict sharing all but the changed path of this one's map
+            new_dict = Dict.from_map(self.as_map().set(key, other.element_at(1)))
+            new_dict.set_pos(self.pos_start, self.pos_end)
+            new_dict.set_context(self.context)
             return new_dict, None
         else:
             return None, Value.illegal_operation(self, other)
@@ -35,17 +106,14 @@ class Dict(Value):
         if key is None:
             return None, RTError(
                 other.pos_start, other.pos_end,
-                'Dictionary key must be a string or number',
+                'Dictionary key must be a string, number or tuple',
                 self.context
             )
         
-        # Create a new dict with copied elements for immutable operation
-        new_dict = Dict(self.elements.copy())
-        new_dict.set_pos(self.pos_start, self.pos_end)
-        new_dict.set_context(self.context)
-        
-        if key in new_dict.elements:
-            del new_dict.elements[key]
+        if self.contains(key):
+            new_dict = Dict.from_map(self.as_map().delete(key))
+            new_dict.set_pos(self.pos_start, self.pos_end)
+            new_dict.set_context(self.context)
             return new_dict, None
         else:
             return None, RTError(
@@ -60,12 +128,17 @@ class Dict(Value):
         if key is None:
             return None, RTError(
                 other.pos_start, other.pos_end,
-                'Dictionary key must be a string or number',
+                'Dictionary key must be a string, number or tuple',
                 self.context
             )
         
-        if key in self.elements:
-            return self.elements[key], None
+        hamt = self.current_map()
+        if hamt is None:
+            value = self._elements.get(key)
+        else:
+            value = hamt.get(key)
+        if value is not None:
+            return value, None
         else:
             return None, RTError(
                 other.pos_start, other.pos_end,
@@ -75,34 +148,32 @@ class Dict(Value):
 
     def _get_hashable_key(self, value):
         """Convert UTTR value to hashable Python key"""
-        if isinstance(value, String):
-            return value.value
-        elif isinstance(value, Number):
-            return value.value
-        else:
-            return None
+        return dict_key(value)
 
     def copy(self):
-        # Shallow copy that shares the same elements dict
+        # Shallow copy that shares the same elements dict (or map)
         # This allows in-place modifications like remove() to work
-        copy = Dict(self.elements)
+        hamt = self.current_map()
+        copy = Dict(self._elements) if hamt is None else Dict.from_map(hamt)
         copy.set_pos(self.pos_start, self.pos_end)
         copy.set_context(self.context)
         return copy
 
     def is_true(self):
-        return len(self.elements) > 0
+        return self.length() > 0
 
     def __str__(self):
-        pairs = [f"{self._format_key(k)}: {v}" for k, v in self.elements.items()]
+        pairs = [f"{self._format_key(k)}: {v}" for k, v in self.items()]
         return ", ".join(pairs)
 
     def _format_key(self, key):
         """Format key for display"""
         if isinstance(key, str):
             return f'"{key}"'
+        if isinstance(key, Tuple):
+            return repr(key)
         return str(key)
 
     def __repr__(self):
-        pairs = [f"{self._format_key(k)}: {repr(v)}" for k, v in self.elements.items()]
+        pairs = [f"{self._format_key(k)}: {repr(v)}" for k, v in self.items()]
         return f'{{{", ".join(pairs)}}}'
@@ -0,0 +1,201 @@
+"""
+Persistent hash map (hash array mapped trie) backing dictionaries built
+with '+' and '-'.
+Each level of the trie consumes 5 bits of a key's hash; a node stores a
+bitmap of the slots in use and a list of just those children, each either
+a leaf tuple (hash, key, entry) or a deeper node. Keys whose 64-bit hashes
+are equal end up together in a collision node. Updates copy only the path
+from the root to the changed leaf, so set and delete are O(log n) and leave
+the map they were called on unchanged.
+
+Keys compare like Python dict keys (1 and 1.0 are the same key, which keeps
+the key it was first inserted with), and every entry records when its key
+was inserted, so items() comes out in the order a Python dict would keep.
+"""
+
+BITS = 5
+MASK = (1 << BITS) - 1
+HASH_MASK = (1 << 64) - 1
+
+
+class BitmapNode:
+    __slots__ = ('bitmap', 'children')
+
+    def __init__(self, bitmap, children):
+        self.bitmap = bitmap
+        self.children = children
+
+
+class CollisionNode:
+    __slots__ = ('hash', 'leaves')
+
+    def __init__(self, hash_, leaves):
+        self.hash = hash_
+        self.leaves = leaves
+
+
+EMPTY = BitmapNode(0, [])
+
+
+def same_key(leaf, hash_, key):
+    return leaf[0] == hash_ and (leaf[1] is key or leaf[1] == key)
+
+
+def find(node, hash_, key):
+    """Leaf for key, or None"""
+    shift = 0
+    while True:
+        if type(node) is CollisionNode:
+            for leaf in node.leaves:
+                if same_key(leaf, hash_, key):
+                    return leaf
+            return None
+
+        bit = 1 << ((hash_ >> shift) & MASK)
+        if not node.bitmap & bit:
+            return None
+        child = node.children[bin(node.bitmap & (bit - 1)).count('1')]
+        if type(child) is tuple:
+            return child if same_key(child, hash_, key) else None
+        node = child
+        shift += BITS
+
+
+def merge(leaf, other, shift):
+    """Smallest subtree holding two leaves with different keys"""
+    if leaf[0] == other[0] or shift >= 64:
+        return CollisionNode(leaf[0], [leaf, other])
+
+    index = (leaf[0] >> shift) & MASK
+    other_index = (other[0] >> shift) & MASK
+    if index == other_index:
+        return BitmapNode(1 << index, [merge(leaf, other, shift + BITS)])
+    if index < other_index:
+        return BitmapNode((1 << index) | (1 << other_index), [leaf, other])
+    return BitmapNode((1 << index) | (1 << other_index), [other, leaf])
+
+
+def assoc(node, shift, leaf):
+    """Copy of node with leaf added or replacing the leaf of the same key"""
+    hash_, key = leaf[0], leaf[1]
+
+    if type(node) is CollisionNode:
+        if hash_ != node.hash:
+            # Push the collision node one level down next to the new leaf
+            bitmap = 1 << ((node.hash >> shift) & MASK)
+            return assoc(BitmapNode(bitmap, [node]), shift, leaf)
+        leaves = node.leaves[:]
+        for i, old in enumerate(leaves):
+            if same_key(old, hash_, key):
+                leaves[i] = (hash_, old[1], leaf[2])
+                return CollisionNode(hash_, leaves)
+        leaves.append(leaf)
+        return CollisionNode(hash_, leaves)
+
+    bit = 1 << ((hash_ >> shift) & MASK)
+    position = bin(node.bitmap & (bit - 1)).count('1')
+    children = node.children[:]
+
+    if not node.bitmap & bit:
+        children.insert(position, leaf)
+        return BitmapNode(node.bitmap | bit, children)
+
+    child = children[position]
+    if type(child) is tuple:
+        if same_key(child, hash_, key):
+            children[position] = (hash_, child[1], leaf[2])
+        else:
+            children[position] = merge(child, leaf, shift + BITS)
+    else:
+        children[position] = assoc(child, shift + BITS, leaf)
+    return BitmapNode(node.bitmap, children)
+
+
+def dissoc(node, shift, hash_, key):
+    """Copy of node without key (which must be in it), or None if it empties"""
+    if type(node) is CollisionNode:
+        leaves = [leaf for leaf in node.leaves if not same_key(leaf, hash_, key)]
+        # A lone leaf can sit where the collision node was
+        return leaves[0] if len(leaves) == 1 else CollisionNode(node.hash, leaves)
+
+    bit = 1 << ((hash_ >> shift) & MASK)
+    position = bin(node.bitmap & (bit - 1)).count('1')
+    child = node.children[position]
+    children = node.children[:]
+
+    if type(child) is not tuple:
+        child = dissoc(child, shift + BITS, hash_, key)
+        if child is not None:
+            children[position] = child
+            return BitmapNode(node.bitmap, children)
+
+    del children[position]
+    if not children:
+        return None
+    return BitmapNode(node.bitmap ^ bit, children)
+
+
+def leaves(node):
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        for child in (node.leaves if type(node) is CollisionNode else node.children):
+            if type(child) is tuple:
+                yield child
+            else:
+                stack.append(child)
+
+
+class Hamt:
+    """
+    Immutable map of Python keys to values. set() and delete() return new
+    maps. 'table' is filled in with a plain dict the first time a Dict
+    backed by this map is mutated in place; from then on that dict, not the
+    map, holds the contents of every Dict sharing the map.
+    """
+    __slots__ = ('root', 'size', 'next_index', 'table')
+
+    def __init__(self, root=EMPTY, size=0, next_index=0):
+        self.root = root
+        self.size = size
+        self.next_index = next_index
+        self.table = None
+
+    @classmethod
+    def from_dict(cls, elements):
+        hamt = cls()
+        for key, value in elements.items():
+            hamt = hamt.set(key, value)
+        return hamt
+
+    def get(self, key, default=None):
+        leaf = find(self.root, hash(key) & HASH_MASK, key)
+        return default if leaf is None else leaf[2][1]
+
+    def __contains__(self, key):
+        return find(self.root, hash(key) & HASH_MASK, key) is not None
+
+    def set(self, key, value):
+        hash_ = hash(key) & HASH_MASK
+        old = find(self.root, hash_, key)
+        if old is not None:
+            # Replacing a value keeps the key's place in the order
+            root = assoc(self.root, 0, (hash_, key, (old[2][0], value)))
+            return Hamt(root, self.size, self.next_index)
+        root = assoc(self.root, 0, (hash_, key, (self.next_index, value)))
+        return Hamt(root, self.size + 1, self.next_index + 1)
+
+    def delete(self, key):
+        hash_ = hash(key) & HASH_MASK
+        if find(self.root, hash_, key) is None:
+            raise KeyError(key)
+        root = dissoc(self.root, 0, hash_, key)
+        return Hamt(root or EMPTY, self.size - 1, self.next_index)
+
+    def items(self):
+        """(key, value) pairs in insertion order"""
+        ordered = sorted(leaves(self.root), key=lambda leaf: leaf[2][0])
+        return [(leaf[1], leaf[2][1]) for leaf in ordered]
+
+    def to_dict(self):
+        return dict(self.items())
@@ -4,21 +4,93 @@ from values.value import Value
 
 
 class List(Value):
+    """
+    List value. Lists made by '+', '*' and copy() share the Python list of
+    the list they came from instead of copying it: a list owning its buffer
+    hands it to the result, appending the new elements in place, and keeps
+    a view of its first _size elements. A view copies its prefix out the
+    first time it is read through 'elements' or extended, so building a
+    list with 'put result + x in result' is amortized O(1) per element.
+
+    'elements' is the mutable Python list builtins such as append, pop and
+    extend work on. Reading it makes this list the sole owner of a buffer
+    no other list shares (_exposed), which '+' then no longer appends to,
+    since the caller may keep or be iterating it.
+    """
+
     def __init__(self, elements):
         super().__init__()
-        self.elements = elements
+        self._items = elements
+        self._size = len(elements)
+        self._owner = True     # may append to _items; else sees _size of them
+        self._shared = False   # other lists view a prefix of _items
+        self._exposed = False  # _items was handed out through 'elements'
+
+    @property
+    def elements(self):
+        if not self._owner:
+            self._items = self._items[:self._size]
+            self._owner = True
+        elif self._shared:
+            self._items = self._items[:]
+        self._shared = False
+        self._exposed = True
+        return self._items
+
+    @elements.setter
+    def elements(self, elements):
+        self._items = elements
+        self._size = len(elements)
+        self._owner = True
+        self._shared = False
+        self._exposed = False
+
+    def length(self):
+        """Number of elements, without exposing the buffer"""
+        # Builtins may have resized an owner's buffer through 'elements'
+        return len(self._items) if self._owner else self._size
+
+    def element_at(self, index):
+        """Element at a Python-style (possibly negative) index, or IndexError"""
+        size = self.length()
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError(index)
+        return self._items[index]
+
+    def view(self, owner):
+        """New list sharing this one's buffer and size"""
+        self._size = self.length()
+        view = List.__new__(List)
+        Value.__init__(view)
+        view._items = self._items
+        view._size = self._size
+        view._owner = owner
+        view._shared = owner
+        view._exposed = False
+        return view
+
+    def extended_by(self, new_elements):
+        """New list of these elements followed by new_elements"""
+        if self._owner and not self._exposed:
+            # Hand the buffer over and keep a view of our prefix
+            new_list = self.view(True)
+            self._owner = False
+            self._items.extend(new_elements)
+            new_list._size = len(self._items)
+            return new_list
+        return List(self._items[:self.length()] + list(new_elements))
 
     def added_to(self, other):
-        new_list = self.copy()
-        new_list.elements.append(other)
-        return new_list, None
+        return self.extended_by((other,)), None
 
     def subbed_by(self, other):
         if isinstance(other, Number):
-            new_list = self.copy()
+            new_elements = self._items[:self.length()]
             try:
-                new_list.elements.pop(int(other.value))
-                return new_list, None
+                new_elements.pop(int(other.value))
+                return List(new_elements), None
             except:
                 return None, RTError(
                     other.pos_start, other.pos_end,
@@ -30,16 +102,14 @@ class List(Value):
 
     def multed_by(self, other):
         if isinstance(other, List):
-            new_list = self.copy()
-            new_list.elements.extend(other.elements)
-            return new_list, None
+            return self.extended_by(other._items[:other.length()]), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def dived_by(self, other):
         if isinstance(other, Number):
             try:
-                return self.elements[int(other.value)], None
+                return self.element_at(int(other.value)), None
             except:
                 return None, RTError(
                     other.pos_start, other.pos_end,
@@ -50,16 +120,22 @@ class List(Value):
             return None, Value.illegal_operation(self, other)
 
     def copy(self):
-        copy = List(self.elements[:])
+        if self._exposed:
+            copy = List(self._items[:])
+        else:
+            # Share the buffer; an owner passes ownership on to the copy,
+            # which is usually the one that is used from here on
+            copy = self.view(self._owner)
+            self._owner = False
         copy.set_pos(self.pos_start, self.pos_end)
         copy.set_context(self.context)
         return copy
 
     def is_true(self):
-        return len(self.elements) > 0
+        return self.length() > 0
 
     def __str__(self):
-        return ", ".join([str(x) for x in self.elements])
+        return ", ".join([str(x) for x in self._items[:self.length()]])
 
     def __repr__(self):
-        return f'[{", ".join([repr(x) for x in self.elements])}]'
\ No newline at end of file
+        return f'[{", ".join([repr(x) for x in self._items[:self.length()]])}]'
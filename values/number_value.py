@@ -1,15 +1,39 @@
 from errors.run_time_error import RTError
 from values.value import Value
 
+# Ints in this range are shared by every operation that produces them
+SMALL_INT_MIN = -5
+SMALL_INT_MAX = 256
+
 
 class Number(Value):
     def __init__(self, value):
         super().__init__()
         self.value = value
 
+    @staticmethod
+    def of(value):
+        """The shared Number for a small int, otherwise a new Number"""
+        if type(value) is int and SMALL_INT_MIN <= value <= SMALL_INT_MAX:
+            return SMALL_INTS[value - SMALL_INT_MIN]
+        return Number(value)
+
+    # A shared Number stands for its value wherever it is used, so it keeps
+    # no position or context; engines place a copy when an error needs one
+    def set_pos(self, pos_start=None, pos_end=None):
+        if not self.shared:
+            self.pos_start = pos_start
+            self.pos_end = pos_end
+        return self
+
+    def set_context(self, context=None):
+        if not self.shared:
+            self.context = context
+        return self
+
     def added_to(self, other):
         if isinstance(other, Number):
-            return Number(self.value + other.value).set_context(self.context), None
+            return Number.of(self.value + other.value).set_context(self.context), None
         else:
             # Support string concatenation: number + string
             from values.string_value import String
@@ -19,13 +43,13 @@ class Number(Value):
 
     def subbed_by(self, other):
         if isinstance(other, Number):
-            return Number(self.value - other.value).set_context(self.context), None
+            return Number.of(self.value - other.value).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def multed_by(self, other):
         if isinstance(other, Number):
-            return Number(self.value * other.value).set_context(self.context), None
+            return Number.of(self.value * other.value).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
 
@@ -49,60 +73,60 @@ class Number(Value):
                     'Modulo by zero',
                     self.context
                 )
-            return Number(self.value % other.value).set_context(self.context), None
+            return Number.of(self.value % other.value).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def get_comparison_eq(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value == other.value)).set_context(self.context), None
+            return (Number.true if self.value == other.value else Number.false), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def get_comparison_ne(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value != other.value)).set_context(self.context), None
+            return (Number.true if self.value != other.value else Number.false), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def get_comparison_lt(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value < other.value)).set_context(self.context), None
+            return (Number.true if self.value < other.value else Number.false), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def get_comparison_gt(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value > other.value)).set_context(self.context), None
+            return (Number.true if self.value > other.value else Number.false), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def get_comparison_lte(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value <= other.value)).set_context(self.context), None
+            return (Number.true if self.value <= other.value else Number.false), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def get_comparison_gte(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value >= other.value)).set_context(self.context), None
+            return (Number.true if self.value >= other.value else Number.false), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def anded_by(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value and other.value)).set_context(self.context), None
+            return Number.of(int(self.value and other.value)).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def ored_by(self, other):
         if isinstance(other, Number):
-            return Number(int(self.value or other.value)).set_context(self.context), None
+            return Number.of(int(self.value or other.value)).set_context(self.context), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def notted(self):
-        return Number(1 if self.value == 0 else 0).set_context(self.context), None
+        return (Number.true if self.value == 0 else Number.false), None
 
     def copy(self):
         copy = Number(self.value)
@@ -113,12 +137,38 @@ class Number(Value):
     def is_true(self):
         return self.value != 0
 
+    # Structural, so equal numbers are one set element or dictionary key
+    def __eq__(self, other):
+        if isinstance(other, Number):
+            return self.value == other.value
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.value)
+
     def __str__(self):
         return str(self.value)
 
     def __repr__(self):
         return str(self.value)
 
-Number.null = Number(0)
-Number.false = Number(0)
-Number.true = Number(1)
\ No newline at end of file
+
+
+def placed(value, pos_start, pos_end, context):
+    """value, or for a shared Number a copy of it at the given position"""
+    if not value.shared: return value
+    return value.copy().set_pos(pos_start, pos_end).set_context(context)
+
+
+def shared_number(value):
+    number = Number(value)
+    number.shared = True
+    return number
+
+
+Number.null = shared_number(0)
+Number.false = shared_number(0)
+Number.true = shared_number(1)
+SMALL_INTS = [shared_number(value) for value in range(SMALL_INT_MIN, SMALL_INT_MAX + 1)]
+SMALL_INTS[-SMALL_INT_MIN] = Number.false
+SMALL_INTS[1 - SMALL_INT_MIN] = Number.true
@@ -53,7 +53,7 @@ class Match(Value):
     def get_comparison_eq(self, other):
         if isinstance(other, Match):
             result = (self.match_obj is not None) == (other.match_obj is not None)
-            return Number(int(result)).set_context(self.context), None
+            return (Number.true if result else Number.false), None
         else:
             return None, Value.illegal_operation(self, other)
 
@@ -1,4 +1,5 @@
 from errors.run_time_error import RTError
+from values.list_value import List
 from values.number_value import Number
 from values.string_value import String
 from values.value import Value
@@ -7,40 +8,32 @@ from values.value import Value
 class Set(Value):
     def __init__(self, elements):
         super().__init__()
-        # Convert elements to hashable types and store in Python set
-        self.elements = set()
-        for elem in elements:
-            self.elements.add(self._make_hashable(elem))
-    
-    def _make_hashable(self, elem):
-        """Convert value to hashable representation for set storage"""
+        # Numbers, strings, tuples and sets hash and compare structurally,
+        # so the Python set holds them as they are; lists go in as a
+        # snapshot keyed by their contents (see _make_hashable)
+        self.elements = {self._make_hashable(elem) for elem in elements}
+
+    @staticmethod
+    def _make_hashable(elem):
+        """Value as stored in a set: lists become a _ListElement, others stay as they are"""
+        if isinstance(elem, List) and not isinstance(elem, _ListElement):
+            return _ListElement(elem)
+        return elem
+
+    @staticmethod
+    def _display_key(elem):
+        """Sort key giving elements the display order they have always had"""
         if isinstance(elem, Number):
             return ('number', elem.value)
         elif isinstance(elem, String):
             return ('string', elem.value)
         elif isinstance(elem, Set):
-            # Sets can't contain mutable sets, convert to frozen representation
-            return ('set', frozenset(elem.elements))
+            return ('set', frozenset(Set._display_key(inner) for inner in elem.elements))
         else:
-            # For other types, store their string representation
             return ('other', str(elem))
-    
-    def _from_hashable(self, hashable):
-        """Convert hashable representation back to Value object"""
-        type_tag, value = hashable
-        if type_tag == 'number':
-            result = Number(value)
-        elif type_tag == 'string':
-            result = String(value)
-        elif type_tag == 'set':
-            # Reconstruct set from frozen representation
-            elements = [self._from_hashable(elem) for elem in value]
-            result = Set(elements)
-        else:
-            result = String(value)
-        
-        result.set_context(self.context)
-        return result
+
+    def _sorted_elements(self):
+        return sorted(self.elements, key=lambda elem: str(Set._display_key(elem)))
 
     def added_to(self, other):
         """Union operation using + operator"""
@@ -89,20 +82,14 @@ class Set(Value):
     def get_comparison_eq(self, other):
         """Check equality - sets are equal if they have the same elements"""
         if isinstance(other, Set):
-            result = Number(1 if self.elements == other.elements else 0)
-        else:
-            result = Number(0)
-        result.set_context(self.context)
-        return result, None
+            return (Number.true if self.elements == other.elements else Number.false), None
+        return Number.false, None
 
     def get_comparison_ne(self, other):
         """Check inequality"""
         if isinstance(other, Set):
-            result = Number(1 if self.elements != other.elements else 0)
-        else:
-            result = Number(1)
-        result.set_context(self.context)
-        return result, None
+            return (Number.true if self.elements != other.elements else Number.false), None
+        return Number.true, None
 
     def dived_by(self, other):
         """Indexing not supported for sets (they are unordered)"""
@@ -119,15 +106,48 @@ class Set(Value):
         new_set.set_context(self.context)
         return new_set
 
+    # Structural, so sets can be elements of sets
+    def __eq__(self, other):
+        if isinstance(other, Set):
+            return self.elements == other.elements
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(frozenset(self.elements))
+
     def __str__(self):
         if len(self.elements) == 0:
             return "{: :}"
-        # Convert back to Value objects for display
-        value_objects = [self._from_hashable(elem) for elem in sorted(self.elements, key=str)]
-        return "{: " + ", ".join([str(x) for x in value_objects]) + " :}"
+        return "{: " + ", ".join([str(x) for x in self._sorted_elements()]) + " :}"
 
     def __repr__(self):
         if len(self.elements) == 0:
             return "{: :}"
-        value_objects = [self._from_hashable(elem) for elem in sorted(self.elements, key=str)]
-        return "{: " + ", ".join([repr(x) for x in value_objects]) + " :}"
+        return "{: " + ", ".join([repr(x) for x in self._sorted_elements()]) + " :}"
+
+
+class _ListElement(List):
+    """
+    Copy of a list held in a set. It hashes and compares by the contents
+    the list had when it was added, so equal lists are one element.
+    """
+
+    def __init__(self, list_):
+        super().__init__(list(list_.elements))
+        self.set_pos(list_.pos_start, list_.pos_end)
+        self.set_context(list_.context)
+        self._key = _ListElement._contents_key(list_)
+
+    @staticmethod
+    def _contents_key(elem):
+        if isinstance(elem, List):
+            return tuple(_ListElement._contents_key(inner) for inner in elem.elements)
+        return elem
+
+    def __eq__(self, other):
+        if isinstance(other, _ListElement):
+            return self._key == other._key
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._key)
@@ -2,20 +2,73 @@ from values.number_value import Number
 from values.value import Value
 
 
+# Concatenations at least this long build a rope instead of a new str
+ROPE_MIN_LENGTH = 1024
+
+
 class String(Value):
+    """
+    String value. Long concatenations are ropes: instead of 'value', the
+    String keeps the list of pieces it is made of (_parts, of which it uses
+    the first _count) and joins them into 'value' the first time 'value' is
+    read. '+' on a rope appends the new piece to the same list when no
+    longer string was made from it yet, so building a long string with
+    'put out + piece in out' costs amortized O(1) per piece.
+    """
+
+    _parts = None
+
     def __init__(self, value):
         super().__init__()
         self.value = value
 
+    @classmethod
+    def from_parts(cls, parts, count, length):
+        string = cls.__new__(cls)
+        Value.__init__(string)
+        string._parts = parts
+        string._count = count
+        string._length = length
+        return string
+
+    def __getattr__(self, name):
+        # Only called for attributes that are not set: 'value' of a rope
+        if name == 'value' and self._parts is not None:
+            value = ''.join(self._parts[:self._count])
+            self.value = value
+            self._parts = [value]
+            self._count = 1
+            return value
+        raise AttributeError(name)
+
+    def length(self):
+        """Number of characters, without joining a rope"""
+        return len(self.value) if self._parts is None else self._length
+
+    def concatenated(self, piece):
+        """New String of this one followed by the str piece"""
+        if self._parts is None:
+            length = len(self.value) + len(piece)
+            if length < ROPE_MIN_LENGTH:
+                return String(self.value + piece)
+            return String.from_parts([self.value, piece], 2, length)
+
+        parts = self._parts
+        if len(parts) != self._count:
+            # A longer string already extends our pieces
+            parts = parts[:self._count]
+        parts.append(piece)
+        return String.from_parts(parts, self._count + 1, self._length + len(piece))
+
     def added_to(self, other):
         if isinstance(other, String):
-            return String(self.value + other.value).set_context(self.context), None
+            return self.concatenated(other.value).set_context(self.context), None
         elif isinstance(other, Number):
-            return String(self.value + str(other.value)).set_context(self.context), None
+            return self.concatenated(str(other.value)).set_context(self.context), None
         else:
             # Try to convert other to string representation
             try:
-                return String(self.value + repr(other)).set_context(self.context), None
+                return self.concatenated(repr(other)).set_context(self.context), None
             except:
                 return None, Value.illegal_operation(self, other)
 
@@ -26,50 +79,62 @@ class String(Value):
             return None, Value.illegal_operation(self, other)
 
     def is_true(self):
-        return len(self.value) > 0
+        return self.length() > 0
 
     def get_comparison_eq(self, other):
         if isinstance(other, String):
-            return Number(int(self.value == other.value)).set_context(self.context), None
+            return (Number.true if self.value == other.value else Number.false), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def get_comparison_ne(self, other):
         if isinstance(other, String):
-            return Number(int(self.value != other.value)).set_context(self.context), None
+            return (Number.true if self.value != other.value else Number.false), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def get_comparison_lt(self, other):
         if isinstance(other, String):
-            return Number(int(self.value < other.value)).set_context(self.context), None
+            return (Number.true if self.value < other.value else Number.false), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def get_comparison_gt(self, other):
         if isinstance(other, String):
-            return Number(int(self.value > other.value)).set_context(self.context), None
+            return (Number.true if self.value > other.value else Number.false), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def get_comparison_lte(self, other):
         if isinstance(other, String):
-            return Number(int(self.value <= other.value)).set_context(self.context), None
+            return (Number.true if self.value <= other.value else Number.false), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def get_comparison_gte(self, other):
         if isinstance(other, String):
-            return Number(int(self.value >= other.value)).set_context(self.context), None
+            return (Number.true if self.value >= other.value else Number.false), None
         else:
             return None, Value.illegal_operation(self, other)
 
     def copy(self):
-        copy = String(self.value)
+        if self._parts is None:
+            copy = String(self.value)
+        else:
+            copy = String.from_parts(self._parts, self._count, self._length)
         copy.set_pos(self.pos_start, self.pos_end)
         copy.set_context(self.context)
         return copy
 
+    # Structural, so equal strings are one set element or dictionary key
+    def __eq__(self, other):
+        if isinstance(other, String):
+            return self.value == other.value
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.value)
+
     def __str__(self):
         return self.value
 
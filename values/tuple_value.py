@@ -7,6 +7,7 @@ class Tuple(Value):
     def __init__(self, elements):
         super().__init__()
         self.elements = tuple(elements)  # Ensure immutability
+        self._hash = None
 
     def added_to(self, other):
         # Tuples are immutable, cannot append
@@ -55,6 +56,17 @@ class Tuple(Value):
         copy.set_context(self.context)
         return copy
 
+    # Structural, so equal tuples are one set element or dictionary key
+    def __eq__(self, other):
+        if isinstance(other, Tuple):
+            return self.elements == other.elements
+        return NotImplemented
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(self.elements)
+        return self._hash
+
     def __str__(self):
         return ", ".join([str(x) for x in self.elements])
 
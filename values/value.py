@@ -3,9 +3,13 @@ from run_time_result import RTResult
 
 
 class Value:
+    # True for the immutable Numbers shared between uses (see Number.of)
+    shared = False
+
     def __init__(self):
-        self.set_pos()
-        self.set_context()
+        self.pos_start = None
+        self.pos_end = None
+        self.context = None
 
     def set_pos(self, pos_start=None, pos_end=None):
         self.pos_start = pos_start
@@ -0,0 +1,557 @@
+"""
+Stack-based virtual machine for UTTR bytecode (see bytecode.py).
+Runs compiled code with an explicit operand stack per frame and an explicit
+frame stack, so calls between UTTR functions do not grow the Python stack:
+recursion depth is bounded by options.MAX_CALL_DEPTH instead, and the
+deepest stack a run reaches is kept in peak_call_depth.
+Values, builtins, contexts and error messages are the ones the tree
+interpreter uses, and so are the results.
+Selected with options.ENGINE = 'vm' (python shell.py --vm <file>).
+"""
+
+from bytecode import (
+    BIND_ERROR, BINARY_OP, BUILD_DICT, BUILD_LIST, BUILD_SET, BUILD_TUPLE, CALL, CASE_MATCH, CHECK_DICT_KEY,
+    COMP_APPEND, COMP_ENTER, COMP_EXIT, COMP_ITER, COMP_NEXT, CUT, DELEGATE, FOR_EACH_INIT, FOR_EACH_NEXT,
+    FOR_RANGE_INIT, FOR_RANGE_NEXT, GIVE, INDEX, JUMP, LOAD_NAME, MAKE_FUNCTION, NEGATE, NOT, NUMBER, POP_BLOCK,
+    POP_JUMP_IF_FALSE, POP_JUMP_IF_TRUE, POP_TOP, PREPARE_CALL, PUSH_NULL, REGEX, RETURN_VALUE, SETUP_ATTEMPT,
+    SETUP_LOOP, SKIP, STORE_NAME, STRING, UNARY_PLUS,
+)
+from bytecode_compiler import compile_program
+from context import Context
+from errors.run_time_error import RTError
+from functions.base_function import BaseFunction
+from functions.builtin_function import BuiltInFunction
+from functions.function import Function
+from interpreter import Interpreter
+import options
+from run_time_result import RTResult
+from symbol_table import SymbolTable
+from values.dict_value import Dict, dict_key
+from values.error_value import ErrorValue
+from values.list_value import List
+from values.number_value import Number, placed
+from values.regex_value import Regex
+from values.set_value import Set
+from values.string_value import String
+from values.tuple_value import Tuple
+
+# Block kinds on a frame's block stack
+LOOP_BLOCK = 0
+ATTEMPT_BLOCK = 1
+
+# VMs whose run() is in progress, innermost last. A function called from a
+# delegated tree node runs on a VM of its own, stacked on its caller's frames.
+running = []
+
+# Deepest stack of frames reached since the last reset_peak_call_depth()
+peak_call_depth = 0
+
+
+def reset_peak_call_depth():
+    global peak_call_depth
+    peak_call_depth = 0
+
+
+def run_bytecode(node, context):
+    """Compile node and run it in context, returning an RTResult like Interpreter.visit"""
+    return VM().run(Frame(compile_program(node), context))
+
+
+def execute_bytecode(func, args):
+    """Function.execute for functions compiled to bytecode"""
+    res = RTResult()
+    exec_ctx = func.generate_new_context()
+    res.register(func.check_and_populate_args(func.arg_names, args, exec_ctx))
+    if res.should_return(): return res
+
+    res = VM().run(Frame(func.body_bytecode, exec_ctx))
+    if res.func_return_value is not None:
+        return RTResult().success(res.func_return_value or Number.null)
+    if res.should_return(): return res
+    return res.success(res.value or Number.null)
+
+
+class ModuleInterpreter(Interpreter):
+    """Tree interpreter used for 'bring' and 'share' that runs imported modules on the VM"""
+
+    def execute_module(self, module_ast, module_context):
+        return run_bytecode(module_ast, module_context)
+
+
+class Frame:
+    __slots__ = ('code', 'context', 'stack', 'pc', 'blocks', 'call_pos_start', 'call_pos_end', 'call_context')
+
+    def __init__(self, code, context, call_pos_start=None, call_pos_end=None, call_context=None):
+        self.code = code
+        self.context = context
+        self.stack = []
+        self.pc = 0
+        # (kind, stack depth, context, target[, skip target])
+        self.blocks = []
+        # Where the function was called from, for positioning its return value
+        self.call_pos_start = call_pos_start
+        self.call_pos_end = call_pos_end
+        self.call_context = call_context
+
+
+class VMError(Exception):
+    """A runtime error raised inside an instruction, unwound by VM.run"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+class VM:
+    def __init__(self):
+        self.frames = []
+        self.interpreter = ModuleInterpreter()
+        # Frames of the VMs this one runs on top of
+        self.base_depth = running[-1].base_depth + len(running[-1].frames) if running else 0
+        self.peak_depth = self.base_depth
+
+    def run(self, frame):
+        """Run frame (and every frame it calls) to completion and return an RTResult"""
+        global peak_call_depth
+        frames = self.frames
+        frames.append(frame)
+        self.peak_depth = max(self.peak_depth, self.base_depth + 1)
+        running.append(self)
+
+        try:
+            while True:
+                try:
+                    result = self.execute(frames[-1])
+                except VMError as signal:
+                    result = self.unwind_error(signal.error)
+                if result is not None:
+                    return result
+        finally:
+            running.pop()
+            peak_call_depth = max(peak_call_depth, self.peak_depth)
+
+    def execute(self, frame):
+        """
+        Run instructions of frame until the frame changes (call or return).
+        Returns an RTResult when the bottom frame finishes, else None.
+        """
+        ops = frame.code.ops
+        constants = frame.code.constants
+        # Entry of the instruction being run: positions[(pc >> 1) - 1]
+        positions = frame.code.positions
+        stack = frame.stack
+        push = stack.append
+        pop = stack.pop
+        context = frame.context
+        pc = frame.pc
+
+        while True:
+            opcode = ops[pc]
+            arg = ops[pc + 1]
+            pc += 2
+
+            if opcode == LOAD_NAME:
+                var_name = constants[arg]
+                pos_start, pos_end = positions[(pc >> 1) - 1]
+                value = context.symbol_table.get(var_name)
+                if not value:
+                    frame.pc = pc
+                    raise VMError(RTError(pos_start, pos_end, f"'{var_name}' is not defined", context))
+
+                # Same copying rules as Interpreter.visit_VarAccessNode
+                if isinstance(value, (List, Dict, BaseFunction)):
+                    value.pos_start = pos_start
+                    value.pos_end = pos_end
+                    if isinstance(value, BuiltInFunction) or not isinstance(value, BaseFunction):
+                        value.context = context
+                elif not value.shared:
+                    value = Number(value.value) if value.__class__ is Number else value.copy()
+                    value.pos_start = pos_start
+                    value.pos_end = pos_end
+                    value.context = context
+                push(value)
+
+            elif opcode == NUMBER:
+                number = Number.of(constants[arg])
+                if not number.shared:
+                    number.pos_start, number.pos_end = positions[(pc >> 1) - 1]
+                    number.context = context
+                push(number)
+
+            elif opcode == BINARY_OP:
+                method_name = constants[arg]
+                right = pop()
+                left = stack[-1]
+                result, error = getattr(left, method_name)(right)
+                if error:
+                    frame.pc = pc
+                    if left.shared or right.shared:
+                        # Same as Interpreter.visit_BinOpNode
+                        _, _, left_start, left_end, right_start, right_end = positions[(pc >> 1) - 1]
+                        left = placed(left, left_start, left_end, context)
+                        right = placed(right, right_start, right_end, context)
+                        result, error = getattr(left, method_name)(right)
+                    raise VMError(error)
+                if not result.shared:
+                    result.pos_start, result.pos_end = positions[(pc >> 1) - 1][:2]
+                    # Same as Interpreter.visit_BinOpNode
+                    if left.shared: result.context = context
+                stack[-1] = result
+
+            elif opcode == POP_TOP:
+                pop()
+
+            elif opcode == STORE_NAME:
+                context.symbol_table.set(constants[arg], stack[-1])
+
+            elif opcode == POP_JUMP_IF_FALSE:
+                if not pop().is_true():
+                    pc = arg
+
+            elif opcode == JUMP:
+                pc = arg
+
+            elif opcode == FOR_RANGE_NEXT:
+                state = stack[-1]
+                i = state[0]
+                if i < state[1].value:
+                    context.symbol_table.set(constants[arg][0], Number(i))
+                    state[0] = i + state[2]
+                else:
+                    pc = constants[arg][1]
+
+            elif opcode == PUSH_NULL:
+                push(Number.null)
+
+            elif opcode == PREPARE_CALL:
+                callee = stack[-1]
+                value = callee.copy()
+                value.pos_start, value.pos_end = positions[(pc >> 1) - 1]
+                # Same as Interpreter.visit_CallNode
+                if callee.shared: value.context = context
+                stack[-1] = value
+
+            elif opcode == CALL:
+                pos_start, pos_end = positions[(pc >> 1) - 1]
+                if arg:
+                    args = stack[-arg:]
+                    del stack[-arg:]
+                else:
+                    args = []
+                value_to_call = pop()
+                frame.pc = pc
+
+                if type(value_to_call) is Function and value_to_call.body_bytecode is not None:
+                    self.call_function(value_to_call, args, pos_start, pos_end, context)
+                    return None
+
+                res = value_to_call.execute(args)
+                if res.error: raise VMError(res.error)
+                if res.loop_should_cut: return self.unwind_loop(True)
+                if res.loop_should_skip: return self.unwind_loop(False)
+                value = res.value.copy()
+                value.pos_start = pos_start
+                value.pos_end = pos_end
+                value.context = context
+                push(value)
+
+            elif opcode == GIVE:
+                frame.pc = pc
+                return self.return_from_frame(pop(), True)
+
+            elif opcode == RETURN_VALUE:
+                frame.pc = pc
+                return self.return_from_frame(pop(), False)
+
+            elif opcode == STRING:
+                string = String(constants[arg])
+                string.pos_start, string.pos_end = positions[(pc >> 1) - 1]
+                string.context = context
+                push(string)
+
+            elif opcode == POP_JUMP_IF_TRUE:
+                if pop().is_true():
+                    pc = arg
+
+            elif opcode == SETUP_LOOP:
+                cut_target, skip_target = constants[arg]
+                frame.blocks.append((LOOP_BLOCK, len(stack), context, cut_target, skip_target))
+
+            elif opcode == POP_BLOCK:
+                frame.blocks.pop()
+
+            elif opcode == FOR_EACH_NEXT:
+                element = next(stack[-1], None)
+                if element is None:
+                    pc = constants[arg][1]
+                else:
+                    context.symbol_table.set(constants[arg][0], element)
+
+            elif opcode == FOR_RANGE_INIT:
+                step = pop().value if arg else 1
+                end_value = pop()
+                start_value = pop()
+                push([start_value.value, end_value, step])
+
+            elif opcode == FOR_EACH_INIT:
+                iterable = pop()
+                if not isinstance(iterable, (List, Tuple)):
+                    pos_start, pos_end = positions[(pc >> 1) - 1]
+                    frame.pc = pc
+                    raise VMError(RTError(
+                        pos_start, pos_end,
+                        "Can only iterate through lists and tuples",
+                        context
+                    ))
+                push(iter(iterable.elements))
+
+            elif opcode == CASE_MATCH:
+                case_value = pop()
+                if stack[-1].get_comparison_eq(case_value)[0].is_true():
+                    pop()
+                else:
+                    pc = arg
+
+            elif opcode == NEGATE or opcode == NOT:
+                pos_start, pos_end = positions[(pc >> 1) - 1]
+                operand = pop()
+                if opcode == NEGATE:
+                    result, error = operand.multed_by(Number(-1))
+                else:
+                    result, error = operand.notted()
+                if error:
+                    frame.pc = pc
+                    raise VMError(error)
+                # Same as Interpreter.visit_BinOpNode
+                if opcode == NEGATE and operand.shared: result.set_context(context)
+                push(result.set_pos(pos_start, pos_end))
+
+            elif opcode == UNARY_PLUS:
+                stack[-1].set_pos(*positions[(pc >> 1) - 1])
+
+            elif opcode == INDEX:
+                frame.pc = pc
+                index = pop()
+                push(self.index(pop(), index, positions[(pc >> 1) - 1], context))
+
+            elif opcode == BUILD_LIST or opcode == BUILD_TUPLE or opcode == BUILD_SET:
+                if arg:
+                    elements = stack[-arg:]
+                    del stack[-arg:]
+                else:
+                    elements = []
+                value_class = List if opcode == BUILD_LIST else Tuple if opcode == BUILD_TUPLE else Set
+                push(value_class(elements).set_context(context).set_pos(*positions[(pc >> 1) - 1]))
+
+            elif opcode == CHECK_DICT_KEY:
+                if dict_key(stack[-2]) is None:
+                    pos_start, pos_end = positions[(pc >> 1) - 1]
+                    frame.pc = pc
+                    raise VMError(RTError(
+                        pos_start, pos_end,
+                        'Dictionary key must be a string, number or tuple',
+                        context
+                    ))
+
+            elif opcode == BUILD_DICT:
+                elements = {}
+                if arg:
+                    items = stack[-2 * arg:]
+                    del stack[-2 * arg:]
+                    for i in range(0, len(items), 2):
+                        elements[dict_key(items[i])] = items[i + 1]
+                push(Dict(elements).set_context(context).set_pos(*positions[(pc >> 1) - 1]))
+
+            elif opcode == MAKE_FUNCTION:
+                func_name, body_node, arg_names, body_code = constants[arg]
+                function = Function(func_name, body_node, arg_names, body_bytecode=body_code)
+                push(function.set_context(context).set_pos(*positions[(pc >> 1) - 1]))
+
+            elif opcode == CUT or opcode == SKIP:
+                frame.pc = pc
+                return self.unwind_loop(opcode == CUT)
+
+            elif opcode == SETUP_ATTEMPT:
+                frame.blocks.append((ATTEMPT_BLOCK, len(stack), context, arg))
+
+            elif opcode == BIND_ERROR:
+                error_var_name = constants[arg]
+                caught_error = pop()
+                error_value = ErrorValue(
+                    caught_error.details,
+                    caught_error.error_name,
+                    caught_error
+                ).set_context(context).set_pos(*positions[(pc >> 1) - 1])
+                if error_var_name is not None:
+                    context.symbol_table.set(error_var_name, error_value)
+
+            elif opcode == REGEX:
+                pos_start, pos_end = positions[(pc >> 1) - 1]
+                regex = Regex(constants[arg]).set_context(context).set_pos(pos_start, pos_end)
+                if regex.compiled is None:
+                    frame.pc = pc
+                    raise VMError(RTError(
+                        pos_start, pos_end,
+                        f"Invalid regex pattern: {regex.compile_error}",
+                        context
+                    ))
+                push(regex)
+
+            elif opcode == COMP_ENTER:
+                # The accumulator remembers the scope to return to
+                push(([], context))
+                comp_context = Context(context.display_name, context.parent, context.parent_entry_pos)
+                comp_context.symbol_table = SymbolTable(context.symbol_table)
+                frame.context = context = comp_context
+
+            elif opcode == COMP_ITER:
+                iterable = pop()
+                if not isinstance(iterable, (List, Tuple, Set)):
+                    pos_start, pos_end = positions[(pc >> 1) - 1]
+                    frame.pc = pc
+                    raise VMError(RTError(
+                        pos_start, pos_end,
+                        f"Cannot iterate over {type(iterable).__name__}",
+                        context
+                    ))
+                push(iter(iterable.elements))
+
+            elif opcode == COMP_NEXT:
+                element = next(stack[-1], None)
+                if element is None:
+                    pop()
+                    pc = constants[arg][1]
+                else:
+                    context.symbol_table.set(constants[arg][0], element)
+
+            elif opcode == COMP_APPEND:
+                value = pop()
+                stack[-arg][0].append(value)
+
+            elif opcode == COMP_EXIT:
+                elements, outer_context = pop()
+                frame.context = context = outer_context
+                push(List(elements).set_context(context).set_pos(*positions[(pc >> 1) - 1]))
+
+            elif opcode == DELEGATE:
+                frame.pc = pc
+                res = self.interpreter.visit(constants[arg], context)
+                if res.error: raise VMError(res.error)
+                if res.func_return_value: return self.return_from_frame(res.func_return_value, True)
+                if res.loop_should_cut: return self.unwind_loop(True)
+                if res.loop_should_skip: return self.unwind_loop(False)
+                push(res.value)
+
+            else:
+                raise Exception(f'Unknown opcode {opcode}')
+
+    def index(self, collection, index, position, context):
+        list_start, list_end, index_start, index_end = position
+
+        if isinstance(collection, List):
+            if not isinstance(index, Number):
+                raise VMError(RTError(
+                    index_start, index_end,
+                    "List index must be a number",
+                    context
+                ))
+            try:
+                return collection.element_at(int(index.value))
+            except:
+                raise VMError(RTError(
+                    index_start, index_end,
+                    "Index out of bounds",
+                    context
+                ))
+
+        if isinstance(collection, Dict):
+            result, error = collection.dived_by(index)
+            if error and index.shared:
+                result, error = collection.dived_by(placed(index, index_start, index_end, context))
+            if error: raise VMError(error)
+            return result
+
+        raise VMError(RTError(
+            list_start, list_end,
+            "Can only index lists and dictionaries",
+            context
+        ))
+
+    def call_function(self, func, args, pos_start, pos_end, call_context):
+        """Push a frame running func's bytecode (BaseFunction.check_and_populate_args + Function.execute)"""
+        depth = self.base_depth + len(self.frames) + 1
+        if depth > options.MAX_CALL_DEPTH:
+            raise VMError(RTError(
+                pos_start, pos_end,
+                f"Maximum call depth of {options.MAX_CALL_DEPTH} exceeded",
+                call_context
+            ))
+        if depth > self.peak_depth:
+            self.peak_depth = depth
+
+        exec_ctx = func.generate_new_context()
+        arg_names = func.arg_names
+        if len(args) != len(arg_names):
+            raise VMError(func.check_args(arg_names, args).error)
+        func.populate_args(arg_names, args, exec_ctx)
+
+        self.frames.append(Frame(func.body_bytecode, exec_ctx, pos_start, pos_end, call_context))
+
+    def return_from_frame(self, value, is_give):
+        """Leave the current frame with value; returns an RTResult if it was the bottom frame"""
+        frames = self.frames
+        frame = frames.pop()
+
+        if not frames:
+            if is_give:
+                return RTResult().success_return(value)
+            return RTResult().success(value)
+
+        # Same as Function.execute followed by the caller's CallNode
+        value = (value or Number.null).copy()
+        value.pos_start = frame.call_pos_start
+        value.pos_end = frame.call_pos_end
+        value.context = frame.call_context
+        frames[-1].stack.append(value)
+        return None
+
+    def unwind_loop(self, is_cut):
+        """'cut' or 'skip': continue at the innermost enclosing loop, crossing calls like RTResult does"""
+        frames = self.frames
+
+        while frames:
+            frame = frames[-1]
+            blocks = frame.blocks
+            while blocks:
+                block = blocks[-1]
+                if block[0] == LOOP_BLOCK:
+                    del frame.stack[block[1]:]
+                    frame.context = block[2]
+                    if is_cut:
+                        blocks.pop()
+                        frame.pc = block[3]
+                    else:
+                        frame.pc = block[4]
+                    return None
+                blocks.pop()
+            frames.pop()
+
+        return RTResult().success_cut() if is_cut else RTResult().success_skip()
+
+    def unwind_error(self, error):
+        """Continue at the innermost enclosing 'attempt', or fail if there is none"""
+        frames = self.frames
+
+        while frames:
+            frame = frames[-1]
+            blocks = frame.blocks
+            while blocks:
+                block = blocks.pop()
+                if block[0] == ATTEMPT_BLOCK:
+                    del frame.stack[block[1]:]
+                    frame.context = block[2]
+                    frame.stack.append(error)
+                    frame.pc = block[3]
+                    return None
+            frames.pop()
+
+        return RTResult().failure(error)